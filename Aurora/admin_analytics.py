@@ -6,13 +6,14 @@ Staff can view timelines, search memories, analyze patterns - but cannot modify
 Phase 2C Implementation - Read-only admin observation system
 """
 
-import json
 import logging
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from collections import defaultdict
 
+from thread_segments import ThreadSegments
+
 # Setup logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -58,6 +59,7 @@ class AdminAnalytics:
 
             thread_id = member.get('thread_id')
             memory_file = self.threads_dir / f"{thread_id}.jsonl"
+            thread = ThreadSegments(memory_file)
 
             stats = {
                 'member_id': member_id,
@@ -67,7 +69,7 @@ class AdminAnalytics:
                 'tier_name': member.get('tier_name', 'Wanderer'),
                 'sharing_mode': member.get('memory_sharing_mode', 'isolated'),
                 'thread_id': thread_id,
-                'memory_file_exists': memory_file.exists(),
+                'memory_file_exists': thread.exists(),
                 'total_events': 0,
                 'file_size_bytes': 0,
                 'first_event_time': None,
@@ -78,24 +80,14 @@ class AdminAnalytics:
                 'is_admin': member.get('is_admin', False)
             }
 
-            if memory_file.exists():
+            if thread.exists():
                 try:
-                    events = []
-                    with open(memory_file, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            line = line.strip()
-                            if line:
-                                try:
-                                    events.append(json.loads(line))
-                                except json.JSONDecodeError:
-                                    continue
-
-                    stats['total_events'] = len(events)
-                    stats['file_size_bytes'] = memory_file.stat().st_size
-
-                    if events:
-                        stats['first_event_time'] = events[0].get('timestamp')
-                        stats['last_event_time'] = events[-1].get('timestamp')
+                    # Sealed segments are counted from their manifest, not read
+                    thread_stats = thread.stats()
+                    stats['total_events'] = thread_stats['events']
+                    stats['file_size_bytes'] = thread_stats['bytes']
+                    stats['first_event_time'] = thread_stats['first_event']
+                    stats['last_event_time'] = thread_stats['last_event']
 
                 except Exception as e:
                     logger.warning(f"[ADMIN] Error reading memory file for {member_id}: {e}")
@@ -184,33 +176,20 @@ class AdminAnalytics:
                 return []
 
             thread_id = member.get('thread_id')
-            memory_file = self.threads_dir / f"{thread_id}.jsonl"
+            thread = ThreadSegments(self.threads_dir / f"{thread_id}.jsonl")
 
-            if not memory_file.exists():
+            if not thread.exists():
                 logger.debug(f"[ADMIN] No memory file for {member_id}")
                 return []
 
-            events = []
             try:
-                with open(memory_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line:
-                            try:
-                                event = json.loads(line)
-                                # Add member context
-                                event['member_id'] = member_id
-                                event['member_name'] = member.get('display_name')
-                                event['tier_at_time'] = event.get('metadata', {}).get('tier_at_time', member.get('access_tier'))
-                                events.append(event)
-                            except json.JSONDecodeError:
-                                continue
-
-                # Reverse for newest first
-                events.reverse()
-
-                if limit:
-                    events = events[:limit]
+                # Newest first; only the segments holding the last `limit` events are read
+                events = thread.tail(limit or None)
+                for event in events:
+                    # Add member context
+                    event['member_id'] = member_id
+                    event['member_name'] = member.get('display_name')
+                    event['tier_at_time'] = event.get('metadata', {}).get('tier_at_time', member.get('access_tier'))
 
                 logger.info(f"[ADMIN] Retrieved {len(events)} timeline events for {member_id}")
                 return events
@@ -0,0 +1,322 @@
+"""
+Aurora Archive - Append Writer
+Background appends to memory thread files, off the request thread
+
+    append(path, data, on_written) -> queued; returns at once
+    writer thread -> one write per thread file per drained batch, then on_written(end_offset)
+
+One writer per process owns the thread files: it keeps an append handle
+open for each hot thread (least recently used closed past `max_open`)
+and coalesces queued appends to the same file into a single write.
+append() blocks once `queue_size` appends are waiting (back-pressure).
+
+Durability policy (`fsync`):
+    always    fsync after every write, before its on_written callback
+    interval  fsync written files every `fsync_ms` (a write reaches the
+              disk within that)
+    os        never fsync; the OS writes back (data survives a process
+              crash, not a power loss)
+
+Readers in this process call flush(path) first so they see their own
+queued appends; other processes see an append once it is written.
+
+The compactor (thread_segments) renames an active file away when sealing
+it. Checking the inode alone is not enough: the rename can land between
+the check and the write, and the write then goes to a file already being
+sealed. So the writer flock()s its handle shared, checks that the path
+still names the handle's inode (reopening if not), writes, and only then
+unlocks; the compactor renames only while holding the file exclusively.
+
+Python 3.10+
+Dependencies: none
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from file_lock import flock_release, flock_shared
+
+logger = logging.getLogger(__name__)
+
+
+FSYNC_POLICIES = ("always", "interval", "os")
+DEFAULT_FSYNC_MS = 1000
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_MAX_OPEN = 128
+MAX_DRAIN = 1000  # Appends taken per writer pass
+
+
+class _Append:
+    """One queued append"""
+
+    __slots__ = ("key", "data", "on_written")
+
+    def __init__(self, key: str, data: bytes, on_written: Optional[Callable[[int], None]]):
+        self.key = key
+        self.data = data
+        self.on_written = on_written
+
+
+class _Handle:
+    """An open append handle and the inode it was opened on"""
+
+    __slots__ = ("file", "ino", "dirty")
+
+    def __init__(self, path: str):
+        self.file = open(path, 'ab', buffering=0)
+        self.ino = os.fstat(self.file.fileno()).st_ino
+        self.dirty = False  # Written since the last fsync
+
+
+class AppendWriter:
+    """
+    Per-process queue and writer thread for JSONL appends
+
+    Usage:
+        writer = AppendWriter(fsync="interval", fsync_ms=1000)
+        writer.append(path, line, on_written=lambda end_offset: ...)
+        writer.flush(path)    # Before reading path in this process
+        writer.close()        # Drain, fsync and close every handle
+    """
+
+    def __init__(
+        self,
+        fsync: str = "interval",
+        fsync_ms: float = DEFAULT_FSYNC_MS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        max_open: int = DEFAULT_MAX_OPEN
+    ):
+        """
+        Args:
+            fsync: Durability policy: "always", "interval" or "os"
+            fsync_ms: fsync period for "interval"
+            queue_size: Appends waiting before append() blocks
+            max_open: Open handles kept (least recently used closed first)
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, not {fsync!r}")
+        self.fsync = fsync
+        self.fsync_s = fsync_ms / 1000
+        self.max_open = max(1, max_open)
+        self._queue: "queue.Queue[Optional[_Append]]" = queue.Queue(maxsize=max(1, queue_size))
+        self._handles: "OrderedDict[str, _Handle]" = OrderedDict()  # Writer thread only
+        self._pending: Dict[str, int] = {}
+        self._done = threading.Condition()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._last_fsync = time.monotonic()
+        atexit.register(self.close)
+
+        # Diagnostics
+        self.writes = 0
+        self.appends = 0
+        self.fsyncs = 0
+        self.reopens = 0
+        self.errors = 0
+
+    # ============================================
+    # PRODUCERS
+    # ============================================
+
+    def append(self, path, data: bytes, on_written: Optional[Callable[[int], None]] = None):
+        """
+        Queue bytes to append to a file
+
+        Args:
+            path: File to append to (created if missing)
+            data: Complete lines
+            on_written: Called on the writer thread with the file offset
+                just after `data` once it is written (and fsynced under
+                "always"); not called if the write fails
+        """
+        key = os.path.abspath(path)
+        self._start()
+        with self._done:
+            self._pending[key] = self._pending.get(key, 0) + 1
+        self._queue.put(_Append(key, data, on_written))  # Blocks while the queue is full
+
+    def pending(self, path=None) -> int:
+        """Appends queued but not yet written (for one file, or in total)"""
+        with self._done:
+            if path is None:
+                return sum(self._pending.values())
+            return self._pending.get(os.path.abspath(path), 0)
+
+    def flush(self, path=None, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until queued appends are written
+
+        Args:
+            path: Only wait for this file's appends (default: all)
+            timeout: Seconds to wait at most (None = until written)
+
+        Returns:
+            True if nothing is left pending
+        """
+        if not self._pending:
+            return True  # Idle: the common case, no lock or path work
+        key = os.path.abspath(path) if path is not None else None
+        with self._done:
+            if key is None:
+                return self._done.wait_for(lambda: not self._pending, timeout)
+            return self._done.wait_for(lambda: key not in self._pending, timeout)
+
+    # ============================================
+    # WRITER THREAD
+    # ============================================
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="aurora-memory-writer", daemon=True)
+                self._thread.start()
+
+    def _loop(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self._wait_s())
+            except queue.Empty:
+                self._fsync_due()
+                continue
+            batch = [item]
+            while len(batch) < MAX_DRAIN:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            self._write([item for item in batch if item is not None])
+            self._fsync_due()
+            if stop:
+                self._close_handles()
+                return
+
+    def _wait_s(self) -> Optional[float]:
+        if self.fsync != "interval" or not any(handle.dirty for handle in self._handles.values()):
+            return None
+        return max(0.0, self._last_fsync + self.fsync_s - time.monotonic())
+
+    def _write(self, batch: List[_Append]):
+        """
+        Write a drained batch: one write per file, then the callbacks in
+        queue order (shared views rely on events arriving in store order)
+        """
+        by_key: "OrderedDict[str, List[_Append]]" = OrderedDict()
+        for item in batch:
+            by_key.setdefault(item.key, []).append(item)
+
+        end_offsets: Dict[_Append, int] = {}
+        for key, items in by_key.items():
+            try:
+                data = b''.join(item.data for item in items)
+                handle = self._handle(key)
+                try:
+                    view = memoryview(data)
+                    while view:
+                        view = view[handle.file.write(view):]
+                    end_offset = handle.file.tell()
+                finally:
+                    flock_release(handle.file)
+                handle.dirty = True
+                if self.fsync == "always":
+                    self._sync(handle)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Appending {len(items)} records to {key} failed: {e}")
+                self._close(key)
+                continue
+            self.writes += 1
+            self.appends += len(items)
+            offset = end_offset - len(data)
+            for item in items:
+                offset += len(item.data)
+                end_offsets[item] = offset
+
+        for item in batch:
+            if item.on_written is not None and item in end_offsets:
+                try:
+                    item.on_written(end_offsets[item])
+                except Exception as e:
+                    logger.error(f"Append callback for {item.key} failed: {e}", exc_info=True)
+
+        with self._done:
+            for item in batch:
+                self._pending[item.key] -= 1
+                if not self._pending[item.key]:
+                    del self._pending[item.key]
+            self._done.notify_all()
+
+    def _handle(self, key: str) -> _Handle:
+        """
+        The open handle for a file, locked shared (the caller releases it)
+        and reopened if the path now names another inode
+        """
+        while True:
+            handle = self._handles.get(key)
+            if handle is None:
+                handle = _Handle(key)
+                self._handles[key] = handle
+            self._handles.move_to_end(key)
+            while len(self._handles) > self.max_open:
+                self._close(next(iter(self._handles)))
+            flock_shared(handle.file)  # Held until written, so a seal cannot rename it in between
+            try:
+                current = os.stat(key).st_ino
+            except FileNotFoundError:
+                current = None
+            if current == handle.ino:
+                return handle
+            flock_release(handle.file)  # Sealed (renamed away) or cleared
+            self._close(key)
+            self.reopens += 1
+
+    def _sync(self, handle: _Handle):
+        os.fsync(handle.file.fileno())
+        handle.dirty = False
+        self.fsyncs += 1
+
+    def _fsync_due(self):
+        if self.fsync != "interval" or time.monotonic() - self._last_fsync < self.fsync_s:
+            return
+        for key, handle in list(self._handles.items()):
+            if handle.dirty:
+                try:
+                    self._sync(handle)
+                except OSError as e:
+                    logger.warning(f"fsync of {key} failed: {e}")
+        self._last_fsync = time.monotonic()
+
+    def _close(self, key: str):
+        handle = self._handles.pop(key, None)
+        if handle is None:
+            return
+        try:
+            if handle.dirty and self.fsync != "os":
+                self._sync(handle)
+        except OSError as e:
+            logger.warning(f"fsync of {key} failed: {e}")
+        finally:
+            handle.file.close()
+
+    def _close_handles(self):
+        for key in list(self._handles):
+            self._close(key)
+
+    def close(self):
+        """Write everything queued, fsync (unless "os") and close all handles"""
+        with self._start_lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if not self._queue.empty():
+            self._start()  # Appended while closing
@@ -0,0 +1,244 @@
+"""
+Aurora Archive - Atomic Persistence Helpers
+Crash-safe file replacement and an optional write-ahead journal for JSON databases
+
+atomic_open / atomic_write_json:
+    Write to a temp file in the target's directory, fsync it, then
+    os.replace() it over the target (and fsync the directory on POSIX).
+    A crash leaves either the old file or the new one, never a truncated mix.
+    The replacement keeps the target's permission bits (a new file gets
+    0o666 minus the umask, like open()), so files shared between processes
+    and users stay readable to them.
+
+JsonJournal:
+    Append-only JSONL log of changes made since the last snapshot. Each
+    record carries a sequence number and the snapshot stores the last
+    sequence it includes, so on restart only the journal tail newer than
+    the snapshot is replayed. A torn final line (crash mid-append) is
+    skipped, and the next append starts on a new line after it so later
+    records stay readable. Snapshots are taken every `checkpoint_every` records, which
+    bounds the replay work after an unclean shutdown.
+
+Shared by DatabaseManager, member_store, card_scanner.UserDatabase and the
+root memory_bridge.MemoryBridge (imported there as Aurora.atomic_store), so
+this module must not import other Aurora modules.
+
+Python 3.10+
+Dependencies: none
+"""
+
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List
+
+
+DEFAULT_CHECKPOINT_EVERY = 256
+
+
+def _read_umask() -> int:
+    # os.umask can only be read by setting it; do it once, at import
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _read_umask()
+
+
+def _replacement_mode(path: Path) -> int:
+    """Permission bits for a file replacing `path`: the old file's, else what open() would give"""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def fsync_directory(directory) -> None:
+    """Persist a rename by fsyncing its directory (no-op where unsupported)"""
+    if os.name != 'posix':
+        return
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_open(path, mode: str = 'w', encoding: str = 'utf-8', fsync: bool = True):
+    """
+    Open a temp file that replaces `path` only if the block completes
+
+    Args:
+        path: Final destination
+        mode: 'w' (text) or 'wb' (binary)
+        encoding: Text encoding (ignored for binary mode)
+        fsync: Flush the data (and the rename) to stable storage
+
+    Yields:
+        Writable file object
+    """
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **({} if 'b' in mode else {'encoding': encoding})) as f:
+            yield f
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.chmod(temp_path, _replacement_mode(path))  # mkstemp creates files 0600
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    if fsync:
+        fsync_directory(path.parent)
+
+
+def atomic_write_bytes(path, data: bytes, fsync: bool = True) -> None:
+    """Atomically replace `path` with `data`"""
+    with atomic_open(path, 'wb', fsync=fsync) as f:
+        f.write(data)
+
+
+def atomic_write_json(path, obj, fsync: bool = True, **dump_kwargs) -> None:
+    """
+    Atomically replace `path` with `obj` serialized as JSON
+
+    Args:
+        path: Destination file
+        obj: JSON-serializable object
+        fsync: Flush to stable storage before the rename
+        **dump_kwargs: Passed to json.dump (indent, ensure_ascii, default...)
+    """
+    with atomic_open(path, 'w', fsync=fsync) as f:
+        json.dump(obj, f, **dump_kwargs)
+
+
+class JsonJournal:
+    """
+    Write-ahead journal of changes since the last JSON snapshot
+
+    Usage:
+        journal = JsonJournal(db_path.with_suffix('.journal'))
+        state = load_snapshot()
+        for record in journal.replay(state.get('journal_seq', 0)):
+            apply(state, record)
+
+        journal.append({"op": "put", ...})
+        if journal.needs_checkpoint:
+            state['journal_seq'] = journal.seq
+            atomic_write_json(db_path, state)
+            journal.truncate()
+    """
+
+    def __init__(self, path, fsync: bool = True, checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY):
+        """
+        Args:
+            path: Journal file (JSONL)
+            fsync: fsync after every append (durable per write)
+            checkpoint_every: Records after which needs_checkpoint becomes True
+        """
+        self.path = Path(path)
+        self.fsync = fsync
+        self.checkpoint_every = checkpoint_every
+        self.seq = 0
+        self.pending = 0  # Records not yet covered by a snapshot
+        self._torn = None  # Journal ends in an incomplete line (None = not checked yet)
+
+        # Filled in by replay()
+        self.replayed = 0
+        self.replay_ms = 0.0
+
+    def replay(self, snapshot_seq: int = 0) -> List[Dict]:
+        """
+        Read journal records newer than the snapshot
+
+        Args:
+            snapshot_seq: Last sequence number included in the snapshot
+
+        Returns:
+            Records to re-apply, oldest first
+        """
+        started = time.perf_counter()
+        records = []
+        self.seq = snapshot_seq
+
+        self._torn = False
+        if self.path.exists():
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        self._torn = True  # Crash mid-append; append() terminates it
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # A torn fragment; later records are still good
+                    seq = record.get('seq', 0)
+                    if seq > snapshot_seq:
+                        records.append(record)
+                    self.seq = max(self.seq, seq)
+
+        self.pending = len(records)
+        self.replayed = len(records)
+        self.replay_ms = (time.perf_counter() - started) * 1000
+        return records
+
+    def append(self, *records: Dict) -> None:
+        """Number and durably append records"""
+        lines = []
+        for record in records:
+            self.seq += 1
+            lines.append(json.dumps({**record, "seq": self.seq}, ensure_ascii=False, default=str) + '\n')
+
+        if self._torn is None:
+            self._torn = self._ends_torn()
+        if self._torn:
+            lines.insert(0, '\n')  # Never glue a record onto a torn tail
+
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(lines))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self._torn = False
+        self.pending += len(records)
+
+    def _ends_torn(self) -> bool:
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return False
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b'\n'
+        except FileNotFoundError:
+            return False
+
+    @property
+    def needs_checkpoint(self) -> bool:
+        return self.pending >= self.checkpoint_every
+
+    def truncate(self) -> None:
+        """Empty the journal once a snapshot holding every record is on disk"""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            if self.fsync:
+                os.fsync(f.fileno())
+        self._torn = False
+        self.pending = 0
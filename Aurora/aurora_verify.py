@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Aurora Archive - Batch Card Verification (aurora-verify)
+Headless audit of the card archive using the Obelisk rules and RedSeal check
+
+Walks card directories, shards the images across a process pool and runs
+ObeliskValidator.validate_soulcard plus SealCompositor.validate_seal on each.
+Results stream out as JSONL (one object per card) and a throughput summary is
+printed to stderr.
+
+This tool only reports. It never deletes, moves or re-embeds a card, and it
+never appends the Obelisk validation mark. Its exit status makes it usable
+as an audit gate: 0 every card valid, 1 some card failed a check, 2 some
+card could not be checked (errors win over invalid cards).
+
+Usage:
+    python aurora_verify.py                       # Default archive directories
+    python aurora_verify.py data/cards -o audit.jsonl --workers 8
+
+Python 3.10+
+Dependencies: Pillow, NumPy
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+DEFAULT_DIRS = [
+    PROJECT_ROOT / "data" / "cards",
+    PROJECT_ROOT / "data" / "archived_cards",
+    PROJECT_ROOT / "Assets" / "member_cards",
+]
+
+CARD_SUFFIXES = {'.png'}
+
+# Exit status (argparse itself also exits 2 on a usage error)
+EXIT_OK = 0
+EXIT_INVALID = 1
+EXIT_ERRORS = 2
+
+# Per-process validators, created once by _init_worker
+_validator = None
+_compositor = None
+
+
+def iter_card_files(paths: List[Path]) -> Iterator[Path]:
+    """Yield card images under the given files/directories, sorted per directory"""
+    for path in paths:
+        if path.is_file():
+            if path.suffix.lower() in CARD_SUFFIXES:
+                yield path
+        elif path.is_dir():
+            for card in sorted(path.rglob('*')):
+                if card.is_file() and card.suffix.lower() in CARD_SUFFIXES:
+                    yield card
+
+
+def _init_worker(verbose: bool):
+    """Build the validators once per worker process"""
+    global _validator, _compositor
+
+    from obelisk_validator import ObeliskValidator
+    from seal_compositor import SealCompositor
+
+    if not verbose:
+        # A card without a seal is a finding, not an error worth a traceback
+        logging.getLogger('seal_compositor').setLevel(logging.CRITICAL)
+
+    _validator = ObeliskValidator()
+    _compositor = SealCompositor()
+
+
+def verify_card(card_path: str) -> Dict:
+    """
+    Run the Obelisk and RedSeal checks on one card
+
+    Returns:
+        JSON-serializable result record
+    """
+    started = time.perf_counter()
+    result = {
+        "path": card_path,
+        "obelisk_valid": False,
+        "obelisk_reason": None,
+        "seal_valid": False,
+        "member_id": None,
+    }
+
+    try:
+        is_valid, reason, card_data = _validator.validate_soulcard(card_path)
+        result["obelisk_valid"] = is_valid
+        result["obelisk_reason"] = reason
+        if card_data:
+            result["member_id"] = card_data.get("member_id")
+
+        result["seal_valid"] = _compositor.validate_seal(card_path)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["valid"] = result["obelisk_valid"] and result["seal_valid"]
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
+
+def run(
+    paths: List[Path],
+    output,
+    workers: Optional[int] = None,
+    chunksize: int = 16,
+    verbose: bool = False
+) -> Dict:
+    """
+    Verify every card under `paths`, streaming JSONL records to `output`
+
+    Args:
+        paths: Files or directories to audit
+        output: Text stream for JSONL records
+        workers: Process count (default: CPU count)
+        chunksize: Cards per shard handed to a worker
+        verbose: Keep seal_compositor error logging
+
+    Returns:
+        Summary dict (counts, elapsed seconds, cards per second)
+    """
+    cards = [str(card) for card in iter_card_files(paths)]
+    summary = {
+        "cards": len(cards),
+        "valid": 0,
+        "obelisk_valid": 0,
+        "seal_valid": 0,
+        "errors": 0,
+    }
+
+    started = time.perf_counter()
+    if cards:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(verbose,)
+        ) as executor:
+            for result in executor.map(verify_card, cards, chunksize=chunksize):
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output.flush()
+
+                summary["valid"] += result["valid"]
+                summary["obelisk_valid"] += result["obelisk_valid"]
+                summary["seal_valid"] += result["seal_valid"]
+                summary["errors"] += "error" in result
+
+    elapsed = time.perf_counter() - started
+    summary["elapsed_s"] = round(elapsed, 3)
+    summary["cards_per_s"] = round(len(cards) / elapsed, 1) if elapsed > 0 else 0.0
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """aurora-verify entry point"""
+    parser = argparse.ArgumentParser(
+        prog='aurora-verify',
+        description='Audit Aurora cards with the Obelisk and RedSeal checks (report only)\n\n'
+                    'exit status:\n'
+                    f'  {EXIT_OK}  every card passed both checks (or there were no cards)\n'
+                    f'  {EXIT_INVALID}  at least one card failed the Obelisk or seal check\n'
+                    f'  {EXIT_ERRORS}  at least one card could not be checked (error)',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help='Card files or directories (default: data/cards, data/archived_cards, Assets/member_cards)')
+    parser.add_argument('-o', '--output', type=str, help='Write JSONL here instead of stdout')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--chunksize', type=int, default=16, help='Cards per worker shard')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Show seal extraction errors')
+    args = parser.parse_args(argv)
+
+    paths = args.paths or [d for d in DEFAULT_DIRS if d.exists()]
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            summary = run(paths, output, args.workers, args.chunksize, args.verbose)
+    else:
+        summary = run(paths, sys.stdout, args.workers, args.chunksize, args.verbose)
+
+    print(
+        f"🏛️ Verified {summary['cards']} cards in {summary['elapsed_s']:.2f}s "
+        f"({summary['cards_per_s']} cards/s) | valid: {summary['valid']} | "
+        f"obelisk: {summary['obelisk_valid']} | seal: {summary['seal_valid']} | "
+        f"errors: {summary['errors']}",
+        file=sys.stderr
+    )
+    if summary['errors']:
+        return EXIT_ERRORS
+    if summary['valid'] < summary['cards']:
+        return EXIT_INVALID
+    return EXIT_OK
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Aurora Archive - batch_update Benchmark
+Updates 1,000 cards sequentially with update_data, then concurrently with batch_update
+
+Also checks that repeated updates to one card are serialized (no lost fields).
+
+Run from the Aurora directory:
+    python benchmarks/bench_batch_update.py [--cards 1000] [--concurrency N] [--size 512x768]
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mutable_steganography import MutableCardSteganography
+from card_cache import CardDataCache
+
+
+def make_cards(directory: Path, count: int, size: tuple) -> list:
+    """Create `count` cards with smooth (card-like, compressible) art"""
+    rng = np.random.default_rng(42)
+    stego = MutableCardSteganography(cache=CardDataCache(max_entries=0))
+    paths = []
+    for i in range(count):
+        art = rng.integers(0, 256, (24, 16, 3), dtype=np.uint8)
+        img = Image.fromarray(art, 'RGB').resize(size, Image.Resampling.BILINEAR)
+        path = directory / f"card_{i:04d}.png"
+        img.save(path, 'PNG')
+        stego.embed_data(str(path), {"member_id": f"m_{i:04d}", "tier": "Standard", "credits": 0})
+        paths.append(str(path))
+    return paths
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='batch_update benchmark')
+    parser.add_argument('--cards', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=None)
+    parser.add_argument('--size', type=str, default='512x768', help='Card WIDTHxHEIGHT')
+    args = parser.parse_args()
+    size = tuple(int(v) for v in args.size.lower().split('x'))
+
+    workdir = Path(tempfile.mkdtemp(prefix="aurora_bench_"))
+    try:
+        print(f"Creating {args.cards} cards in {workdir} ...")
+        paths = make_cards(workdir, args.cards, size)
+
+        # Sequential baseline: one synchronous update_data per card
+        stego = MutableCardSteganography(cache=CardDataCache(max_entries=0))
+        start = time.perf_counter()
+        for path in paths:
+            stego.update_data(path, {"tier": "Premium"})
+        sequential = time.perf_counter() - start
+
+        # Concurrent: batch_update over the worker pool
+        stego = MutableCardSteganography(
+            cache=CardDataCache(max_entries=0),
+            max_concurrency=args.concurrency
+        )
+        updates = [(path, {"tier": "Elite", "credits": 100}) for path in paths]
+        start = time.perf_counter()
+        results = asyncio.run(stego.batch_update(updates))
+        concurrent = time.perf_counter() - start
+
+        assert all(r["tier"] == "Elite" for r in results)
+        assert stego.extract_data(paths[-1])["tier"] == "Elite"
+
+        # Same-card updates must serialize: every field survives
+        same_card = [(paths[0], {f"field_{i}": i}) for i in range(20)]
+        asyncio.run(stego.batch_update(same_card))
+        final = stego.extract_data(paths[0])
+        lost = [i for i in range(20) if final.get(f"field_{i}") != i]
+
+        print(f"Cards: {args.cards} x {args.size} | workers: {stego.max_concurrency} | CPUs: {os.cpu_count()}")
+        print(f"  sequential update_data {sequential:7.2f} s | {args.cards / sequential:7.1f} cards/s")
+        print(f"  batch_update           {concurrent:7.2f} s | {args.cards / concurrent:7.1f} cards/s")
+        print(f"  speedup                {sequential / concurrent:7.2f}x")
+        print(f"  same-card serialization: {'✓ no lost updates' if not lost else f'✗ lost {lost}'}")
+        return 0 if not lost else 1
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
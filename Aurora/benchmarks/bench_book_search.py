@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Aurora Archive - Book Search Benchmark
+BookIndex.search vs the old linear substring scan over a synthetic inventory
+
+Queries replay someone typing real titles, author names and ISBNs one
+character at a time (search-as-you-type), and latency is reported by query
+length. Results are checked against a brute-force scan with the same
+prefix semantics.
+
+Run from the Aurora directory:
+    python benchmarks/bench_book_search.py [--books 100000] [--queries 100] [--limit 20]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from book_index import BookIndex, normalize_isbn, tokenize
+
+
+SYLLABLES = ["ar", "be", "cal", "dor", "el", "fen", "gri", "hal", "is", "jor", "ka", "lum",
+             "mor", "nel", "or", "pen", "qua", "ri", "sol", "tar", "um", "vel", "wyn", "xa",
+             "yor", "zen", "th", "an", "ed", "in", "on", "st"]
+STOPWORDS = ["the", "of", "and", "a", "in", "to"]
+
+
+def make_books(count: int, seed: int = 7) -> dict:
+    """Titles and authors drawn Zipf-like from invented vocabularies
+
+    The most common title word lands in ~4% of titles; "the"/"of"/... in 40%.
+    """
+    rng = random.Random(seed)
+    vocab = sorted({''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+                  for _ in range(20000)})
+    surnames = sorted({''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).title()
+                     for _ in range(5000)})
+    rng.shuffle(vocab)  # Frequency rank independent of spelling
+    given = [s.title() for s in vocab[:400]]
+    weights = [1 / (rank + 10) for rank in range(len(vocab))]
+
+    books = {}
+    for i in range(count):
+        words = rng.choices(vocab, weights, k=rng.randint(1, 5))
+        if rng.random() < 0.4:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(STOPWORDS))
+        isbn = f"978-{rng.randint(0, 9)}-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}-{rng.randint(0, 9)}"
+        books[f"book_{i:06d}"] = {
+            "book_id": f"book_{i:06d}",
+            "title": ' '.join(words).title(),
+            "author": f"{rng.choice(given)} {rng.choice(surnames)}",
+            "isbn": isbn,
+            "available_copies": 1,
+        }
+    return books
+
+
+def linear_search(books: dict, query: str) -> list:
+    """The previous DatabaseManager.search_books"""
+    query_lower = query.lower()
+    return [
+        book for book in books.values()
+        if (query_lower in book.get('title', '').lower() or
+            query_lower in book.get('author', '').lower() or
+            query_lower in book.get('isbn', '').lower())
+    ]
+
+
+def brute_force_ids(books: dict, query: str) -> set:
+    """Reference answer with BookIndex semantics"""
+    words = tokenize(query)
+    isbn = normalize_isbn(query)
+    matched = set()
+    for book_id, book in books.items():
+        tokens = tokenize(book['title']) + tokenize(book['author'])
+        if words and all(any(token.startswith(word) for token in tokens) for word in words):
+            matched.add(book_id)
+        elif len(isbn) >= 3 and normalize_isbn(book['isbn']).startswith(isbn):
+            matched.add(book_id)
+    return matched
+
+
+def typed_queries(books: dict, count: int, seed: int = 11) -> list:
+    """Every prefix of `count` titles, author names and ISBNs"""
+    rng = random.Random(seed)
+    sample = rng.sample(list(books.values()), count)
+    queries = []
+    for i, book in enumerate(sample):
+        text = (book['title'], book['author'], book['isbn'])[i % 3]
+        queries += [text[:n] for n in range(1, len(text) + 1) if not text[n - 1].isspace()]
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--books', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=100, help="Titles/authors/ISBNs typed out")
+    parser.add_argument('--limit', type=int, default=20, help="Results per query (GUI page size)")
+    args = parser.parse_args()
+
+    books = make_books(args.books)
+    index = BookIndex()
+    started = time.perf_counter()
+    index.rebuild(books)
+    print(f"{len(books)} books | index build {time.perf_counter() - started:.2f}s | "
+          f"{len(index._vocab)} distinct tokens")
+
+    queries = typed_queries(books, args.queries)
+    buckets = {"1-2 chars": [], "3-5 chars": [], "6+ chars": []}
+    all_times, limited = [], []
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query)
+        elapsed = time.perf_counter() - started
+        all_times.append(elapsed)
+        bucket = "1-2 chars" if len(query) <= 2 else "3-5 chars" if len(query) <= 5 else "6+ chars"
+        buckets[bucket].append(elapsed)
+
+        started = time.perf_counter()
+        index.search(query, limit=args.limit)
+        limited.append(time.perf_counter() - started)
+
+    def row(label, samples):
+        return (f"  {label:<22}{len(samples):>6}  p50 {np.percentile(samples, 50) * 1000:>8.3f}ms  "
+                f"p99 {np.percentile(samples, 99) * 1000:>8.3f}ms")
+
+    linear = []
+    for query in queries[:200]:
+        started = time.perf_counter()
+        linear_search(books, query)
+        linear.append(time.perf_counter() - started)
+
+    print(f"{len(queries)} type-ahead queries")
+    print(row("linear scan (old)", linear))
+    print(row("index, all results", all_times))
+    for label, samples in buckets.items():
+        print(row(f"  {label}", samples))
+    print(row(f"index, limit={args.limit}", limited))
+
+    started = time.perf_counter()
+    for i in range(1000):
+        book_id = f"book_{i:06d}"
+        index.update(book_id, {**books[book_id], "title": books[book_id]["title"] + " Revised"})
+    print(f"  update (title change)  {(time.perf_counter() - started) / 1000 * 1e6:>6.1f}us per book")
+    index.rebuild(books)
+
+    rng = random.Random(3)
+    checked = rng.sample(queries, 30)
+    ok = all(set(index.search(query)) == brute_force_ids(books, query) for query in checked)
+    print(f"  results match brute force on {len(checked)} queries: {'✓' if ok else '✗'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Aurora Archive - Card Save Benchmark
+p50/p99 latency of the PNG save in a card update, per card_png save mode
+
+Cards start as plain Pillow PNGs. The first update in a region-aware mode
+converts a card to the split layout (a full encode); later updates only
+re-compress the embed region. Both phases are reported. For 'hot', the time
+for the background recompressor to drain and the resulting sizes are shown.
+
+Run from the Aurora directory:
+    python benchmarks/bench_card_save.py [--cards 200] [--rounds 5] [--size 512x768]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import card_png
+from mutable_steganography import MutableCardSteganography
+from card_cache import CardDataCache
+
+
+def make_cards(directory: Path, count: int, size: tuple) -> list:
+    """Create `count` Pillow-encoded cards with smooth art and a little grain"""
+    rng = np.random.default_rng(42)
+    stego = MutableCardSteganography(cache=CardDataCache(max_entries=0), save_mode="pillow")
+    paths = []
+    for i in range(count):
+        art = rng.integers(0, 256, (24, 16, 3), dtype=np.uint8)
+        img = Image.fromarray(art, 'RGB').resize(size, Image.Resampling.BILINEAR)
+        pixels = np.asarray(img, dtype=np.int16) + rng.integers(-2, 3, (size[1], size[0], 3))
+        img = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8), 'RGB')
+        path = directory / f"card_{i:04d}.png"
+        img.save(path, 'PNG')
+        stego.embed_data(str(path), {"member_id": f"m_{i:04d}", "tier": "Standard", "credits": 0})
+        paths.append(str(path))
+    return paths
+
+
+def percentile(samples: list, pct: float) -> float:
+    return float(np.percentile(samples, pct)) * 1000
+
+
+def update_round(stego: MutableCardSteganography, paths: list, value: int) -> tuple:
+    """One update per card; returns (save latencies, whole-update latencies)"""
+    saves, updates = [], []
+    for path in paths:
+        started = time.perf_counter()
+        card = stego.open_card(path)
+        data = stego._strip_meta(stego._read_card_data(card))
+        data["credits"] = value
+        stego._write_card_data(card, data)
+
+        save_started = time.perf_counter()
+        stamp = card.save(path, stego.save_mode)
+        finished = time.perf_counter()
+
+        if stego.save_mode == "hot":
+            card_png.get_recompressor().submit(path, stamp, stego.cache)
+        saves.append(finished - save_started)
+        updates.append(finished - started)
+    return saves, updates
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Card save latency benchmark')
+    parser.add_argument('--cards', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=5, help='Updates per card after the first')
+    parser.add_argument('--size', type=str, default='512x768', help='Card WIDTHxHEIGHT')
+    args = parser.parse_args()
+    size = tuple(int(v) for v in args.size.lower().split('x'))
+
+    workdir = Path(tempfile.mkdtemp(prefix="aurora_bench_"))
+    try:
+        print(f"Creating {args.cards} cards in {workdir} ...")
+        (workdir / "originals").mkdir()
+        originals = make_cards(workdir / "originals", args.cards, size)
+        original_bytes = sum(os.path.getsize(p) for p in originals)
+
+        print(f"Cards: {args.cards} x {args.size} | rounds: 1 + {args.rounds} | "
+              f"original avg size {original_bytes / args.cards / 1024:.0f} KB")
+        print(f"  {'mode':<7} {'phase':<8} {'save p50':>9} {'save p99':>9} {'update p50':>11} {'update p99':>11} {'avg KB':>7}")
+
+        ok = True
+        for mode in card_png.SAVE_MODES:
+            mode_dir = workdir / mode
+            mode_dir.mkdir()
+            paths = []
+            for original in originals:
+                path = mode_dir / Path(original).name
+                shutil.copyfile(original, path)
+                paths.append(str(path))
+
+            stego = MutableCardSteganography(cache=CardDataCache(max_entries=0), save_mode=mode)
+
+            phases = [("first", update_round(stego, paths, 1))]
+            steady_saves, steady_updates = [], []
+            for r in range(args.rounds):
+                saves, updates = update_round(stego, paths, r + 2)
+                steady_saves += saves
+                steady_updates += updates
+            phases.append(("steady", (steady_saves, steady_updates)))
+
+            avg_kb = sum(os.path.getsize(p) for p in paths) / len(paths) / 1024
+            for phase, (saves, updates) in phases:
+                print(f"  {mode:<7} {phase:<8} {percentile(saves, 50):7.2f}ms {percentile(saves, 99):7.2f}ms "
+                      f"{percentile(updates, 50):9.2f}ms {percentile(updates, 99):9.2f}ms {avg_kb:7.0f}")
+
+            if mode == "hot":
+                started = time.perf_counter()
+                card_png.get_recompressor().wait()
+                drained = time.perf_counter() - started
+                avg_kb = sum(os.path.getsize(p) for p in paths) / len(paths) / 1024
+                print(f"  {'':<7} {'drained':<8} background recompress finished {drained:.2f}s later, "
+                      f"avg {avg_kb:.0f} KB | {card_png.get_recompressor().stats()}")
+
+            expected = args.rounds + 1
+            ok &= all(stego.extract_data(p)["credits"] == expected for p in paths)
+            ok &= all(np.array_equal(
+                np.asarray(Image.open(p).convert('RGB'))[100:],
+                np.asarray(Image.open(o).convert('RGB'))[100:]
+            ) for p, o in zip(paths[:10], originals[:10]))
+
+        print(f"  data and art intact: {'✓' if ok else '✗'}")
+        return 0 if ok else 1
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
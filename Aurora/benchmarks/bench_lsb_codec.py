@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Aurora Archive - LSB Codec Benchmark
+Compares the legacy per-pixel LSB loops against lsb_codec on a full 100x100 region
+
+Run from the Aurora directory:
+    python benchmarks/bench_lsb_codec.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import lsb_codec
+
+REGION = 100
+REQUIRED_SPEEDUP = 50.0
+
+
+def legacy_embed(img: Image.Image, full_binary: str):
+    """The original string-and-pixel-loop embed from MutableCardSteganography"""
+    pixels = img.load()
+    data_index = 0
+    for y in range(REGION):
+        for x in range(REGION):
+            if data_index >= len(full_binary):
+                break
+            r, g, b = pixels[x, y]
+            if data_index < len(full_binary):
+                r = (r & 0xFE) | int(full_binary[data_index])
+                data_index += 1
+            if data_index < len(full_binary):
+                g = (g & 0xFE) | int(full_binary[data_index])
+                data_index += 1
+            if data_index < len(full_binary):
+                b = (b & 0xFE) | int(full_binary[data_index])
+                data_index += 1
+            pixels[x, y] = (r, g, b)
+        if data_index >= len(full_binary):
+            break
+    return img
+
+
+def legacy_extract(img: Image.Image) -> str:
+    """The original string-concatenation extract loop"""
+    pixels = img.load()
+    binary_data = ''
+    for y in range(REGION):
+        for x in range(REGION):
+            r, g, b = pixels[x, y]
+            binary_data += str(r & 1)
+            binary_data += str(g & 1)
+            binary_data += str(b & 1)
+    payload = ''
+    for i in range(32, len(binary_data), 8):
+        byte = binary_data[i:i+8]
+        if len(byte) == 8:
+            payload += chr(int(byte, 2))
+    return payload
+
+
+def codec_embed(img: Image.Image, bits: np.ndarray):
+    lsb_codec.embed_bits(img, bits, REGION)
+    return img
+
+
+def codec_extract(img: Image.Image) -> bytes:
+    bits = lsb_codec.extract_bits(img, REGION)
+    return lsb_codec.bits_to_bytes(bits[lsb_codec.LENGTH_HEADER_BITS:])
+
+
+def best_of(func, *args, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    rng = np.random.default_rng(7)
+    base = Image.fromarray(rng.integers(0, 256, (768, 512, 3), dtype=np.uint8), 'RGB')
+
+    # Fill the whole region: 30,000 bits = 32-bit header + 3746 payload bytes
+    payload_bytes = (REGION * REGION * 3 - lsb_codec.LENGTH_HEADER_BITS) // 8
+    payload = bytes(rng.integers(0, 128, payload_bytes, dtype=np.uint8))
+    bits = lsb_codec.encode_frame(len(payload), payload)
+    full_binary = ''.join(map(str, bits.tolist()))
+
+    # Sanity check: both paths produce identical pixels
+    legacy_img = legacy_embed(base.copy(), full_binary)
+    codec_img = codec_embed(base.copy(), bits)
+    assert np.array_equal(np.asarray(legacy_img), np.asarray(codec_img)), "Codec output differs"
+    assert legacy_extract(codec_img).encode('latin-1') == codec_extract(codec_img)
+
+    legacy_embed_t = best_of(lambda: legacy_embed(base.copy(), full_binary))
+    codec_embed_t = best_of(lambda: codec_embed(base.copy(), bits))
+    legacy_extract_t = best_of(legacy_extract, codec_img)
+    codec_extract_t = best_of(codec_extract, codec_img)
+
+    # Both embed timings include a base.copy(); subtract it for fairness
+    copy_t = best_of(base.copy)
+    legacy_embed_t -= copy_t
+    codec_embed_t -= copy_t
+
+    embed_speedup = legacy_embed_t / codec_embed_t
+    extract_speedup = legacy_extract_t / codec_extract_t
+
+    print(f"Region: {REGION}x{REGION} ({bits.size} bits)")
+    print(f"  embed   legacy {legacy_embed_t * 1000:8.2f} ms | codec {codec_embed_t * 1000:6.2f} ms | {embed_speedup:6.1f}x")
+    print(f"  extract legacy {legacy_extract_t * 1000:8.2f} ms | codec {codec_extract_t * 1000:6.2f} ms | {extract_speedup:6.1f}x")
+
+    if min(embed_speedup, extract_speedup) < REQUIRED_SPEEDUP:
+        print(f"✗ Speedup below {REQUIRED_SPEEDUP:.0f}x")
+        return 1
+    print(f"✓ Speedup at least {REQUIRED_SPEEDUP:.0f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Aurora Archive - Member Startup Benchmark
+DatabaseManager cold start and member reads, eager vs lazy (on-demand) loading
+
+Startup is measured in a fresh process per mode, the way memory_api_server
+pays for it at import. Reads compare a hot working set (LRU hits) with
+uniformly random members (mostly store reads), plus the login lookup by
+email and a full streaming pass. First, each backend is checked to import a
+legacy members_database.json once: members deleted afterwards must stay
+deleted across a restart.
+
+Run from the Aurora directory:
+    python benchmarks/bench_member_startup.py [--members 1000 10000 100000] [--cache 10000]
+"""
+
+import argparse
+import json
+import logging
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+AURORA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(AURORA_DIR))
+
+logging.disable(logging.WARNING)
+
+from database_manager import DatabaseManager
+
+
+STARTUP = """
+import logging, sys, time
+sys.path.insert(0, {aurora!r})
+logging.disable(logging.WARNING)
+started = time.perf_counter()
+from database_manager import DatabaseManager
+db = DatabaseManager({data_dir!r}, lazy={lazy})
+db.get_member_by_email('member42@example.com')
+print(time.perf_counter() - started)
+"""
+
+
+def populate(data_dir: str, count: int):
+    db = DatabaseManager(data_dir, lazy=False)
+    with db.batch():
+        for i in range(count):
+            db.add_member({
+                'member_id': f'm{i:07d}', 'email': f'member{i}@example.com', 'thread_id': f't{i}',
+                'access_tier': i % 7 + 1, 'member_profile': {'name': f'Member {i}', 'bio': 'x' * 400},
+                'audit_trail': [{'action': 'created', 'timestamp': '2025-01-01T00:00:00'}] * 5,
+            })
+    db.close()
+
+
+def check_legacy_import(backend: str) -> bool:
+    """Import a legacy JSON, delete every member, restart: nothing comes back"""
+    data_dir = tempfile.mkdtemp(prefix="aurora_legacy_")
+    try:
+        legacy = {f'm{i}': {'member_id': f'm{i}', 'email': f'legacy{i}@example.com', 'access_tier': 1}
+                  for i in range(3)}
+        with open(Path(data_dir) / "members_database.json", 'w', encoding='utf-8') as f:
+            json.dump({'metadata': {}, 'members': legacy}, f)
+        db = DatabaseManager(data_dir, backend=backend)
+        imported = sorted(db.members) == sorted(legacy)
+        for member_id in legacy:
+            db.delete_member(member_id)
+        db.close()
+        db = DatabaseManager(data_dir, backend=backend)
+        restarted = len(db.members) == 0
+        db.close()
+        return imported and restarted
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def cold_start(data_dir: str, lazy: bool) -> float:
+    code = STARTUP.format(aurora=str(AURORA_DIR), data_dir=data_dir, lazy=lazy)
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return float(output.stdout.strip().splitlines()[-1]) * 1000
+
+
+def read_latency(db: DatabaseManager, member_ids: list, reads: int = 20000) -> float:
+    started = time.perf_counter()
+    for member_id in member_ids[:reads]:
+        db.get_member(member_id)
+    return (time.perf_counter() - started) / min(reads, len(member_ids)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--members', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--cache', type=int, default=10000, help="Lazy mode LRU size")
+    args = parser.parse_args()
+
+    for backend in ("sqlite", "log", "json"):
+        print(f"{'✓' if check_legacy_import(backend) else '✗'} {backend}: legacy JSON imported once, "
+              f"deleted members stay deleted after restart")
+
+    rng = random.Random(1)
+    for count in args.members:
+        data_dir = tempfile.mkdtemp(prefix="aurora_lazy_")
+        try:
+            populate(data_dir, count)
+            eager_ms = np.median([cold_start(data_dir, False) for _ in range(3)])
+            lazy_ms = np.median([cold_start(data_dir, True) for _ in range(3)])
+            print(f"{count} members: cold start + first login  eager {eager_ms:>8.1f}ms  lazy {lazy_ms:>6.1f}ms")
+
+            ids = [f'm{i:07d}' for i in range(count)]
+            hot = [rng.choice(ids[:args.cache // 2]) for _ in range(20000)]
+            uniform = [rng.choice(ids) for _ in range(20000)]
+            emails = [f'member{rng.randrange(count)}@example.com' for _ in range(2000)]
+            for lazy in (False, True):
+                db = DatabaseManager(data_dir, lazy=lazy, cache_size=args.cache)
+                hot_us = read_latency(db, hot)
+                uniform_us = read_latency(db, uniform)
+                started = time.perf_counter()
+                for email in emails:
+                    db.get_member_by_email(email)
+                email_us = (time.perf_counter() - started) / len(emails) * 1e6
+                started = time.perf_counter()
+                streamed = sum(1 for _ in db.get_all_members())
+                stream_ms = (time.perf_counter() - started) * 1000
+                print(f"  {'lazy ' if lazy else 'eager'}  get_member hot {hot_us:>6.1f}us  random {uniform_us:>6.1f}us  "
+                      f"by email {email_us:>6.1f}us  all members {stream_ms:>7.1f}ms ({streamed})")
+                db.close()
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
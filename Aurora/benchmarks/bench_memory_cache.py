@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Aurora Archive - Recent Event Cache Benchmark
+Memory API read path with and without the per-thread ring buffers
+
+Replays a request mix the way memory_api_server does (a fresh
+UserMemoryBridge per request): mostly loads at the tier depths, some
+stores, with a few hot users doing most of the traffic. Cached reads
+must equal disk reads.
+
+Run from the Aurora directory:
+    python benchmarks/bench_memory_cache.py [--threads 200] [--history 5000] [--requests 20000]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from jsonl_tail import tail_jsonl
+from user_memory_bridge import UserMemoryBridge, get_event_cache
+
+logging.disable(logging.WARNING)
+
+
+def replay(requests: list, cached: bool) -> dict:
+    cache = get_event_cache()
+    cache.clear()
+    cache.max_bytes = 64 * 1024 * 1024 if cached else 0
+    latencies = {"load": [], "store": []}
+    for kind, thread_id, tier, n in requests:
+        started = time.perf_counter()
+        bridge = UserMemoryBridge(thread_id=thread_id, access_tier=tier)
+        if kind == "load":
+            bridge.load_user_context(last_n=n)
+        else:
+            bridge.store_user_event("user", "hello " * 20, emotion_state={"primary": "joy", "intensity": 0.5})
+        latencies[kind].append(time.perf_counter() - started)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--threads', type=int, default=200)
+    parser.add_argument('--history', type=int, default=5000, help="Events already in each thread")
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="aurora_cache_"))  # UserMemoryBridge writes under ./memory
+    rng = random.Random(6)
+    threads = [f"thread-{i:04d}" for i in range(args.threads)]
+    tiers = {thread_id: rng.choice([2, 3, 4, 5, 6]) for thread_id in threads}
+    for thread_id in threads:
+        bridge = UserMemoryBridge(thread_id=thread_id, access_tier=tiers[thread_id])
+        with open(bridge.user_memory_file, 'w', encoding='utf-8') as f:
+            for i in range(args.history):
+                f.write(json.dumps({"event_id": str(i), "role": "user", "content": "x" * rng.randint(50, 400),
+                                    "emotion_state": {}, "metadata": {}}) + '\n')
+
+    weights = [1 / (rank + 1) for rank in range(args.threads)]  # A few hot users
+    requests = []
+    for _ in range(args.requests):
+        thread_id = rng.choices(threads, weights)[0]
+        tier = tiers[thread_id]
+        if rng.random() < 0.2:
+            requests.append(("store", thread_id, tier, None))
+        else:
+            depth = UserMemoryBridge.TIER_CONFIG[tier]["memory_depth"]
+            requests.append(("load", thread_id, tier, rng.choice([10, 20, depth])))
+
+    print(f"{args.threads} threads x {args.history} events, {args.requests} requests (80% loads)")
+    for cached in (False, True):
+        latencies = replay(requests, cached)
+        cache = get_event_cache()
+        row = "  ".join(
+            f"{kind} p50 {np.percentile(samples, 50) * 1e6:>7.1f}us p99 {np.percentile(samples, 99) * 1e6:>8.1f}us"
+            for kind, samples in latencies.items()
+        )
+        extra = (f"  | hit rate {cache.hits / max(1, cache.hits + cache.misses):.1%}, "
+                 f"{len(cache)} threads, {cache.cached_bytes / 1e6:.1f} MB") if cached else ""
+        print(f"  {'ring buffers' if cached else 'disk (tail) '}  {row}{extra}")
+
+    ok = all(
+        UserMemoryBridge(thread_id=thread_id, access_tier=6).load_user_context(last_n=200)
+        == tail_jsonl(UserMemoryBridge(thread_id=thread_id, access_tier=6).user_memory_file, 200)
+        for thread_id in threads[:20]
+    )
+    print(f"  cached loads match disk: {'✓' if ok else '✗'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Aurora Archive - Memory Thread Segments Benchmark
+One ever-growing thread file vs sealed segments with a manifest
+
+Builds a long thread, times get_memory_stats() and tail / full loads on
+the single file, then after the compactor seals it into segments, then
+again once every segment is gzipped (the compactor only compresses
+segments untouched for a day, so recent reads normally hit plain ones).
+Results must be identical throughout. Finally re-runs a seal that crashed
+just before unlinking its sealing file.
+
+Run from the Aurora directory:
+    python benchmarks/bench_memory_segments.py [--events 100000] [--segment-kb 1024]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from thread_segments import SEALING_NAME, ThreadCompactor, ThreadSegments
+from user_memory_bridge import UserMemoryBridge, get_event_cache
+
+logging.disable(logging.WARNING)
+
+
+def timed(fn, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat * 1000, result
+
+
+def disk_bytes(bridge: UserMemoryBridge) -> int:
+    total = bridge.user_memory_file.stat().st_size
+    if bridge.segments.segments_dir.exists():
+        total += sum(path.stat().st_size for path in bridge.segments.segments_dir.iterdir())
+    return total
+
+
+def measure(bridge: UserMemoryBridge, repeat: int) -> dict:
+    results = {}
+    results['stats'] = timed(bridge.get_memory_stats, repeat)
+    for last_n in (10, 500):
+        results[f'last {last_n}'] = timed(lambda: bridge.segments.tail(last_n), repeat)
+    results['all (tier 7)'] = timed(lambda: bridge.load_user_context(-1), 1)
+    return results
+
+
+def check_crash_recovery(events: int = 100) -> bool:
+    """A seal that crashed after saving its manifest is not sealed twice"""
+    path = Path(tempfile.mkdtemp(prefix="aurora_seal_crash_")) / "thread.jsonl"
+    path.write_bytes(b''.join(
+        (json.dumps({"event_id": str(i), "timestamp": f"2025-01-01T00:00:{i:08d}Z"}) + '\n').encode()
+        for i in range(events)))
+    segments = ThreadSegments(path, segment_bytes=1024)
+    unlink = Path.unlink
+
+    def crash(self, *args, **kwargs):
+        if self.name == SEALING_NAME:
+            raise KeyboardInterrupt("crash before the unlink")
+        return unlink(self, *args, **kwargs)
+
+    Path.unlink = crash
+    try:
+        segments.seal(force=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        Path.unlink = unlink
+    counts = [segments.stats()['events']]
+    segments.seal(force=True)
+    counts += [segments.stats()['events'], len(segments.tail(None))]
+    return counts == [events] * 3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--events', type=int, default=100000)
+    parser.add_argument('--segment-kb', type=int, default=1024)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="aurora_segments_"))  # UserMemoryBridge writes under ./memory
+    rng = random.Random(21)
+    bridge = UserMemoryBridge(thread_id="bench-sanctum", access_tier=7)
+    with open(bridge.user_memory_file, 'w', encoding='utf-8') as f:
+        for i in range(args.events):
+            f.write(json.dumps({
+                "event_id": str(i), "timestamp": f"2025-01-01T00:00:{i:08d}Z", "source": "edrive",
+                "role": rng.choice(["user", "assistant"]), "content": "lorem ipsum " * rng.randint(5, 60),
+                "emotion_state": {"primary": "joy", "intensity": rng.random()}, "metadata": {"tier_at_time": 7},
+            }) + '\n')
+    print(f"{args.events} events, {disk_bytes(bridge) / 1e6:.1f} MB in one file")
+    before = measure(bridge, args.repeat)
+
+    compactor = ThreadCompactor(bridge.threads_dir, segment_bytes=args.segment_kb * 1024, compress_after_s=0)
+    started = time.perf_counter()
+    sealed = compactor.run_once()['sealed']
+    print(f"sealed {sealed} segments in {time.perf_counter() - started:.2f}s")
+
+    # A few appends after the seal live in the new active file
+    for i in range(3):
+        bridge.store_user_event("user", f"after seal {i}")
+    expected_total = args.events + 3
+    plain = measure(bridge, args.repeat)
+
+    started = time.perf_counter()
+    compressed = bridge.segments.compress(older_than_s=0)
+    print(f"gzipped {compressed} segments in {time.perf_counter() - started:.2f}s "
+          f"-> {disk_bytes(bridge) / 1e6:.1f} MB on disk")
+    after = measure(bridge, args.repeat)
+
+    print(f"\n{'':<14}{'one file':>12}{'segments':>12}{'gzipped':>12}")
+    for name in before:
+        print(f"{name:<14}{before[name][0]:>10.2f}ms{plain[name][0]:>10.2f}ms{after[name][0]:>10.2f}ms")
+
+    stats = after['stats'][1]
+    everything = after['all (tier 7)'][1]
+    old_all = before['all (tier 7)'][1]
+    print()
+    print(f"{'✓' if stats['event_count'] == expected_total else '✗'} stats count {stats['event_count']} "
+          f"from {stats['segment_count']} segments")
+    print(f"{'✓' if everything[3:] == old_all and everything == plain['all (tier 7)'][1] else '✗'} full load matches")
+    print(f"{'✓' if after['last 500'][1][3:] == before['last 500'][1][:497] else '✗'} last 500 spans active + sealed")
+    print(f"{'✓' if stats['first_event'] == before['stats'][1]['first_event'] else '✗'} first event from manifest")
+
+    get_event_cache().clear()
+    cached = bridge.load_user_context(last_n=500)
+    print(f"{'✓' if cached == everything[:500] else '✗'} event cache fills from sealed segments")
+    print(f"{'✓' if check_crash_recovery() else '✗'} seal crashed before its unlink, re-run: 100 events, not 200")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Aurora Archive - Memory Thread Tail Benchmark
+UserMemoryBridge.load_user_context: reverse tail read vs the old full parse
+
+Builds thread files of growing length and times loading the last N events
+(the tier memory depths) both ways; results must be identical.
+
+Run from the Aurora directory:
+    python benchmarks/bench_memory_tail.py [--events 1000 10000 100000]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from user_memory_bridge import UserMemoryBridge
+
+logging.disable(logging.WARNING)
+
+
+def full_parse(path: Path, last_n: int) -> list:
+    """The previous load_user_context"""
+    events = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                events.append(json.loads(line))
+    events = events[-last_n:]
+    events.reverse()
+    return events
+
+
+def timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--events', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="aurora_tail_"))  # UserMemoryBridge writes under ./memory
+    rng = random.Random(4)
+    for count in args.events:
+        bridge = UserMemoryBridge(thread_id=f"bench-{count}", access_tier=6)
+        with open(bridge.user_memory_file, 'w', encoding='utf-8') as f:
+            for i in range(count):
+                f.write(json.dumps({
+                    "event_id": str(i), "timestamp": f"2025-01-01T00:00:{i:08d}Z", "source": "edrive",
+                    "role": rng.choice(["user", "assistant"]), "content": "lorem ipsum " * rng.randint(5, 60),
+                    "emotion_state": {"primary": "joy", "intensity": rng.random()}, "metadata": {"tier_at_time": 6},
+                }) + '\n')
+        size_mb = bridge.user_memory_file.stat().st_size / 1e6
+        print(f"{count} events ({size_mb:.1f} MB)")
+        for last_n in (10, 50, 500):
+            repeat = max(1, 2000 // count)
+            old_ms, expected = timed(lambda: full_parse(bridge.user_memory_file, last_n), repeat)
+            new_ms, result = timed(lambda: bridge.load_user_context(last_n=last_n), 200)
+            print(f"  last {last_n:<4} full parse {old_ms:>8.2f}ms  tail {new_ms:>6.3f}ms  "
+                  f"{'✓' if result == expected else '✗'}")
+
+
+if __name__ == '__main__':
+    main()
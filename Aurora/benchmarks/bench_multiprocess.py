@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Aurora Archive - Multi-Process DatabaseManager Benchmark
+Several processes writing one data directory, per member store backend
+
+Each worker increments a shared counter member (read-modify-write inside
+db.batch()), adds its own members and books. Afterwards no increment may be
+lost and every record must be visible to a process that was open the whole
+time. Also reports the read-side cost of change detection and how long one
+process takes to pick up a single record changed by another, and checks
+that sqlite delete tombstones stay bounded: a reader that fell behind the
+pruning still ends up with the writer's members.
+
+Run from the Aurora directory:
+    python benchmarks/bench_multiprocess.py [--workers 4] [--ops 100] [--members 5000]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+logging.disable(logging.WARNING)
+
+from database_manager import DEFAULT_REFRESH_MS, DatabaseManager
+from member_store import BACKENDS, SQLiteMemberStore
+
+
+def worker(data_dir: str, backend: str, worker_id: int, ops: int):
+    db = DatabaseManager(data_dir, backend=backend)
+    for i in range(ops):
+        with db.batch():
+            counter = db.get_member('counter')
+            db.update_member('counter', {'n': counter['n'] + 1})
+        db.add_member({'member_id': f'w{worker_id}_{i}', 'email': f'w{worker_id}_{i}@example.com'})
+        db.add_book({'book_id': f'b{worker_id}_{i}', 'title': f'Book {worker_id}-{i}'})
+    db.close()
+
+
+def contention(backend: str, workers: int, ops: int) -> str:
+    data_dir = tempfile.mkdtemp(prefix="aurora_mp_")
+    try:
+        db = DatabaseManager(data_dir, backend=backend)
+        db.add_member({'member_id': 'counter', 'n': 0})
+
+        started = time.perf_counter()
+        processes = [
+            multiprocessing.Process(target=worker, args=(data_dir, backend, w, ops))
+            for w in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+        expected = workers * ops
+        counter = db.get_member('counter')['n']
+        members = len(db.get_all_members()) - 1
+        books = len(db.get_all_books())
+        ok = counter == members == books == expected
+        db.close()
+        return (f"  {backend:<7}{elapsed:>7.2f}s  counter {counter}/{expected}  "
+                f"members {members}  books {books}  {'✓' if ok else '✗'}")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def change_detection(backend: str, members: int) -> str:
+    data_dir = tempfile.mkdtemp(prefix="aurora_mp_")
+    try:
+        writer = DatabaseManager(data_dir, backend=backend)
+        with writer.batch():
+            for i in range(members):
+                writer.add_member({'member_id': f'm{i}', 'email': f'm{i}@example.com', 'bio': 'x' * 300})
+        strict = DatabaseManager(data_dir, backend=backend, refresh_ms=0)
+        reader = DatabaseManager(data_dir, backend=backend)
+
+        reads = 20000
+        started = time.perf_counter()
+        for _ in range(reads):
+            strict.get_member_by_email('m42@example.com')
+        strict_us = (time.perf_counter() - started) / reads * 1e6
+        strict.close()
+        started = time.perf_counter()
+        for _ in range(reads):
+            reader.get_member_by_email('m42@example.com')
+        read_us = (time.perf_counter() - started) / reads * 1e6
+
+        writer.update_member('m7', {'bio': 'changed'})
+        started = time.perf_counter()
+        reader.refresh()
+        refresh_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        reader.store.load_all()
+        reload_ms = (time.perf_counter() - started) * 1000
+
+        ok = reader.get_member('m7')['bio'] == 'changed'
+        writer.close()
+        reader.close()
+        return (f"  {backend:<7}read {read_us:>5.1f}us (checking every read {strict_us:>5.1f}us)  pick up 1 change {refresh_ms:>6.2f}ms  "
+                f"(full reload {reload_ms:.1f}ms)  {'✓' if ok else '✗'}")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def tombstone_pruning(lazy: bool) -> str:
+    data_dir = tempfile.mkdtemp(prefix="aurora_mp_")
+    keep, every = SQLiteMemberStore.TOMBSTONE_GENERATIONS, SQLiteMemberStore.TOMBSTONE_PRUNE_EVERY
+    SQLiteMemberStore.TOMBSTONE_GENERATIONS, SQLiteMemberStore.TOMBSTONE_PRUNE_EVERY = 50, 10
+    try:
+        writer = DatabaseManager(data_dir)
+        reader = DatabaseManager(data_dir, lazy=lazy, refresh_ms=0)
+        for i in range(300):
+            writer.add_member({'member_id': f'm{i}', 'email': f'm{i}@example.com'})
+        reader.get_member('m0')  # Cached, then deleted past the pruning window
+        for i in range(0, 300, 2):
+            writer.delete_member(f'm{i}')
+        tombstones = writer.store._conn.execute("SELECT COUNT(*) FROM deleted_members").fetchone()[0]
+        seen = sorted(member['member_id'] for member in reader.get_all_members())
+        ok = seen == sorted(f'm{i}' for i in range(1, 300, 2)) and reader.get_member('m0') is None and tombstones <= 60
+        writer.close()
+        reader.close()
+        return f"  {'lazy ' if lazy else 'eager'}  {tombstones} tombstones kept after 150 deletes  {'✓' if ok else '✗'}"
+    finally:
+        SQLiteMemberStore.TOMBSTONE_GENERATIONS, SQLiteMemberStore.TOMBSTONE_PRUNE_EVERY = keep, every
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--ops', type=int, default=100)
+    parser.add_argument('--members', type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{args.workers} processes x {args.ops} counter increments + member adds + book adds")
+    for backend in BACKENDS:
+        print(contention(backend, args.workers, args.ops))
+
+    print(f"Change detection with {args.members} members (reads check every {DEFAULT_REFRESH_MS}ms by default)")
+    for backend in BACKENDS:
+        print(change_detection(backend, args.members))
+
+    print("Tombstone pruning (sqlite, 50 generations kept)")
+    for lazy in (False, True):
+        print(tombstone_pruning(lazy))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Aurora Archive - Overdue Rental Benchmark
+RentalIndex vs walking every member's rentals, over a synthetic library
+
+Reports the cost of "the k most overdue rentals" from the due-date heap
+against a full scan, the periodic fee job when a day passes, and the
+index upkeep per rental change. Answers are checked against the scan.
+
+Run from the Aurora directory:
+    python benchmarks/bench_overdue.py [--members 50000] [--rentals 3] [--limit 20]
+"""
+
+import argparse
+import logging
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database_manager import DatabaseManager
+from rental_index import RentalIndex, days_overdue, is_active, overdue_start, rental_key
+
+logging.disable(logging.WARNING)
+
+
+def make_members(count: int, rentals: int, now: datetime, seed: int = 5) -> dict:
+    """Rentals due within +-60 days of now; about half already returned"""
+    rng = random.Random(seed)
+    members = {}
+    for i in range(count):
+        member_rentals = []
+        for j in range(rng.randint(0, 2 * rentals)):
+            due = now + timedelta(days=rng.randint(-60, 60))
+            rental = {"rental_id": f"r{i}_{j}", "book_id": f"b{rng.randrange(10000)}",
+                      "due_date": due.date().isoformat(), "status": "active"}
+            if rng.random() < 0.5:
+                rental.update(status="returned", return_date=now.isoformat())
+            member_rentals.append(rental)
+        members[f"m{i:06d}"] = {"member_id": f"m{i:06d}", "rentals": member_rentals}
+    return members
+
+
+def scan_overdue(members: dict, now: datetime, limit=None) -> list:
+    """The previous approach: is_overdue() on every rental, then sort"""
+    overdue = []
+    for member_id, member in members.items():
+        for position, rental in enumerate(member.get("rentals", [])):
+            if is_active(rental) and now > overdue_start(rental["due_date"]):
+                overdue.append((overdue_start(rental["due_date"]).timestamp(), member_id,
+                                rental_key(rental, position)))
+    overdue.sort()
+    return overdue[:limit] if limit else overdue
+
+
+def check_lazy_fees(now: datetime, members: int = 6) -> bool:
+    """process_overdue_rentals with a lazy cache far smaller than the overdue set"""
+    data_dir = tempfile.mkdtemp(prefix="aurora_overdue_")
+    try:
+        db = DatabaseManager(data_dir, lazy=True, cache_size=2)
+        with db.batch():
+            for i in range(members):
+                db.add_member({"member_id": f"m{i}", "email": f"m{i}@example.com", "rentals": [{
+                    "rental_id": f"r{i}", "book_id": f"b{i}", "status": "active",
+                    "due_date": (now - timedelta(days=i + 2)).date().isoformat()}]})
+        db.close()
+        db = DatabaseManager(data_dir, lazy=True, cache_size=2)
+        summary = db.process_overdue_rentals()
+        db.close()
+        db = DatabaseManager(data_dir, lazy=True, cache_size=2)
+        persisted = sum(1 for i in range(members) if db.get_member(f"m{i}")["rentals"][0].get("overdue_fee"))
+        db.close()
+        return summary["fees_updated"] == persisted == members
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--members', type=int, default=50000)
+    parser.add_argument('--rentals', type=int, default=3, help="Mean rentals per member")
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    now = datetime.now()
+    members = make_members(args.members, args.rentals, now)
+    index = RentalIndex()
+    started = time.perf_counter()
+    index.rebuild(members)
+    print(f"{args.members} members | {len(index)} active rentals | "
+          f"index build {time.perf_counter() - started:.2f}s")
+
+    def timed(fn, repeat):
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = fn()
+            samples.append(time.perf_counter() - started)
+        return result, np.percentile(samples, 50) * 1000
+
+    scanned, scan_ms = timed(lambda: scan_overdue(members, now, args.limit), 3)
+    indexed, index_ms = timed(lambda: index.overdue(now, args.limit), 200)
+    _, all_ms = timed(lambda: index.overdue(now), 5)
+    print(f"  top {args.limit} overdue   scan {scan_ms:>9.3f}ms   index {index_ms:>7.3f}ms  "
+          f"{'✓' if [e[2] for e in indexed] == [e[0] for e in scanned] else '✗'}")
+    print(f"  all overdue      scan {timed(lambda: scan_overdue(members, now), 3)[1]:>9.3f}ms   "
+          f"index {all_ms:>7.3f}ms")
+
+    started = time.perf_counter()
+    changes = index.advance(now)
+    print(f"  fee job, first run     {len(changes):>7} rentals  {(time.perf_counter() - started) * 1000:>8.2f}ms")
+    started = time.perf_counter()
+    changes = index.advance(now + timedelta(minutes=5))
+    print(f"  fee job, 5 min later   {len(changes):>7} rentals  {(time.perf_counter() - started) * 1000:>8.2f}ms")
+    started = time.perf_counter()
+    changes = index.advance(now + timedelta(days=1))
+    print(f"  fee job, next day      {len(changes):>7} rentals  {(time.perf_counter() - started) * 1000:>8.2f}ms")
+    later = now + timedelta(days=1)
+    ok = all(days == days_overdue(overdue_start(members[m]["rentals"][int(k.split('_')[1])]["due_date"]), later)
+             for m, k, _, days in changes)
+    print(f"  fees match calculate_overdue_fee: {'✓' if ok else '✗'}")
+
+    # Upkeep: return one active rental per member, as return_rental does
+    member_ids = [m for m, member in members.items() if any(is_active(r) for r in member["rentals"])][:5000]
+    started = time.perf_counter()
+    for member_id in member_ids:
+        rental = next(r for r in members[member_id]["rentals"] if is_active(r))
+        rental.update(status="returned", return_date=now.isoformat())
+        index.update(member_id, members[member_id])
+    print(f"  update (return)  {(time.perf_counter() - started) / len(member_ids) * 1e6:>6.1f}us per rental")
+    ok = [e[2] for e in index.overdue(now, args.limit)] == [e[0] for e in scan_overdue(members, now, args.limit)]
+    print(f"  results match scan after returns: {'✓' if ok else '✗'}")
+    print(f"  lazy cache (2 records), 6 fees persisted: {'✓' if check_lazy_fees(now) else '✗'}")
+
+
+if __name__ == '__main__':
+    main()
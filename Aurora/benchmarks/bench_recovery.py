@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Aurora Archive - Crash Recovery Benchmark
+Write latency and restart time after an unclean shutdown, with and without journals
+
+  1. Per-write latency of UserDatabase.add_user and DatabaseManager.add_book,
+     full atomic JSON rewrite vs journal append.
+  2. Restart time after the process stops without close(): the journal case
+     replays at most checkpoint_every records on top of the last snapshot.
+  3. A writer subprocess is SIGKILLed mid-save repeatedly; the database must
+     parse every time (atomic replace leaves the old or the new file).
+  4. A torn final journal line is ignored on replay.
+
+Run from the Aurora directory:
+    python benchmarks/bench_recovery.py [--users 2000] [--books 2000] [--kills 20]
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+AURORA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(AURORA_DIR))
+
+logging.disable(logging.WARNING)
+
+from card_scanner import UserDatabase, CardFormat
+from database_manager import DatabaseManager
+
+
+KILL_WRITER = """
+import sys
+sys.path.insert(0, {aurora!r})
+from atomic_store import atomic_write_json
+doc = {{"users": [{{"user_id": "u%d" % i, "data": "x" * 200}} for i in range({size})]}}
+print("ready", flush=True)
+n = 0
+while True:
+    n += 1
+    doc["generation"] = n
+    atomic_write_json({path!r}, doc, indent=2)
+"""
+
+
+def ms(samples: list, pct: float) -> float:
+    return float(np.percentile(samples, pct)) * 1000
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def bench_users(directory: Path, count: int, journal: bool) -> tuple:
+    """Fill a UserDatabase; returns (write latencies, restart seconds, users after restart)"""
+    db_path = directory / f"users_{'journal' if journal else 'full'}.json"
+    db = UserDatabase(str(db_path), journal=journal)
+    latencies = [
+        timed(lambda i=i, db=db: db.add_user({"member_id": f"m_{i:05d}", "name": f"User {i}"},
+                                             CardFormat.AURORA_MEMBER))
+        for i in range(count)
+    ]
+    del db  # Unclean shutdown: no final snapshot
+
+    restarted = []
+    restart = timed(lambda: restarted.append(UserDatabase(str(db_path), journal=journal)))
+    return latencies, restart, len(restarted[0].get_all_users())
+
+
+def bench_books(directory: Path, count: int, journal: bool) -> tuple:
+    """Fill DatabaseManager books; returns (write latencies, restart seconds, books after restart)"""
+    data_dir = directory / f"books_{'journal' if journal else 'full'}"
+    db = DatabaseManager(str(data_dir), journal=journal)
+    latencies = [
+        timed(lambda i=i: db.add_book({"book_id": f"b_{i:05d}", "title": f"Book {i}", "copies": 1}))
+        for i in range(count)
+    ]
+    db._closing = True  # Unclean shutdown: skip the final checkpoint
+
+    restarted = []
+    restart = timed(lambda: restarted.append(DatabaseManager(str(data_dir), journal=journal)))
+    books = len(restarted[0].books)
+    restarted[0].close()
+    return latencies, restart, books
+
+
+def kill_test(directory: Path, kills: int) -> int:
+    """SIGKILL a writer mid-save `kills` times; returns how many left a parseable file"""
+    path = directory / "kill_target.json"
+    script = KILL_WRITER.format(aurora=str(AURORA_DIR), size=5000, path=str(path))
+    rng = np.random.default_rng(7)
+    intact = 0
+    for _ in range(kills):
+        proc = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE)
+        proc.stdout.readline()
+        time.sleep(float(rng.uniform(0.05, 0.3)))
+        proc.send_signal(signal.SIGKILL)
+        proc.wait()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                intact += len(json.load(f)["users"]) == 5000
+        except (OSError, ValueError, KeyError):
+            pass
+    return intact
+
+
+def torn_journal_test(directory: Path) -> bool:
+    """Append half a record to a journal and check the rest still replays"""
+    db_path = directory / "torn.json"
+    db = UserDatabase(str(db_path), journal=True)
+    for i in range(10):
+        db.add_user({"member_id": f"t_{i}"}, CardFormat.AURORA_MEMBER)
+    with open(db.journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "put", "user": {"user_id": "t_')
+    return len(UserDatabase(str(db_path), journal=True).get_all_users()) == 10
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--books', type=int, default=2000)
+    parser.add_argument('--kills', type=int, default=20)
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp(prefix="aurora_recovery_"))
+    try:
+        print(f"  {'database':<14}{'mode':<9}{'write p50':>11}{'write p99':>11}{'restart':>11}  recovered")
+        for name, bench, count in (("UserDatabase", bench_users, args.users),
+                                   ("books", bench_books, args.books)):
+            for journal in (False, True):
+                latencies, restart, recovered = bench(directory, count, journal)
+                print(f"  {name:<14}{'journal' if journal else 'full':<9}"
+                      f"{ms(latencies, 50):>9.2f}ms{ms(latencies, 99):>9.2f}ms"
+                      f"{restart * 1000:>9.1f}ms  {recovered}/{count} "
+                      f"{'✓' if recovered == count else '✗'}")
+
+        if os.name == 'posix':
+            intact = kill_test(directory, args.kills)
+            print(f"  SIGKILL mid-save: {intact}/{args.kills} restarts found an intact file "
+                  f"{'✓' if intact == args.kills else '✗'}")
+        print(f"  torn journal tail ignored: {'✓' if torn_journal_test(directory) else '✗'}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Aurora Archive - Shared Context Benchmark
+UserMemoryBridge.load_shared_context: k-way merge vs load-all-then-sort
+
+Builds a pool of member threads (half of each sealed into segments) and
+times loading the newest N events across the pool both ways; results
+must be identical.
+
+Run from the Aurora directory:
+    python benchmarks/bench_shared_context.py [--threads 200] [--events 2000]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from thread_segments import ThreadCompactor, ThreadSegments
+from user_memory_bridge import UserMemoryBridge
+
+logging.disable(logging.WARNING)
+
+
+def load_all_then_sort(bridge: UserMemoryBridge, thread_ids: list, last_n: int) -> list:
+    """The previous load_shared_context (reading segments through tail())"""
+    all_events = []
+    for thread_id in thread_ids:
+        for event in ThreadSegments(bridge.threads_dir / f"{thread_id}.jsonl").tail(None):
+            event['_from_thread'] = thread_id
+            all_events.append(event)
+    all_events.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+    return all_events[:last_n]
+
+
+def timed(fn, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--threads', type=int, default=200)
+    parser.add_argument('--events', type=int, default=2000, help="Events per thread")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="aurora_shared_"))  # UserMemoryBridge writes under ./memory
+    rng = random.Random(22)
+    bridge = UserMemoryBridge(thread_id="bench-reader", access_tier=6)
+    thread_ids = [f"pool-{i:04d}" for i in range(args.threads)]
+    for t, thread_id in enumerate(thread_ids):
+        with open(bridge.threads_dir / f"{thread_id}.jsonl", 'w', encoding='utf-8') as f:
+            for i in range(args.events):
+                f.write(json.dumps({
+                    "event_id": f"{t}-{i}", "timestamp": f"2025-01-01T{i:08d}.{t:04d}Z", "source": "oracle",
+                    "role": rng.choice(["user", "assistant"]), "content": "lorem ipsum " * rng.randint(5, 60),
+                    "emotion_state": {}, "metadata": {"tier_at_time": 6},
+                }) + '\n')
+    size = sum(path.stat().st_size for path in bridge.threads_dir.glob("pool-*.jsonl"))
+    segment_bytes = max(4096, size // args.threads // 4)
+    ThreadCompactor(bridge.threads_dir, segment_bytes=segment_bytes, compress_after_s=0).run_once()
+    for thread_id in thread_ids:
+        with open(bridge.threads_dir / f"{thread_id}.jsonl", 'ab'):
+            pass
+    print(f"{args.threads} threads x {args.events} events ({size / 1e6:.1f} MB)")
+
+    for last_n in (10, 50, 500):
+        old_ms, expected = timed(lambda: load_all_then_sort(bridge, thread_ids, last_n), 1)
+        new_ms, result = timed(lambda: bridge.load_shared_context(thread_ids, last_n=last_n), args.repeat)
+        print(f"  last {last_n:<4} load+sort {old_ms:>9.1f}ms  merge {new_ms:>7.2f}ms  "
+              f"{'✓' if result == expected else '✗'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Aurora Archive - Shared Context Views Benchmark
+Pooled shared context: materialized pool view vs merging every pool thread
+
+Creates pooled Tier 5 members in a scratch database (the sharing listener
+builds the pool view), fills their threads, stores more events through
+UserMemoryBridge (updating the view incrementally) and times a pool
+member's shared context load from the view and by merging. Results must be
+identical; a trusted pair is checked the same way, and so is the pool view
+after update_member() moves a member to another tier and delete_member()
+removes one, and after set_memory_sharing_mode() takes one out of the pool.
+
+Run from the Aurora directory:
+    python benchmarks/bench_shared_views.py [--members 200] [--events 500]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database_manager import DatabaseManager
+from thread_segments import merge_newest
+from user_memory_bridge import UserMemoryBridge, get_append_writer, get_event_cache, get_shared_views
+
+logging.disable(logging.WARNING)
+
+
+def merged(threads_dir: Path, thread_ids: list, last_n: int) -> list:
+    """load_shared_context without a view"""
+    events = []
+    for thread_id, line in merge_newest(threads_dir, thread_ids):
+        event = json.loads(line)
+        event['_from_thread'] = thread_id
+        events.append(event)
+        if len(events) >= last_n:
+            break
+    return events
+
+
+def timed(fn, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--members', type=int, default=200)
+    parser.add_argument('--events', type=int, default=500, help="Events per thread before the pool forms")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="aurora_views_"))  # Memory under ./memory, database under ./data
+    rng = random.Random(23)
+    db = DatabaseManager(data_dir="data")
+    db.add_sharing_listener(lambda member_ids: get_shared_views().refresh_members(db, member_ids))
+    threads_dir = Path("memory") / "threads"
+    threads_dir.mkdir(parents=True, exist_ok=True)
+
+    members = []
+    with db.batch():
+        for i in range(args.members):
+            member = {"member_id": f"M{i:05d}", "thread_id": f"thread-{i:05d}", "access_tier": 5,
+                      "tier_name": "Sentinel", "memory_sharing_mode": "isolated", "pooled_tier": None,
+                      "trusted_users": []}
+            db.add_member(member)
+            members.append(member)
+    for i, member in enumerate(members):
+        with open(threads_dir / f"{member['thread_id']}.jsonl", 'w', encoding='utf-8') as f:
+            for j in range(args.events):
+                f.write(json.dumps({
+                    "event_id": f"{i}-{j}", "timestamp": f"2025-01-01T{j:08d}.{i:05d}Z", "source": "oracle",
+                    "role": "user", "content": "lorem ipsum " * rng.randint(5, 40),
+                    "emotion_state": {}, "metadata": {"tier_at_time": 5},
+                }) + '\n')
+
+    started = time.perf_counter()
+    for member in members[:-2]:
+        db.set_memory_sharing_mode(member['member_id'], 'pooled')  # Pools at its own tier
+    print(f"{args.members - 2} members pooled (view rebuilt on each join) in {time.perf_counter() - started:.1f}s")
+
+    bridges = [UserMemoryBridge(member['thread_id'], access_tier=5, module_name="Oracle") for member in members]
+    started = time.perf_counter()
+    for n in range(2000):
+        rng.choice(bridges[:-2]).store_user_event("user", f"pool message {n}")
+    get_append_writer().flush()
+    print(f"2000 events stored (views updated) in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    reader = members[0]
+    thread_ids = db.get_accessible_thread_ids(reader['member_id'])
+    bridge = bridges[0]
+    print(f"pool member reads {len(thread_ids)} threads")
+    for last_n in (50, 500):
+        merge_ms, expected = timed(lambda: merged(threads_dir, thread_ids, last_n), 3)
+        get_event_cache().clear()
+        cold_ms, cold = timed(lambda: bridge.load_shared_context(thread_ids, last_n), 1)
+        view_ms, result = timed(lambda: bridge.load_shared_context(thread_ids, last_n), args.repeat)
+        same = [e['event_id'] for e in result] == [e['event_id'] for e in expected] and cold == result
+        print(f"  last {last_n:<4} merge {merge_ms:>8.2f}ms  view cold {cold_ms:>6.2f}ms  "
+              f"hot {view_ms:>6.3f}ms  {'✓' if same else '✗'}")
+
+    a, b = members[-2], members[-1]
+    db.set_memory_sharing_mode(a['member_id'], 'trusted')
+    db.add_trusted_user(a['member_id'], b['member_id'])
+    bridges[-1].store_user_event("assistant", "for my trusted friend")
+    trusted_ids = db.get_accessible_thread_ids(a['member_id'])
+    view = bridges[-2].load_shared_context(trusted_ids, 20)
+    print(f"{'✓' if view == merged(threads_dir, trusted_ids, 20) and view[0]['content'] == 'for my trusted friend' else '✗'} "
+          f"trusted circle view ({len(trusted_ids)} threads)")
+
+    views = get_shared_views()
+    moved, gone = members[1], members[2]
+    db.update_member(moved['member_id'], {'access_tier': 6})
+    db.delete_member(gone['member_id'])
+    bridge.store_user_event("user", "after the pool changed")
+    pool_ids = db.get_accessible_thread_ids(reader['member_id'])
+    hits = views.hits
+    view = bridge.load_shared_context(pool_ids, 50)
+    same = view == merged(threads_dir, pool_ids, 50) and view[0]['content'] == "after the pool changed"
+    left = moved['thread_id'] not in pool_ids and gone['thread_id'] not in pool_ids
+    print(f"{'✓' if same and left and views.hits == hits + 1 else '✗'} "
+          f"pool view after a tier change and a deletion ({len(pool_ids)} threads)")
+
+    isolated = members[3]
+    db.set_memory_sharing_mode(isolated['member_id'], 'isolated')
+    pool_ids = db.get_accessible_thread_ids(reader['member_id'])
+    hits = views.hits
+    view = bridge.load_shared_context(pool_ids, 50)
+    print(f"{'✓' if view == merged(threads_dir, pool_ids, 50) and isolated['thread_id'] not in pool_ids and views.hits == hits + 1 else '✗'} "
+          f"pool view after a member leaves the pool ({len(pool_ids)} threads)")
+
+    print(f"{'✓' if views.hits >= 4 else '✗'} view reads: {views.hits} hits, {views.misses} misses")
+    db.close()
+
+
+if __name__ == '__main__':
+    main()
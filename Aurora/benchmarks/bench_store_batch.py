@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Aurora Archive - Batched Event Storage Benchmark
+UserMemoryBridge.store_user_event per event vs store_user_events batches
+
+Stores the same conversation one event at a time (what /api/memory/store
+does per request) and in batches (/api/memory/store_batch), into a thread
+that belongs to a pool view so shared views are written too, then checks
+both threads and the cached recent events agree.
+
+Run from the Aurora directory:
+    python benchmarks/bench_store_batch.py [--events 5000] [--batch 20]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from shared_views import pool_view_key
+from user_memory_bridge import UserMemoryBridge, get_append_writer, get_shared_views
+
+logging.disable(logging.WARNING)
+
+
+def conversation(n: int) -> list:
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i} " + "lorem ipsum " * (i % 30 + 1),
+         "source": "oracle", "emotion_state": {"primary": "joy", "intensity": 0.5}, "metadata": {"n": i}}
+        for i in range(n)
+    ]
+
+
+def stored(bridge: UserMemoryBridge) -> list:
+    with open(bridge.user_memory_file, 'r', encoding='utf-8') as f:
+        return [(e['role'], e['content'], e['metadata']['n']) for e in map(json.loads, f)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--events', type=int, default=5000)
+    parser.add_argument('--batch', type=int, default=20)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="aurora_batch_"))  # UserMemoryBridge writes under ./memory
+    events = conversation(args.events)
+    single = UserMemoryBridge("thread-single", access_tier=5, module_name="Oracle")
+    batched = UserMemoryBridge("thread-batch", access_tier=5, module_name="Oracle")
+    get_shared_views().set_view(pool_view_key(5), ["thread-single", "thread-batch"])
+
+    started = time.perf_counter()
+    for event in events:
+        single.store_user_event(event['role'], event['content'], event['source'],
+                                event['emotion_state'], event['metadata'])
+    get_append_writer().flush()
+    single_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(0, len(events), args.batch):
+        batched.store_user_events(events[i:i + args.batch])
+    get_append_writer().flush()
+    batch_s = time.perf_counter() - started
+
+    print(f"{args.events} events")
+    print(f"  one at a time     {single_s * 1000:>8.0f}ms  ({args.events / single_s:>7.0f} events/s)")
+    print(f"  batches of {args.batch:<5}  {batch_s * 1000:>8.0f}ms  ({args.events / batch_s:>7.0f} events/s)")
+
+    print(f"{'✓' if stored(single) == stored(batched) else '✗'} same events in the same order")
+    recent = batched.load_user_context(last_n=50)
+    print(f"{'✓' if [e['metadata']['n'] for e in recent] == list(range(args.events - 1, args.events - 51, -1)) else '✗'} "
+          f"cached recent events match")
+    shared = get_shared_views().recent(["thread-single", "thread-batch"], 2 * args.batch)
+    print(f"{'✓' if all(e['_from_thread'] == 'thread-batch' for e in shared) else '✗'} pool view has the last batches")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Aurora Archive - Transaction Log Benchmark
+TransactionLog.query vs scanning one ever-growing transactions.jsonl
+
+Writes a synthetic history (members joining, renting, going overdue) with
+timestamps spread over a year, sealed into segments by size, then times
+member, type and time-window queries against a full scan of the same
+records. Results are checked against the scan. Finally a crash between
+compressing a sealed segment and removing the original is simulated: the
+reopened log must not return that segment's records twice.
+
+Run from the Aurora directory:
+    python benchmarks/bench_transactions.py [--records 300000] [--members 5000] [--segment-mb 4] [--compress]
+"""
+
+import argparse
+import gzip
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transaction_log import TransactionLog
+
+
+TYPES = ["member_added", "rental_added", "rental_returned", "rental_overdue", "member_updated"]
+
+
+def full_scan(path: Path, predicate) -> list:
+    """The only way to answer a query before segments"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [record for record in map(json.loads, f) if predicate(record)]
+
+
+def crash_mid_compress(directory: Path) -> bool:
+    """Leave a sealed segment next to its .gz twin, unindexed; reopen and query"""
+    log = TransactionLog(directory / "transactions.jsonl", max_bytes=4096, max_age_s=0, compress=True)
+    records = [{"type": "member_added", "member_id": f"m{i}", "timestamp": f"2025-01-01T00:00:{i % 60:02d}"}
+               for i in range(200)]
+    for record in records:
+        log.append(record)
+    compressed = sorted(log.segments_dir.glob("*.jsonl.gz"))[-1]
+    with gzip.open(compressed, 'rb') as source:
+        compressed.with_name(compressed.name[:-len('.gz')]).write_bytes(source.read())
+    log.index_path.unlink()  # The crash came before the index was saved
+    reopened = TransactionLog(directory / "transactions.jsonl", max_bytes=4096, max_age_s=0, compress=True)
+    return reopened.query() == records and not compressed.with_name(compressed.name[:-len('.gz')]).exists()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--records', type=int, default=300000)
+    parser.add_argument('--members', type=int, default=5000)
+    parser.add_argument('--segment-mb', type=float, default=4)
+    parser.add_argument('--compress', action='store_true')
+    args = parser.parse_args()
+
+    rng = random.Random(2)
+    directory = Path(tempfile.mkdtemp(prefix="aurora_tx_"))
+    try:
+        log = TransactionLog(directory / "transactions.jsonl", max_bytes=int(args.segment_mb * 1024 * 1024),
+                             max_age_s=0, compress=args.compress)
+        flat = directory / "flat.jsonl"
+        start = datetime(2025, 1, 1)
+        step = timedelta(days=365) / args.records
+        counts = {}
+        started = time.perf_counter()
+        with open(flat, 'w', encoding='utf-8') as f:
+            for i in range(args.records):
+                record = {
+                    "type": rng.choices(TYPES, weights=[2, 40, 38, 5, 15])[0],
+                    "member_id": f"m{int(rng.paretovariate(1.2)) % args.members:05d}",
+                    "timestamp": (start + step * i).isoformat(),
+                    "book_id": f"b{rng.randrange(20000)}",
+                }
+                log.append(record)
+                counts[record['member_id']] = counts.get(record['member_id'], 0) + 1
+                f.write(json.dumps(record) + '\n')
+        append_us = (time.perf_counter() - started) / args.records * 1e6
+        size_mb = sum(p.stat().st_size for p in directory.rglob('*') if p.is_file() and p != flat) / 1e6
+        print(f"{args.records} records in {len(log._segments) + 1} segments, {size_mb:.1f} MB on disk "
+              f"({flat.stat().st_size / 1e6:.1f} MB flat) | append {append_us:.1f}us")
+
+        member = min(counts, key=counts.get)  # A rare member
+        last_week = (start + timedelta(days=358)).isoformat()
+        march, april = datetime(2025, 3, 1).isoformat(), datetime(2025, 4, 1).isoformat()
+        queries = [
+            ("one member (rare)", dict(member_id=member),
+             lambda r: r['member_id'] == member),
+            ("one member, last week", dict(member_id="m00001", since=last_week),
+             lambda r: r['member_id'] == "m00001" and r['timestamp'] >= last_week),
+            ("type=rental_overdue, March", dict(type="rental_overdue", since=march, until=april),
+             lambda r: r['type'] == "rental_overdue" and march <= r['timestamp'] < april),
+            ("everything since last week", dict(since=last_week),
+             lambda r: r['timestamp'] >= last_week),
+        ]
+        for label, kwargs, predicate in queries:
+            started = time.perf_counter()
+            expected = full_scan(flat, predicate)
+            scan_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            result = log.query(**kwargs)
+            query_ms = (time.perf_counter() - started) * 1000
+            print(f"  {label:<28}{len(result):>7} hits  scan {scan_ms:>8.1f}ms  query {query_ms:>7.1f}ms  "
+                  f"({log.segments_read} sealed segment(s) read)  {'✓' if result == expected else '✗'}")
+
+        crash_dir = directory / "crash"
+        crash_dir.mkdir()
+        print(f"{'✓' if crash_mid_compress(crash_dir) else '✗'} crash mid-compression leaves no duplicate segment")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
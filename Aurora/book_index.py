@@ -0,0 +1,261 @@
+"""
+Aurora Archive - Book Search Index
+Inverted index over DatabaseManager.books for ranked, prefix-aware search
+
+    title token   -> book_ids
+    author token  -> book_ids
+    ISBN (digits) -> book_id, sorted for prefix lookup
+    title, author -> book_id, sorted for "starts with" lookup
+
+Every query word matches index tokens by prefix, so results update as the
+user types ("harry pot" finds "Harry Potter"). A book must match every
+word in its title or author.
+
+Results come in three tiers:
+    1. ISBN starts with the query (3+ digits), in ISBN order
+    2. Title starts with the query, in title order; then author starts
+       with the query, in author order
+    3. Other title/author matches, by score, then title:
+           title word == query word   3
+           title word startswith      2
+           author word == query word  2
+           author word startswith     1
+       (best field per query word, summed over the words)
+
+Tiers 1 and 2 are ranges of sorted lists, so a short, broad query with a
+limit (search-as-you-type) stops after `limit` hits instead of scoring
+every match. In tier 3 the most selective word is looked up first and
+each further word's postings are intersected with the books still in
+the running, so a broad word (e.g. a single letter) only costs set
+probes against those candidates.
+
+Python 3.10+
+Dependencies: none
+"""
+
+import bisect
+import heapq
+import re
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+
+TOKEN_RE = re.compile(r"\w+")
+ISBN_MIN_QUERY = 3  # Digits needed before a query is tried as an ISBN prefix
+ESTIMATE_CAP = 2048  # Words matching more postings than this count as equally broad
+
+TITLE_EXACT, TITLE_PREFIX = 3, 2
+AUTHOR_EXACT, AUTHOR_PREFIX = 2, 1
+
+
+def tokenize(text: Optional[str]) -> Tuple[str, ...]:
+    """Lowercased word tokens"""
+    return tuple(TOKEN_RE.findall((text or '').lower()))
+
+
+def normalize_isbn(isbn: Optional[str]) -> str:
+    """ISBN without hyphens or spaces, uppercase check digit ('' for None)"""
+    return re.sub(r"[^0-9Xx]", "", isbn or '').upper()
+
+
+class BookIndex:
+    """Token and ISBN indexes kept consistent through add, update and delete"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: Dict[str, Tuple] = {}  # book_id -> (title tokens, author tokens, isbn, title, author)
+        self.by_title: Dict[str, Set[str]] = {}
+        self.by_author: Dict[str, Set[str]] = {}
+        self._vocab: List[str] = []  # Sorted tokens of both fields, for prefix ranges
+        self._isbns: List[Tuple[str, str]] = []  # Sorted (isbn, book_id)
+        self._titles: List[Tuple[str, str]] = []  # Sorted (title, book_id)
+        self._authors: List[Tuple[str, str]] = []  # Sorted (author, book_id)
+
+    @staticmethod
+    def _book_keys(book: Dict) -> Tuple:
+        title_tokens = tokenize(book.get('title'))
+        author_tokens = tokenize(book.get('author'))
+        return (
+            title_tokens,
+            author_tokens,
+            normalize_isbn(book.get('isbn')),
+            ' '.join(title_tokens),  # Normalized title and author, compared against the query phrase
+            ' '.join(author_tokens),
+        )
+
+    def rebuild(self, books: Dict[str, Dict]):
+        """Index every book from scratch"""
+        with self._lock:
+            self._keys.clear()
+            self.by_title.clear()
+            self.by_author.clear()
+            for book_id, book in books.items():
+                keys = self._book_keys(book)
+                self._keys[book_id] = keys
+                for token in keys[0]:
+                    self.by_title.setdefault(token, set()).add(book_id)
+                for token in keys[1]:
+                    self.by_author.setdefault(token, set()).add(book_id)
+            self._vocab = sorted(self.by_title.keys() | self.by_author.keys())
+            self._isbns = sorted((keys[2], book_id) for book_id, keys in self._keys.items() if keys[2])
+            self._titles = sorted((keys[3], book_id) for book_id, keys in self._keys.items())
+            self._authors = sorted((keys[4], book_id) for book_id, keys in self._keys.items() if keys[4])
+
+    def update(self, book_id: str, book: Dict):
+        """(Re-)index one book after it was added or changed"""
+        keys = self._book_keys(book)
+        with self._lock:
+            old_keys = self._keys.get(book_id)
+            if old_keys == keys:
+                return
+            if old_keys is not None:
+                self._remove(book_id, old_keys)
+            self._add(book_id, keys)
+
+    def remove(self, book_id: str):
+        """Drop a deleted book"""
+        with self._lock:
+            old_keys = self._keys.get(book_id)
+            if old_keys is not None:
+                self._remove(book_id, old_keys)
+
+    def _add(self, book_id: str, keys: Tuple):
+        title_tokens, author_tokens, isbn, title, author = keys
+        self._keys[book_id] = keys
+        for index, tokens in ((self.by_title, title_tokens), (self.by_author, author_tokens)):
+            for token in tokens:
+                if token not in self.by_title and token not in self.by_author:
+                    bisect.insort(self._vocab, token)
+                index.setdefault(token, set()).add(book_id)
+        if isbn:
+            bisect.insort(self._isbns, (isbn, book_id))
+        bisect.insort(self._titles, (title, book_id))
+        if author:
+            bisect.insort(self._authors, (author, book_id))
+
+    def _remove(self, book_id: str, keys: Tuple):
+        title_tokens, author_tokens, isbn, title, author = keys
+        del self._keys[book_id]
+        for index, tokens in ((self.by_title, title_tokens), (self.by_author, author_tokens)):
+            for token in tokens:
+                ids = index.get(token)
+                if ids is None:
+                    continue
+                ids.discard(book_id)
+                if not ids:
+                    del index[token]
+                    if token not in self.by_title and token not in self.by_author:
+                        position = bisect.bisect_left(self._vocab, token)
+                        if position < len(self._vocab) and self._vocab[position] == token:
+                            del self._vocab[position]
+        if isbn:
+            self._discard_sorted(self._isbns, (isbn, book_id))
+        self._discard_sorted(self._titles, (title, book_id))
+        if author:
+            self._discard_sorted(self._authors, (author, book_id))
+
+    @staticmethod
+    def _discard_sorted(entries: List, entry):
+        position = bisect.bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
+
+    def _expand(self, prefix: str) -> List[str]:
+        """Indexed tokens starting with `prefix`"""
+        start = bisect.bisect_left(self._vocab, prefix)
+        end = bisect.bisect_left(self._vocab, prefix + '\U0010ffff')
+        return self._vocab[start:end]
+
+    def _word_sets(self, word: str, within: Optional[Set[str]] = None) -> Tuple[Tuple[Set[str], int], ...]:
+        """(book_ids, score) per way a book can match one query word, best first"""
+        tokens = [token for token in self._expand(word) if token != word]
+
+        def books(index: Dict[str, Set[str]], keys: List[str]) -> Set[str]:
+            postings = [index[key] for key in keys if key in index]
+            if within is None:
+                return set().union(*postings)
+            return set().union(*(within & ids for ids in postings))
+
+        return (
+            (books(self.by_title, [word]), TITLE_EXACT),
+            (books(self.by_title, tokens), TITLE_PREFIX),
+            (books(self.by_author, [word]), AUTHOR_EXACT),
+            (books(self.by_author, tokens), AUTHOR_PREFIX),
+        )
+
+    def _estimate(self, word: str, cap: int = ESTIMATE_CAP) -> int:
+        """Postings a query word expands to (upper bound on its matches), counted up to `cap`"""
+        total = 0
+        for token in self._expand(word):
+            total += len(self.by_title.get(token, ())) + len(self.by_author.get(token, ()))
+            if total >= cap:
+                break
+        return total
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Ranked book_ids matching a query
+
+        Args:
+            query: Words to match by prefix in title/author, or an ISBN prefix
+            limit: Return at most this many (default: all matches)
+
+        Returns:
+            book_ids, best match first
+        """
+        words = tokenize(query)
+        phrase = ' '.join(words)
+        isbn = normalize_isbn(query)
+        results: List[str] = []
+        seen: Set[str] = set()
+
+        def full() -> bool:
+            return limit is not None and len(results) >= limit
+
+        def take(book_id: str):
+            if book_id not in seen:
+                seen.add(book_id)
+                results.append(book_id)
+
+        with self._lock:
+            # 1. ISBN prefix
+            if len(isbn) >= ISBN_MIN_QUERY and isbn[:-1].isdigit():
+                for position in range(bisect.bisect_left(self._isbns, (isbn,)), len(self._isbns)):
+                    candidate, book_id = self._isbns[position]
+                    if full() or not candidate.startswith(isbn):
+                        break
+                    take(book_id)
+
+            # 2. Title, then author, starts with the query
+            for entries in ((self._titles, self._authors) if phrase else ()):
+                for position in range(bisect.bisect_left(entries, (phrase,)), len(entries)):
+                    text, book_id = entries[position]
+                    if full() or not text.startswith(phrase):
+                        break
+                    take(book_id)
+
+            if not words or full():
+                return results
+
+            # 3. Every word matches a title or author word: intersect the
+            # words' postings, most selective first
+            matchers = []
+            candidates = None
+            for word in sorted(set(words), key=self._estimate):
+                word_sets = self._word_sets(word, candidates)
+                candidates = set().union(*(book_ids for book_ids, _ in word_sets))
+                matchers.append(word_sets)
+                if not candidates:
+                    break
+
+            ranked = {}
+            for book_id in candidates - seen:
+                score = sum(
+                    next(value for book_ids, value in word_sets if book_id in book_ids)
+                    for word_sets in matchers
+                )
+                ranked[book_id] = (-score, self._keys[book_id][3], book_id)
+
+        if limit is not None:
+            return results + heapq.nsmallest(limit - len(results), ranked, key=ranked.get)
+        return results + sorted(ranked, key=ranked.get)
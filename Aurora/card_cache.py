@@ -0,0 +1,189 @@
+"""
+Aurora Archive - Card Data Cache
+LRU cache of decoded card payloads, keyed by file identity
+
+A card is identified by its resolved path plus (mtime_ns, size). Any write to
+the file changes that stamp, so a stale entry is detected on the next lookup
+and dropped; writes made through MutableCardSteganography also invalidate the
+entry explicitly.
+
+Python 3.10+
+Dependencies: none
+"""
+
+import copy
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+
+class CardDataCache:
+    """
+    Thread-safe LRU of extracted card payload dicts
+
+    Entries are grouped by kind ("card" for the top-left region, "seal" for
+    the RedSeal region) so one image can hold several cached payloads.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            max_entries: Maximum number of cached payloads (0 disables caching)
+            max_bytes: Approximate upper bound on cached JSON size
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, int], Dict, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _path_key(image_path) -> str:
+        return str(Path(image_path).resolve())
+
+    @staticmethod
+    def file_stamp(image_path) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of a file, or None if it cannot be stat'ed"""
+        try:
+            st = os.stat(image_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, image_path, kind: str = "card", stamp: Optional[Tuple[int, int]] = None) -> Optional[Dict]:
+        """
+        Look up a cached payload
+
+        Args:
+            image_path: Card image path
+            kind: Payload kind ("card" or "seal")
+            stamp: Pre-computed file_stamp() (default: stat the file now)
+
+        Returns:
+            A copy of the cached dict, or None on a miss or stale entry
+        """
+        if stamp is None:
+            stamp = self.file_stamp(image_path)
+        key = (kind, self._path_key(image_path))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or stamp is None or entry[0] != stamp:
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def put(self, image_path, data: Dict, kind: str = "card", stamp: Optional[Tuple[int, int]] = None):
+        """
+        Cache a freshly extracted payload
+
+        Pass the stamp taken before the file was read so a write that races
+        the extraction cannot be cached under the newer stamp.
+        """
+        if self.max_entries <= 0:
+            return
+
+        if stamp is None:
+            stamp = self.file_stamp(image_path)
+        if stamp is None:
+            return
+
+        size = len(json.dumps(data, separators=(',', ':'), default=str))
+        if size > self.max_bytes:
+            return
+
+        key = (kind, self._path_key(image_path))
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (stamp, copy.deepcopy(data), size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate(self, image_path):
+        """Drop every cached payload for an image (call after writing it)"""
+        path_key = self._path_key(image_path)
+        with self._lock:
+            for key in [k for k in self._entries if k[1] == path_key]:
+                self._drop(key)
+                self.invalidations += 1
+
+    def restamp(self, image_path, old_stamp: Tuple[int, int], new_stamp: Optional[Tuple[int, int]]):
+        """
+        Move entries to a new stamp after a rewrite that kept the payload
+        (e.g. a background PNG recompression)
+        """
+        path_key = self._path_key(image_path)
+        with self._lock:
+            for key in [k for k in self._entries if k[1] == path_key]:
+                stamp, data, size = self._entries[key]
+                if stamp != old_stamp or new_stamp is None:
+                    self._drop(key)
+                    self.invalidations += 1
+                else:
+                    self._entries[key] = (new_stamp, data, size)
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _drop(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes
+            }
+
+
+# Singleton instance
+_cache_instance = None
+
+def get_card_cache() -> CardDataCache:
+    """
+    Get the process-wide card cache
+
+    Limits can be set with AURORA_CARD_CACHE_ENTRIES and AURORA_CARD_CACHE_BYTES.
+    """
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = CardDataCache(
+            max_entries=int(os.getenv('AURORA_CARD_CACHE_ENTRIES', DEFAULT_MAX_ENTRIES)),
+            max_bytes=int(os.getenv('AURORA_CARD_CACHE_BYTES', DEFAULT_MAX_BYTES))
+        )
+    return _cache_instance
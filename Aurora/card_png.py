@@ -0,0 +1,429 @@
+"""
+Aurora Archive - Card PNG Writer
+Region-aware PNG encoding so a card update only re-compresses the embed region
+
+Card updates only change the top-left 100x100 embed region, yet a plain
+Pillow save filters and deflates all 512x768 pixels again. Cards written by
+this module split their zlib stream in two:
+
+    IDAT = zlib header
+         + deflate(rows [0, region_rows))    ending on a full flush
+         + deflate(rows [region_rows, H))    independent of the head
+         + Adler-32 of all filtered rows
+
+A full flush resets the compressor, so the tail can be copied byte-for-byte
+from the previous file while only the head is compressed again. A private
+ancillary chunk ('auRG') records where the head ends and the tail's Adler-32,
+so the checksum can be combined without touching the tail rows. Every row
+uses the Up filter except the first row of each part, which uses Sub so no
+tail row depends on the rewritten head. The result is a standard PNG that
+any decoder reads; the chunk is simply skipped elsewhere.
+
+Save modes:
+    pillow  Legacy full Pillow encode (optimize=False)
+    region  Region-aware, zlib level 6 with Z_FILTERED (default)
+    fast    Region-aware, zlib level 1
+    hot     Region-aware, stored (no compression); recompressed to 'region'
+            by a background thread
+
+Python 3.10+
+Dependencies: NumPy, Pillow
+"""
+
+import os
+import queue
+import struct
+import threading
+import zlib
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+REGION_CHUNK = b'auRG'  # Ancillary, private, unsafe to copy
+REGION_CHUNK_VERSION = 1
+REGION_CHUNK_FORMAT = '>BHII'  # version, region_rows, head deflate length, tail Adler-32
+
+FILTER_SUB = 1
+FILTER_UP = 2
+
+ADLER_MOD = 65521
+BYTES_PER_PIXEL = 3
+
+SAVE_MODES = {
+    "pillow": None,
+    "region": {"level": 6, "strategy": zlib.Z_FILTERED},
+    "fast": {"level": 1, "strategy": zlib.Z_DEFAULT_STRATEGY},
+    "hot": {"level": 0, "strategy": zlib.Z_DEFAULT_STRATEGY},
+}
+DEFAULT_SAVE_MODE = "region"
+RECOMPRESS_MODE = "region"  # What hot-tier cards become in the background
+
+# Striped locks serialize a card's in-place write with a background
+# recompress of the same file (threads within one process)
+_WRITE_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def _write_lock(path: str) -> threading.Lock:
+    return _WRITE_LOCKS[hash(os.path.abspath(path)) % len(_WRITE_LOCKS)]
+
+
+def file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it cannot be stat'ed"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def adler32_combine(adler1: int, adler2: int, length2: int) -> int:
+    """Adler-32 of A + B given adler32(A), adler32(B) and len(B)"""
+    a1, b1 = adler1 & 0xFFFF, adler1 >> 16
+    a2, b2 = adler2 & 0xFFFF, adler2 >> 16
+    a = (a1 + a2 - 1) % ADLER_MOD
+    b = (b1 + b2 + length2 * (a1 - 1)) % ADLER_MOD
+    return (b << 16) | a
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack('>I', len(data)) + kind + data +
+        struct.pack('>I', zlib.crc32(data, zlib.crc32(kind)))
+    )
+
+
+def _filter_rows(rows: np.ndarray) -> bytes:
+    """
+    PNG-filter RGB rows: Sub on the first row, Up on the rest
+
+    Args:
+        rows: (height, width, 3) uint8 array
+
+    Returns:
+        Filtered scanlines, each prefixed with its filter type byte
+    """
+    height = rows.shape[0]
+    flat = rows.reshape(height, -1)
+
+    out = np.empty((height, flat.shape[1] + 1), dtype=np.uint8)
+    out[0, 0] = FILTER_SUB
+    out[0, 1:1 + BYTES_PER_PIXEL] = flat[0, :BYTES_PER_PIXEL]
+    np.subtract(flat[0, BYTES_PER_PIXEL:], flat[0, :-BYTES_PER_PIXEL], out=out[0, 1 + BYTES_PER_PIXEL:])
+    if height > 1:
+        out[1:, 0] = FILTER_UP
+        np.subtract(flat[1:], flat[:-1], out=out[1:, 1:])  # uint8 wraps mod 256
+    return out.tobytes()
+
+
+def _deflate(raw: bytes, level: int, strategy: int, final: bool) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15, 8, strategy)
+    return compressor.compress(raw) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_FULL_FLUSH)
+
+
+def _assemble(width: int, height: int, region_rows: int, head: bytes, tail: bytes,
+              adler: int, tail_adler: int) -> bytes:
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)  # 8-bit RGB, no interlace
+    layout = struct.pack(REGION_CHUNK_FORMAT, REGION_CHUNK_VERSION, region_rows, len(head), tail_adler)
+    idat = b'\x78\x9c' + head + tail + struct.pack('>I', adler)
+    return (
+        PNG_SIGNATURE + _chunk(b'IHDR', ihdr) + _chunk(REGION_CHUNK, layout) +
+        _chunk(b'IDAT', idat) + _chunk(b'IEND', b'')
+    )
+
+
+def _split_region_rows(height: int, region_rows: int) -> int:
+    # Keep at least one tail row so the layout is always two parts
+    return max(1, min(region_rows, height - 1))
+
+
+def encode_card_png(image: Image.Image, region_rows: int, mode: str = DEFAULT_SAVE_MODE) -> bytes:
+    """
+    Encode a whole RGB image with the region-aware layout
+
+    Args:
+        image: RGB Pillow image
+        region_rows: Rows in the separately compressed head (the embed region)
+        mode: 'region', 'fast' or 'hot'
+
+    Returns:
+        PNG file bytes
+    """
+    profile = SAVE_MODES[mode]
+    pixels = np.asarray(image, dtype=np.uint8)
+    height, width = pixels.shape[:2]
+    if height < 2:
+        raise ValueError("Region-aware PNG needs at least two rows")
+    region_rows = _split_region_rows(height, region_rows)
+
+    head_raw = _filter_rows(pixels[:region_rows])
+    tail_raw = _filter_rows(pixels[region_rows:])
+    head = _deflate(head_raw, profile["level"], profile["strategy"], final=False)
+    tail = _deflate(tail_raw, profile["level"], profile["strategy"], final=True)
+
+    tail_adler = zlib.adler32(tail_raw)
+    adler = adler32_combine(zlib.adler32(head_raw), tail_adler, len(tail_raw))
+    return _assemble(width, height, region_rows, head, tail, adler, tail_adler)
+
+
+def read_layout(data: bytes) -> Optional[Dict]:
+    """
+    Parse a region-aware PNG written by this module
+
+    Returns:
+        Dict with width, height, region_rows, head, tail and tail_adler,
+        or None if the file is not in the region-aware layout
+    """
+    if not data.startswith(PNG_SIGNATURE):
+        return None
+
+    ihdr = layout = idat = None
+    offset = len(PNG_SIGNATURE)
+    while offset + 12 <= len(data):
+        length, kind = struct.unpack('>I4s', data[offset:offset + 8])
+        body = data[offset + 8:offset + 8 + length]
+        if len(body) != length:
+            return None
+        if kind == b'IHDR':
+            ihdr = body
+        elif kind == REGION_CHUNK:
+            layout = body
+        elif kind == b'IDAT':
+            if idat is not None:
+                return None  # This module always writes a single IDAT
+            crc = struct.unpack('>I', data[offset + 8 + length:offset + 12 + length])[0]
+            if zlib.crc32(body, zlib.crc32(kind)) != crc:
+                return None
+            idat = body
+        elif kind == b'IEND':
+            break
+        offset += 12 + length
+
+    if ihdr is None or layout is None or idat is None or len(layout) != struct.calcsize(REGION_CHUNK_FORMAT):
+        return None
+
+    width, height, depth, color, _, _, interlace = struct.unpack('>IIBBBBB', ihdr)
+    version, region_rows, head_length, tail_adler = struct.unpack(REGION_CHUNK_FORMAT, layout)
+    if (depth, color, interlace, version) != (8, 2, 0, REGION_CHUNK_VERSION):
+        return None
+    if not 0 < region_rows < height or 2 + head_length > len(idat) - 4:
+        return None
+
+    body = idat[2:-4]
+    return {
+        "width": width,
+        "height": height,
+        "region_rows": region_rows,
+        "head": body[:head_length],
+        "tail": body[head_length:],
+        "tail_adler": tail_adler,
+    }
+
+
+def reencode_region(source: bytes, image: Image.Image, region_rows: int,
+                    mode: str = DEFAULT_SAVE_MODE) -> Optional[bytes]:
+    """
+    Re-encode only the head rows, reusing the compressed tail of `source`
+
+    The caller guarantees that `image` was decoded from `source` and that
+    only rows [0, region_rows) have changed since.
+
+    Returns:
+        New PNG bytes, or None if `source` is not in a compatible layout
+    """
+    layout = read_layout(source)
+    width, height = image.size
+    if (
+        layout is None or
+        (layout["width"], layout["height"]) != (width, height) or
+        layout["region_rows"] != _split_region_rows(height, region_rows)
+    ):
+        return None
+
+    profile = SAVE_MODES[mode]
+    rows = layout["region_rows"]
+    head_raw = _filter_rows(np.asarray(image.crop((0, 0, width, rows)), dtype=np.uint8))
+    head = _deflate(head_raw, profile["level"], profile["strategy"], final=False)
+
+    tail_length = (height - rows) * (width * BYTES_PER_PIXEL + 1)
+    adler = adler32_combine(zlib.adler32(head_raw), layout["tail_adler"], tail_length)
+    return _assemble(width, height, rows, head, layout["tail"], adler, layout["tail_adler"])
+
+
+def recompress(source: bytes, mode: str = RECOMPRESS_MODE) -> Optional[bytes]:
+    """
+    Recompress a region-aware PNG (e.g. a hot-tier card) without decoding pixels
+
+    Returns:
+        New PNG bytes, or None if `source` is not in the region-aware layout
+    """
+    layout = read_layout(source)
+    if layout is None:
+        return None
+
+    profile = SAVE_MODES[mode]
+    head_raw = zlib.decompressobj(-15).decompress(layout["head"])  # Ends on a flush, not a final block
+    tail_raw = zlib.decompress(layout["tail"], -15)
+    head = _deflate(head_raw, profile["level"], profile["strategy"], final=False)
+    tail = _deflate(tail_raw, profile["level"], profile["strategy"], final=True)
+
+    adler = adler32_combine(zlib.adler32(head_raw), layout["tail_adler"], len(tail_raw))
+    return _assemble(layout["width"], layout["height"], layout["region_rows"],
+                     head, tail, adler, layout["tail_adler"])
+
+
+def save_card_png(
+    image: Image.Image,
+    output_path: str,
+    region_rows: int,
+    mode: str = DEFAULT_SAVE_MODE,
+    source: Optional[bytes] = None
+) -> Optional[Tuple[int, int]]:
+    """
+    Save an RGB card image
+
+    Args:
+        image: RGB Pillow image
+        output_path: Destination PNG path
+        region_rows: Rows holding the embed region
+        mode: One of SAVE_MODES
+        source: Bytes the image was decoded from; enables the head-only re-encode
+
+    Returns:
+        file_stamp() of the written file
+    """
+    if mode not in SAVE_MODES:
+        raise ValueError(f"Unknown save mode '{mode}' (choose from {', '.join(SAVE_MODES)})")
+
+    if SAVE_MODES[mode] is None:
+        with _write_lock(output_path):
+            image.save(output_path, 'PNG', optimize=False)
+            return file_stamp(output_path)
+
+    data = None
+    if source is not None:
+        data = reencode_region(source, image, region_rows, mode)
+    if data is None:
+        data = encode_card_png(image, region_rows, mode)
+
+    with _write_lock(output_path):
+        with open(output_path, 'wb') as f:
+            f.write(data)
+        return file_stamp(output_path)
+
+
+class BackgroundRecompressor:
+    """
+    Recompresses hot-tier cards on a daemon thread
+
+    A card is only replaced if its (mtime_ns, size) still matches the stamp
+    recorded when it was queued and, under the card's write lock, its bytes
+    are still the ones recompressed, so a newer write is never overwritten.
+    """
+
+    def __init__(self, mode: str = RECOMPRESS_MODE):
+        self.mode = mode
+        self._queue = queue.Queue()
+        self._pending = {}  # Path -> (stamp, cache)
+        self._pending_lock = threading.Lock()
+        self._thread = None
+
+        self.recompressed = 0
+        self.skipped = 0
+        self.bytes_saved = 0
+
+    def submit(self, path: str, stamp: Optional[Tuple[int, int]], cache=None):
+        """
+        Queue a card for recompression
+
+        Args:
+            path: Card written in hot mode
+            stamp: file_stamp() right after that write
+            cache: CardDataCache whose entry should follow the new stamp
+        """
+        if stamp is None:
+            return
+        with self._pending_lock:
+            queued = path in self._pending
+            self._pending[path] = (stamp, cache)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._worker, name="aurora-recompress", daemon=True
+                )
+                self._thread.start()
+        if not queued:
+            self._queue.put(path)
+
+    def _worker(self):
+        while True:
+            path = self._queue.get()
+            try:
+                with self._pending_lock:
+                    stamp, cache = self._pending.pop(path)
+                self._recompress(path, stamp, cache)
+            except Exception:
+                self.skipped += 1
+            finally:
+                self._queue.task_done()
+
+    def _recompress(self, path: str, stamp: Tuple[int, int], cache):
+        if file_stamp(path) != stamp:
+            self.skipped += 1  # Rewritten since it was queued
+            return
+
+        with open(path, 'rb') as f:
+            source = f.read()
+        data = recompress(source, self.mode)
+        if data is None or len(data) >= len(source):
+            self.skipped += 1
+            return
+
+        temp_path = f"{path}.{os.getpid()}.recompress.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+
+        with _write_lock(path):
+            # The stamp alone misses a same-size rewrite within one mtime tick
+            unchanged = file_stamp(path) == stamp
+            if unchanged:
+                with open(path, 'rb') as f:
+                    unchanged = f.read() == source
+            if not unchanged:
+                os.remove(temp_path)
+                self.skipped += 1
+                return
+            os.replace(temp_path, path)
+            new_stamp = file_stamp(path)
+
+        if cache is not None:
+            cache.restamp(path, stamp, new_stamp)
+        self.recompressed += 1
+        self.bytes_saved += len(source) - len(data)
+
+    def wait(self):
+        """Block until every queued card has been processed"""
+        self._queue.join()
+
+    def stats(self) -> Dict:
+        """Recompression counters"""
+        return {
+            "recompressed": self.recompressed,
+            "skipped": self.skipped,
+            "bytes_saved": self.bytes_saved,
+            "pending": self._queue.unfinished_tasks,
+        }
+
+
+# Singleton instance
+_recompressor_instance = None
+_recompressor_lock = threading.Lock()
+
+def get_recompressor() -> BackgroundRecompressor:
+    """Get the process-wide background recompressor"""
+    global _recompressor_instance
+    with _recompressor_lock:
+        if _recompressor_instance is None:
+            _recompressor_instance = BackgroundRecompressor()
+    return _recompressor_instance
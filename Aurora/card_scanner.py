@@ -13,6 +13,7 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, Optional, List, Tuple
 from mutable_steganography import MutableCardSteganography
+from atomic_store import JsonJournal, atomic_write_json
 
 
 class CardDataError(Exception):
@@ -33,34 +34,74 @@ class UserDatabase:
     Stores all registered users and their associated cards
     """
     
-    def __init__(self, db_path: str = "data/users_database.json"):
+    def __init__(self, db_path: str = "data/users_database.json", journal: bool = False):
         """
         Initialize user database
         
         Args:
             db_path: Path to the JSON database file
+            journal: Append changes to <db>.journal and rewrite the JSON only
+                every few hundred changes (restart replays just the journal tail)
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.journal = JsonJournal(self.db_path.with_suffix('.journal')) if journal else None
         self.users = self._load_database()
     
     def _load_database(self) -> Dict:
-        """Load user database from file"""
+        """Load user database from file, then replay any journaled changes"""
+        users = {"users": [], "last_updated": None}
         if self.db_path.exists():
             try:
                 with open(self.db_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    users = json.load(f)
             except Exception as e:
                 print(f"Warning: Could not load database: {e}")
-                return {"users": [], "last_updated": None}
-        return {"users": [], "last_updated": None}
+        
+        if self.journal is not None:
+            for record in self.journal.replay(users.get("journal_seq", 0)):
+                self._apply_change(users, record)
+            if self.journal.replayed:
+                print(f"Replayed {self.journal.replayed} journaled changes in {self.journal.replay_ms:.1f} ms")
+        
+        return users
+    
+    @staticmethod
+    def _apply_change(users: Dict, change: Dict):
+        """Apply one journaled change to the users document"""
+        if change["op"] == "put":
+            user = change["user"]
+            for i, existing in enumerate(users["users"]):
+                if existing["user_id"] == user["user_id"]:
+                    users["users"][i] = user
+                    break
+            else:
+                users["users"].append(user)
+        elif change["op"] == "remove":
+            users["users"] = [u for u in users["users"] if u["user_id"] != change["user_id"]]
+        users["last_updated"] = change.get("timestamp", users.get("last_updated"))
     
-    def _save_database(self):
-        """Save user database to file"""
+    def _save_database(self, change: Optional[Dict] = None):
+        """
+        Save user database to file
+        
+        Args:
+            change: The change just applied ({"op": "put", "user": ...} or
+                {"op": "remove", "user_id": ...}); journaled when enabled,
+                otherwise the whole file is atomically replaced
+        """
         try:
             self.users["last_updated"] = datetime.now().isoformat()
-            with open(self.db_path, 'w', encoding='utf-8') as f:
-                json.dump(self.users, f, indent=2, ensure_ascii=False)
+            if self.journal is not None and change is not None:
+                self.journal.append({**change, "timestamp": self.users["last_updated"]})
+                if not self.journal.needs_checkpoint:
+                    return
+            
+            if self.journal is not None:
+                self.users["journal_seq"] = self.journal.seq
+            atomic_write_json(self.db_path, self.users, indent=2, ensure_ascii=False)
+            if self.journal is not None:
+                self.journal.truncate()
         except Exception as e:
             print(f"Error saving database: {e}")
     
@@ -104,7 +145,7 @@ class UserDatabase:
                 "scan_count": 1
             })
         
-        self._save_database()
+        self._save_database({"op": "put", "user": self.get_user(user_id)})
         return user_id
     
     def get_user(self, user_id: str) -> Optional[Dict]:
@@ -124,7 +165,7 @@ class UserDatabase:
         self.users["users"] = [u for u in self.users["users"] if u["user_id"] != user_id]
         
         if len(self.users["users"]) < initial_count:
-            self._save_database()
+            self._save_database({"op": "remove", "user_id": user_id})
             return True
         return False
     
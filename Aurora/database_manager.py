@@ -8,15 +8,28 @@ Dependencies: aiofiles
 
 import json
 import asyncio
+import atexit
+import functools
 import logging
+import threading
+import time
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Union
 import hashlib
-import math
 import os
 from dotenv import load_dotenv
 
+from member_store import MemberStore, PollExpired, open_member_store, write_members_json
+from member_index import MemberIndex, member_keys, normalize_email, pool_tier
+from member_cache import DEFAULT_CAPACITY, MemberCache
+from book_index import BookIndex
+from rental_index import DAILY_OVERDUE_FEE, RentalIndex, days_overdue, overdue_start, rental_key
+from atomic_store import JsonJournal, atomic_write_json
+from file_lock import InterProcessLock
+from transaction_log import TransactionLog
+
 # Setup logging
 log_dir = Path('logs')
 log_dir.mkdir(exist_ok=True)
@@ -31,17 +44,70 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Reads reuse the last check for other processes' changes for this long
+DEFAULT_REFRESH_MS = 250
+
+
+def _write_operation(method):
+    """Run a DatabaseManager write under the inter-process lock, on fresh data"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._exclusive():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class DatabaseManager:
     """
     Manages all database operations for Aurora Archive
-    - Member data (JSON + JSONL redundancy)
+    - Member data (member_store backend; JSON + JSONL export)
     - Books inventory
     - Transaction history
     - Card archiving
+    
+    Several processes (API workers, the member manager GUI, the desktop app)
+    may share one data directory. Writes hold an inter-process lock and first
+    pull in records other processes changed; reads pick those changes up
+    through refresh(), which reloads only the changed member records.
     """
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(
+        self,
+        data_dir: str = "data",
+        backend: Optional[str] = None,
+        group_commit_ms: Optional[float] = None,
+        journal: Optional[bool] = None,
+        refresh_ms: Optional[float] = None,
+        overdue_interval_s: Optional[float] = None,
+        lazy: Optional[bool] = None,
+        cache_size: Optional[int] = None
+    ):
+        """
+        Args:
+            data_dir: Directory for databases and logs
+            backend: Member store backend - 'sqlite' (default), 'log' or 'json'
+                (default: $AURORA_DB_BACKEND)
+            group_commit_ms: If > 0, writes outside batch() are committed by a
+                background thread at most once per this many ms
+                (default: $AURORA_DB_GROUP_COMMIT_MS, else 0 = commit each write)
+            journal: Journal book changes to books_inventory.journal and
+                snapshot the JSON every few hundred records instead of on
+                every write (default: $AURORA_DB_JOURNAL, else off)
+            refresh_ms: Reads check for other processes' changes at most once
+                per this many ms, so a read may miss another process's write
+                made within that window (default: $AURORA_DB_REFRESH_MS, else
+                250; 0 = before every read; writes always check)
+            overdue_interval_s: If > 0, a background thread runs
+                process_overdue_rentals() every this many seconds. Enable it
+                in one process per data directory
+                (default: $AURORA_OVERDUE_INTERVAL_S, else 0 = off)
+            lazy: Read member records on demand instead of loading them all
+                at startup (sqlite backend only). self.members becomes an
+                LRU of hot records and get_all_members() streams
+                (default: $AURORA_DB_LAZY, else off)
+            cache_size: Member records kept in memory in lazy mode
+                (default: $AURORA_DB_CACHE_SIZE, else 10000)
+        """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
@@ -67,6 +133,25 @@ class DatabaseManager:
         self.books_db = self.data_dir / "books_inventory.json"
         self.transactions_db = self.data_dir / "transactions.jsonl"
         
+        # Transaction history, sealed into indexed segments by size / age
+        self.transactions = TransactionLog(
+            self.transactions_db,
+            max_bytes=int(float(os.getenv('AURORA_TXLOG_MAX_MB', 16)) * 1024 * 1024),
+            max_age_s=float(os.getenv('AURORA_TXLOG_MAX_DAYS', 30)) * 86400,
+            compress=os.getenv('AURORA_TXLOG_COMPRESS', '').lower() in ('1', 'true', 'yes')
+        )
+        
+        if journal is None:
+            journal = os.getenv('AURORA_DB_JOURNAL', '').lower() in ('1', 'true', 'yes')
+        self.books_journal = JsonJournal(self.data_dir / "books_inventory.journal") if journal else None
+        
+        # Serializes writers across processes sharing this data directory
+        self._process_lock = InterProcessLock(self.data_dir / "aurora_db.lock")
+        
+        # Member storage engine (one record per write)
+        with self._process_lock:
+            self.store: MemberStore = open_member_store(self.data_dir, backend)
+        
         # Card storage paths
         self.cards_dir = Path(__file__).parent.parent / "Assets" / "member_cards"
         self.cards_dir.mkdir(parents=True, exist_ok=True)
@@ -76,25 +161,91 @@ class DatabaseManager:
         # In-memory cache
         self.members = {}
         self.books = {}
+        self.index = MemberIndex()  # email / thread_id / tier lookups over self.members (eager mode)
+        self.book_index = BookIndex()  # title / author / ISBN search over self.books
+        self.rental_index = RentalIndex()  # active rentals by due date, with accrued overdue days
+        
+        # Unit of work: writes mark records dirty; _commit() persists them
+        self._write_lock = threading.RLock()
+        self._batch_depth = 0
+        self._dirty_members = set()
+        self._deleted_members = set()
+        self._dirty_books = set()
+        self.commits = 0
+        
+        # Lazy mode: members is an LRU over the store; lookups query the store's indexed columns
+        if lazy is None:
+            lazy = os.getenv('AURORA_DB_LAZY', '').lower() in ('1', 'true', 'yes')
+        if lazy and not self.store.supports_lazy:
+            logger.warning(f"{type(self.store).__name__} cannot load members on demand; loading all")
+            lazy = False
+        self.lazy = lazy
+        if self.lazy:
+            if cache_size is None:
+                cache_size = int(os.getenv('AURORA_DB_CACHE_SIZE', DEFAULT_CAPACITY))
+            self.members = MemberCache(
+                self.store, cache_size, pinned=self._dirty_members, deleted=self._deleted_members
+            )
+        self._rentals_indexed = False
+        
+        # Change detection (other processes)
+        if refresh_ms is None:
+            refresh_ms = float(os.getenv('AURORA_DB_REFRESH_MS', DEFAULT_REFRESH_MS))
+        self.refresh_ms = refresh_ms
+        self._last_refresh = 0.0
+        self._books_stamp = None
+        
+        # Group commit
+        if group_commit_ms is None:
+            group_commit_ms = float(os.getenv('AURORA_DB_GROUP_COMMIT_MS', 0))
+        self.group_commit_ms = group_commit_ms
+        self._commit_event = threading.Event()
+        self._closing = False
+        self._committer = None
+        if self.group_commit_ms > 0:
+            self._committer = threading.Thread(
+                target=self._group_commit_loop, name="aurora-db-commit", daemon=True
+            )
+            self._committer.start()
+            atexit.register(self.close)
         
         # Initialize databases
-        self._initialize_databases()
+        with self._process_lock:
+            self._initialize_databases()
+        
+        # Overdue scheduler
+        if overdue_interval_s is None:
+            overdue_interval_s = float(os.getenv('AURORA_OVERDUE_INTERVAL_S', 0))
+        self.overdue_interval_s = overdue_interval_s
+        self._overdue_stop = threading.Event()
+        self._overdue_thread = None
+        if self.overdue_interval_s > 0:
+            self._overdue_thread = threading.Thread(
+                target=self._overdue_loop, name="aurora-overdue", daemon=True
+            )
+            self._overdue_thread.start()
+            atexit.register(self.close)
+        
+        # Called with member_ids whose memory sharing changed (add_sharing_listener)
+        self._sharing_listeners: List[Callable[[List[str]], None]] = []
         
         logger.info(f"DatabaseManager initialized: {self.data_dir}")
     
     def _initialize_databases(self):
         """Initialize database files if they don't exist"""
-        # Members database
-        if not self.members_db.exists():
-            self._save_members_db({
-                "metadata": {
-                    "created": datetime.now().isoformat(),
-                    "version": "1.0",
-                    "total_members": 0
-                },
-                "members": {}
-            })
-            logger.info("Created members_database.json")
+        # Members database: import the legacy JSON once into a new store. The
+        # marker keeps members deleted later from coming back on restart
+        if not self.store.metadata().get('legacy_imported'):
+            try:
+                if self.store.is_empty() and self.members_db.exists():
+                    with open(self.members_db, 'r', encoding='utf-8') as f:
+                        legacy_members = json.load(f).get('members', {})
+                    if legacy_members:
+                        self.store.put_many(legacy_members)
+                        logger.info(f"Imported {len(legacy_members)} members from {self.members_db.name}")
+                self.store.set_metadata('legacy_imported', datetime.now().isoformat())
+            except Exception as e:
+                logger.error(f"Error importing {self.members_db.name}: {e}", exc_info=True)
         
         # Books inventory
         if not self.books_db.exists():
@@ -115,59 +266,391 @@ class DatabaseManager:
         """Load databases into memory"""
         try:
             # Load members
-            with open(self.members_db, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.members = data.get('members', {})
+            if self.lazy:
+                self.store.mark_loaded()  # Records are read on demand
+            else:
+                self.members = self.store.load_all()
+                self.index.rebuild(self.members)
+                self._index_rentals()
                 logger.debug(f"Loaded {len(self.members)} members")
             
-            # Load books
-            with open(self.books_db, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.books = data.get('books', {})
-                logger.debug(f"Loaded {len(self.books)} books")
-                
+            self._load_books()
+            
         except Exception as e:
             logger.error(f"Error loading databases: {e}", exc_info=True)
     
-    def _save_members_db(self, data: Dict):
-        """Save members database (JSON + JSONL redundancy)"""
-        try:
-            # Save JSON
-            with open(self.members_db, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            # Save JSONL redundancy (one member per line)
-            with open(self.members_jsonl, 'w', encoding='utf-8') as f:
-                for member_id, member_data in data.get('members', {}).items():
-                    entry = {"member_id": member_id, **member_data}
-                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    def _reload_members(self):
+        """Reload every member when the store can't list what changed (keeps uncommitted changes)"""
+        logger.info("Other processes' member changes are too old to list; reloading members")
+        if self.lazy:
+            self.store.mark_loaded()
+            self.members.clear()
+            self._rentals_indexed = False  # Rebuilt on next use
+            return
+        members = self.store.load_all()
+        for member_id in self._dirty_members:
+            if member_id in self.members:
+                members[member_id] = self.members[member_id]
+        for member_id in self._deleted_members:
+            members.pop(member_id, None)
+        self.members.clear()
+        self.members.update(members)
+        self.index.rebuild(self.members)
+        if self._rentals_indexed:
+            self.rental_index.rebuild(self.members)
+    
+    def _index_rentals(self):
+        """Build the due-date index (lazy mode: on first use, streaming every member)"""
+        with self._write_lock:
+            if not self._rentals_indexed:
+                self.rental_index.rebuild(self.members)
+                self._rentals_indexed = True
+    
+    def _books_file_stamp(self):
+        """Identity of the books snapshot + journal on disk (changes on every write)"""
+        stamp = []
+        for path in (self.books_db, self.books_journal.path if self.books_journal else None):
+            try:
+                stat = os.stat(path) if path else None
+            except FileNotFoundError:
+                stat = None
+            stamp.append((stat.st_ino, stat.st_mtime_ns, stat.st_size) if stat else None)
+        return tuple(stamp)
+    
+    def _load_books(self):
+        """Load books_inventory.json and replay its journal"""
+        self._books_stamp = self._books_file_stamp()
+        with open(self.books_db, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+            self.books = data.get('books', {})
+            logger.debug(f"Loaded {len(self.books)} books")
+        
+        # Replay book changes made after the last snapshot
+        if self.books_journal is not None:
+            snapshot_seq = data.get('metadata', {}).get('journal_seq', 0)
+            for record in self.books_journal.replay(snapshot_seq):
+                if record.get('op') == 'put':
+                    self.books[record['book_id']] = record['data']
+            if self.books_journal.replayed:
+                logger.info(
+                    f"Replayed {self.books_journal.replayed} book journal records "
+                    f"in {self.books_journal.replay_ms:.1f} ms"
+                )
+        
+        self.book_index.rebuild(self.books)
+    
+    # ============================================
+    # MULTI-PROCESS
+    # ============================================
+    
+    @contextmanager
+    def _exclusive(self):
+        """Hold the write locks (thread + process), with other processes' changes loaded"""
+        with self._write_lock, self._process_lock:
+            if self._process_lock.depth == 1:
+                self.refresh()
+            yield
+    
+    def refresh(self) -> int:
+        """
+        Pull in records other processes changed since we last looked
+        
+        Only the changed member records are reloaded (books are reloaded
+        whole when their file changed). Records with uncommitted local
+        changes keep the local version.
+        
+        Returns:
+            Number of member records updated or removed
+        """
+        with self._write_lock:
+            self._last_refresh = time.monotonic()
+            try:
+                puts, deletes = self.store.poll()
+            except PollExpired:
+                puts, deletes = {}, set()
+                self._reload_members()
+            changed = 0
+            for member_id, member in puts.items():
+                if member_id in self._dirty_members or member_id in self._deleted_members:
+                    continue
+                if self.lazy:
+                    self.members.replace(member_id, member)
+                else:
+                    self.members[member_id] = member
+                    self.index.update(member_id, member)
+                if self._rentals_indexed:
+                    self.rental_index.update(member_id, member)
+                changed += 1
+            for member_id in deletes:
+                if member_id in self._dirty_members:
+                    continue
+                if self.lazy:
+                    del self.members[member_id]
+                elif member_id in self.members:
+                    del self.members[member_id]
+                    self.index.remove(member_id)
+                else:
+                    continue
+                self.rental_index.remove(member_id)
+                changed += 1
+            if changed:
+                logger.debug(f"Refreshed {changed} member(s) changed by another process")
             
-            logger.debug("Saved members database (JSON + JSONL)")
+            if self._books_file_stamp() != self._books_stamp:
+                pending = {book_id: self.books[book_id] for book_id in self._dirty_books if book_id in self.books}
+                try:
+                    self._load_books()
+                    self.books.update(pending)
+                    for book_id, book in pending.items():
+                        self.book_index.update(book_id, book)
+                except Exception as e:
+                    logger.error(f"Error reloading books: {e}", exc_info=True)
+            return changed
+    
+    def _refresh_if_stale(self):
+        """Cheap change check before a read (skipped while this thread is writing)"""
+        if time.monotonic() - self._last_refresh < self.refresh_ms / 1000:
+            return
+        if not self._write_lock.acquire(blocking=False):
+            return  # A writer is active and refreshes for itself
+        try:
+            if self._process_lock.depth == 0:
+                self.refresh()
+        finally:
+            self._write_lock.release()
+    
+    # ============================================
+    # UNIT OF WORK
+    # ============================================
+    
+    @contextmanager
+    def batch(self):
+        """
+        Coalesce every write in the block into one commit
+        
+        Member puts/deletes go to the store in a single transaction (or one
+        log append) and books are written once. Batches nest; the outermost
+        one commits. Other threads' writes wait until the batch ends.
+        
+        In-memory changes cannot be rolled back, so the batch still commits
+        if the block raises - disk always matches memory.
+        
+        Usage:
+            with db.batch():
+                db.update_member(a, {...})
+                db.update_book(book_id, {...})
+        """
+        with self._exclusive():
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._commit()
+    
+    def _mark_dirty(self):
+        """Commit now, or leave it to the enclosing batch / group committer"""
+        if self._batch_depth:
+            return
+        if self._committer is not None:
+            self._commit_event.set()
+            return
+        self._commit()
+    
+    def _commit(self):
+        """Persist all dirty records (caller holds _write_lock)"""
+        if self._dirty_members or self._deleted_members:
+            puts = {
+                member_id: self.members[member_id]
+                for member_id in self._dirty_members
+                if member_id in self.members
+            }
+            try:
+                self.store.apply(puts, self._deleted_members)
+                logger.debug(f"Committed {len(puts)} member(s), {len(self._deleted_members)} deletion(s)")
+                self._dirty_members.clear()
+                self._deleted_members.clear()
+                self.commits += 1
+            except Exception as e:
+                # Keep the dirty set so the next commit retries
+                logger.error(f"Error committing members: {e}", exc_info=True)
+        
+        if self._dirty_books:
+            if self.books_journal is None:
+                if self._save_books_db(self._books_snapshot()):
+                    self._dirty_books.clear()
+            else:
+                try:
+                    self.books_journal.append(*[
+                        {"op": "put", "book_id": book_id, "data": self.books[book_id]}
+                        for book_id in self._dirty_books
+                        if book_id in self.books
+                    ])
+                    self._dirty_books.clear()
+                except Exception as e:
+                    logger.error(f"Error journaling books: {e}", exc_info=True)
+                
+                if self.books_journal.needs_checkpoint:
+                    self._checkpoint_books()
+            self._books_stamp = self._books_file_stamp()
+    
+    def _books_snapshot(self) -> Dict:
+        """Full books_inventory.json contents"""
+        metadata = {
+            "created": datetime.now().isoformat(),
+            "version": "1.0",
+            "total_books": len(self.books),
+            "last_updated": datetime.now().isoformat()
+        }
+        if self.books_journal is not None:
+            metadata["journal_seq"] = self.books_journal.seq
+        return {"metadata": metadata, "books": self.books}
+    
+    def _checkpoint_books(self):
+        """Snapshot books_inventory.json and empty the journal"""
+        if self._save_books_db(self._books_snapshot()):
+            self.books_journal.truncate()
+    
+    def _group_commit_loop(self):
+        """Commit pending writes, at most once per group_commit_ms"""
+        interval = self.group_commit_ms / 1000
+        last_commit = 0.0
+        while not self._closing:
+            self._commit_event.wait()
+            self._commit_event.clear()
+            time.sleep(max(0.0, last_commit + interval - time.monotonic()))
+            with self._exclusive():
+                self._commit()
+            last_commit = time.monotonic()
+    
+    def flush(self):
+        """Commit any pending writes now"""
+        with self._exclusive():
+            self._commit()
+    
+    def close(self):
+        """Flush pending writes, stop the group committer and close the store"""
+        if self._closing:
+            return
+        self._closing = True
+        self._overdue_stop.set()
+        if self._overdue_thread is not None:
+            self._overdue_thread.join(timeout=5)
+        if self._committer is not None:
+            self._commit_event.set()
+            self._committer.join(timeout=5)
+        self.flush()
+        if self.books_journal is not None and self.books_journal.pending:
+            with self._exclusive():
+                self._checkpoint_books()
+        self.store.close()
+        self._process_lock.close()
+    
+    def _save_member(self, member_id: str):
+        """Persist one member record through the store (O(1) I/O for sqlite/log)"""
+        if not self.lazy:
+            self.index.update(member_id, self.members[member_id])
+        if self._rentals_indexed:
+            self.rental_index.update(member_id, self.members[member_id])
+        with self._write_lock:
+            self._deleted_members.discard(member_id)
+            self._dirty_members.add(member_id)
+            self._mark_dirty()
+    
+    def _delete_member_record(self, member_id: str):
+        """Remove one member record from the store"""
+        self.index.remove(member_id)
+        self.rental_index.remove(member_id)
+        with self._write_lock:
+            self._dirty_members.discard(member_id)
+            self._deleted_members.add(member_id)
+            self._mark_dirty()
+    
+    def _save_books(self, book_id: str):
+        """Persist a changed book (the inventory is written once per batch)"""
+        with self._write_lock:
+            self._dirty_books.add(book_id)
+            self._mark_dirty()
+    
+    def export_members_json(
+        self,
+        json_path: Optional[str] = None,
+        jsonl_path: Optional[str] = None
+    ) -> bool:
+        """
+        Export all members in the legacy format (JSON + JSONL redundancy)
+        
+        Args:
+            json_path: Destination for the indented JSON (default: members_database.json)
+            jsonl_path: Destination for one member per line (default: members_database.jsonl)
+        
+        Returns:
+            True if both files were written
+        """
+        try:
+            write_members_json(
+                Path(json_path) if json_path else self.members_db,
+                Path(jsonl_path) if jsonl_path else self.members_jsonl,
+                dict(self.members.items()) if self.lazy else self.members,
+                self.store.metadata()
+            )
+            logger.debug("Exported members database (JSON + JSONL)")
+            return True
         except Exception as e:
-            logger.error(f"Error saving members database: {e}", exc_info=True)
+            logger.error(f"Error exporting members database: {e}", exc_info=True)
+            return False
     
-    def _save_books_db(self, data: Dict):
-        """Save books database"""
+    def _save_books_db(self, data: Dict) -> bool:
+        """Save books database (atomic replace)"""
         try:
-            with open(self.books_db, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            atomic_write_json(self.books_db, data, indent=2, ensure_ascii=False)
             logger.debug("Saved books database")
+            return True
         except Exception as e:
             logger.error(f"Error saving books database: {e}", exc_info=True)
+            return False
     
     def _log_transaction(self, transaction: Dict):
-        """Append transaction to JSONL log"""
+        """Append transaction to JSONL log (callers hold the write locks)"""
         try:
-            with open(self.transactions_db, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(transaction, ensure_ascii=False) + '\n')
+            self.transactions.append(transaction)
             logger.debug(f"Logged transaction: {transaction.get('type')}")
         except Exception as e:
             logger.error(f"Error logging transaction: {e}", exc_info=True)
     
+    def query_transactions(
+        self,
+        member_id: Optional[str] = None,
+        since: Union[str, datetime, None] = None,
+        until: Union[str, datetime, None] = None,
+        type: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Search the transaction history, reading only segments that can match
+        
+        Args:
+            member_id: Only this member's transactions
+            since: Include transactions at or after this time (ISO string or datetime)
+            until: Include transactions before this time
+            type: Transaction type, e.g. 'member_added', 'rental_overdue'
+            limit: Return at most this many (the most recent)
+            
+        Returns:
+            Transaction dicts, oldest first
+        """
+        try:
+            return self.transactions.query(member_id=member_id, since=since, until=until, type=type, limit=limit)
+        except Exception as e:
+            logger.error(f"Error querying transactions: {e}", exc_info=True)
+            return []
+    
     # ============================================
     # MEMBER OPERATIONS
     # ============================================
     
+    @_write_operation
     def add_member(self, member_data: Dict) -> bool:
         """Add new member to database"""
         try:
@@ -180,15 +663,7 @@ class DatabaseManager:
             self.members[member_id] = member_data
             
             # Save to disk
-            self._save_members_db({
-                "metadata": {
-                    "created": datetime.now().isoformat(),
-                    "version": "1.0",
-                    "total_members": len(self.members),
-                    "last_updated": datetime.now().isoformat()
-                },
-                "members": self.members
-            })
+            self._save_member(member_id)
             
             # Log transaction
             self._log_transaction({
@@ -205,6 +680,7 @@ class DatabaseManager:
             logger.error(f"Error adding member: {e}", exc_info=True)
             return False
     
+    @_write_operation
     def update_member(self, member_id: str, updates: Dict) -> bool:
         """Update existing member"""
         try:
@@ -212,6 +688,8 @@ class DatabaseManager:
                 logger.error(f"Member not found: {member_id}")
                 return False
             
+            sharing_before = self._sharing_state(self.members[member_id])
+            
             # Deep update
             self._deep_update(self.members[member_id], updates)
             
@@ -224,17 +702,11 @@ class DatabaseManager:
                 })
             
             # Save to disk
-            self._save_members_db({
-                "metadata": {
-                    "created": datetime.now().isoformat(),
-                    "version": "1.0",
-                    "total_members": len(self.members),
-                    "last_updated": datetime.now().isoformat()
-                },
-                "members": self.members
-            })
+            self._save_member(member_id)
             
             logger.info(f"Updated member: {member_id}")
+            if self._sharing_state(self.members[member_id]) != sharing_before:
+                self._notify_sharing_changed([member_id, *self.members[member_id].get('trusted_users', [])])
             return True
             
         except Exception as e:
@@ -243,16 +715,71 @@ class DatabaseManager:
     
     def get_member(self, member_id: str) -> Optional[Dict]:
         """Get member data"""
+        self._refresh_if_stale()
         return self.members.get(member_id)
 
     def get_member_by_email(self, email: str) -> Optional[Dict]:
         """Get member by email address - for Google auth"""
-        email_lower = email.lower().strip()
-        for member in self.members.values():
-            member_email = member.get('email', '').lower().strip()
-            if member_email == email_lower:
-                return member
-        return None
+        self._refresh_if_stale()
+        if self.lazy:
+            member_id = next(iter(self._lazy_find(email=normalize_email(email))), None)
+        else:
+            member_id = self.index.member_id_for_email(email)
+        return self.members.get(member_id) if member_id else None
+
+    def get_member_by_thread_id(self, thread_id: str) -> Optional[Dict]:
+        """Get the member who owns a memory thread"""
+        self._refresh_if_stale()
+        if self.lazy:
+            member_id = next(iter(self._lazy_find(thread_id=thread_id)), None)
+        else:
+            member_id = self.index.member_id_for_thread(thread_id)
+        return self.members.get(member_id) if member_id else None
+
+    def get_members_by_tier(self, tier: int, sharing_mode: Optional[str] = None) -> List[Dict]:
+        """Get members at an access tier, optionally with a given sharing mode"""
+        self._refresh_if_stale()
+        if self.lazy:
+            member_ids = self._lazy_find(tier=tier, mode=sharing_mode)
+        else:
+            member_ids = self.index.member_ids_for_tier(tier, sharing_mode)
+        return [
+            self.members[member_id]
+            for member_id in member_ids
+            if member_id in self.members
+        ]
+
+    def get_members_by_sharing_mode(self, sharing_mode: str) -> List[Dict]:
+        """Get members with a sharing mode, at any tier"""
+        self._refresh_if_stale()
+        if self.lazy:
+            member_ids = self._lazy_find(mode=sharing_mode)
+        else:
+            member_ids = self.index.member_ids_for_mode(sharing_mode)
+        return [
+            self.members[member_id]
+            for member_id in member_ids
+            if member_id in self.members
+        ]
+
+    def _lazy_find(self, **keys) -> List[str]:
+        """
+        member_ids whose email / thread_id / tier / mode match (lazy mode)
+
+        Queries the store's indexed columns, then checks each candidate's
+        current record, so uncommitted changes are honoured.
+        """
+        positions = {'email': 0, 'thread_id': 1, 'tier': 2, 'mode': 3}
+        wanted = [(positions[key], value) for key, value in keys.items() if value is not None]
+        pending = list(self._dirty_members)
+        member_ids = []
+        for member_id in dict.fromkeys(self.store.find_ids(**keys) + pending):
+            record = self.members.get(member_id)
+            if record is not None:
+                indexed = member_keys(record)
+                if all(indexed[position] == value for position, value in wanted):
+                    member_ids.append(member_id)
+        return member_ids
 
     def _is_admin_email(self, email: str) -> bool:
         """
@@ -267,6 +794,7 @@ class DatabaseManager:
         email_lower = email.lower().strip()
         return email_lower in self.admin_emails
 
+    @_write_operation
     def create_new_member_from_google(self, email: str, name: str, google_sub: str) -> Optional[Dict]:
         """Create new member from Google OAuth login"""
         try:
@@ -316,15 +844,7 @@ class DatabaseManager:
             self.members[member_id] = member_data
 
             # Save to disk
-            self._save_members_db({
-                "metadata": {
-                    "created": datetime.now().isoformat(),
-                    "version": "1.0",
-                    "total_members": len(self.members),
-                    "last_updated": datetime.now().isoformat()
-                },
-                "members": self.members
-            })
+            self._save_member(member_id)
 
             # Log transaction
             self._log_transaction({
@@ -343,6 +863,7 @@ class DatabaseManager:
             logger.error(f"Error creating member from Google OAuth: {e}", exc_info=True)
             return None
 
+    @_write_operation
     def set_memory_sharing_mode(self, member_id: str, mode: str, pooled_tier: Optional[int] = None) -> bool:
         """
         Set memory sharing mode for member (isolated, trusted, or pooled)
@@ -370,11 +891,14 @@ class DatabaseManager:
                 logger.warning(f"Member {member_id} tier < 4, cannot use {mode} sharing")
                 return False
 
-            self.members[member_id]['memory_sharing_mode'] = mode
+            updates = {'memory_sharing_mode': mode}
             if mode == "pooled":
-                self.members[member_id]['pooled_tier'] = pooled_tier or member.get('access_tier')
+                updates['pooled_tier'] = pooled_tier or member.get('access_tier')
 
-            self.update_member(member_id, {'memory_sharing_mode': mode, 'pooled_tier': pooled_tier})
+            # update_member sees the old -> new change, re-indexes the member
+            # and notifies the sharing listeners
+            if not self.update_member(member_id, updates):
+                return False
             logger.info(f"Set {mode} sharing mode for member {member_id}")
             return True
 
@@ -382,6 +906,7 @@ class DatabaseManager:
             logger.error(f"Error setting sharing mode: {e}", exc_info=True)
             return False
 
+    @_write_operation
     def add_trusted_user(self, member_id: str, trusted_member_id: str) -> bool:
         """
         Add trusted user (bidirectional)
@@ -417,17 +942,45 @@ class DatabaseManager:
             if member_id not in trusted_member['trusted_users']:
                 trusted_member['trusted_users'].append(member_id)
 
-            # Save changes
-            self.update_member(member_id, {'trusted_users': member['trusted_users']})
-            self.update_member(trusted_member_id, {'trusted_users': trusted_member['trusted_users']})
+            # Save changes (one commit for both sides)
+            with self.batch():
+                self.update_member(member_id, {'trusted_users': member['trusted_users']})
+                self.update_member(trusted_member_id, {'trusted_users': trusted_member['trusted_users']})
 
             logger.info(f"Added trusted connection: {member_id} <-> {trusted_member_id}")
+            self._notify_sharing_changed([member_id, trusted_member_id])
             return True
 
         except Exception as e:
             logger.error(f"Error adding trusted user: {e}", exc_info=True)
             return False
 
+    def add_sharing_listener(self, callback: Callable[[List[str]], None]):
+        """
+        Call `callback(member_ids)` after set_memory_sharing_mode(),
+        add_trusted_user(), update_member() (of a tier or sharing field) or
+        delete_member() changes who can read whose memory (used to keep
+        shared context views current). Deleted members are passed too.
+        """
+        self._sharing_listeners.append(callback)
+
+    @staticmethod
+    def _sharing_state(member: Dict) -> tuple:
+        """Fields that decide whose memory a member shares and reads"""
+        return (
+            member.get('access_tier', 1),
+            member.get('pooled_tier'),
+            member.get('memory_sharing_mode', 'isolated'),
+            tuple(member.get('trusted_users', [])),
+        )
+
+    def _notify_sharing_changed(self, member_ids: List[str]):
+        for callback in self._sharing_listeners:
+            try:
+                callback(member_ids)
+            except Exception as e:
+                logger.error(f"Sharing listener failed: {e}", exc_info=True)
+
     def get_accessible_thread_ids(self, member_id: str) -> List[str]:
         """
         Get all thread_ids a member can access based on sharing mode
@@ -438,6 +991,7 @@ class DatabaseManager:
         Returns:
             List of thread_ids the member can access
         """
+        self._refresh_if_stale()
         try:
             member = self.members.get(member_id)
             if not member:
@@ -461,11 +1015,9 @@ class DatabaseManager:
 
             elif mode == "pooled":
                 # Add all users at same tier's threads
-                pool_tier = member.get('pooled_tier', tier)
-                for other_member in self.members.values():
-                    if other_member.get('access_tier') == pool_tier and other_member.get('memory_sharing_mode') == 'pooled':
-                        if 'thread_id' in other_member:
-                            accessible.append(other_member.get('thread_id'))
+                for other_member in self.get_members_by_tier(pool_tier(member), 'pooled'):
+                    if 'thread_id' in other_member:
+                        accessible.append(other_member.get('thread_id'))
 
             return list(set(accessible))  # Remove duplicates
 
@@ -473,6 +1025,7 @@ class DatabaseManager:
             logger.error(f"Error getting accessible threads: {e}", exc_info=True)
             return []
 
+    @_write_operation
     def add_admin_flag(self, member_id: str, note: str) -> bool:
         """
         Add admin observation flag (read-only, non-modifying)
@@ -507,10 +1060,19 @@ class DatabaseManager:
             logger.error(f"Error adding admin flag: {e}", exc_info=True)
             return False
 
-    def get_all_members(self) -> List[Dict]:
-        """Get all members"""
+    def get_all_members(self) -> Iterable[Dict]:
+        """
+        Get all members
+        
+        Returns a list, or in lazy mode an iterator that streams records
+        from the store (wrap in list() to count or index it)
+        """
+        self._refresh_if_stale()
+        if self.lazy:
+            return self.members.values()
         return list(self.members.values())
     
+    @_write_operation
     def delete_member(self, member_id: str) -> bool:
         """Delete member (archives their data)"""
         try:
@@ -522,20 +1084,13 @@ class DatabaseManager:
             archive_file = self.data_dir / f"deleted_member_{member_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             with open(archive_file, 'w', encoding='utf-8') as f:
                 json.dump(self.members[member_id], f, indent=2)
+            trusted_users = list(self.members[member_id].get('trusted_users', []))
             
             # Remove from active database
             del self.members[member_id]
             
             # Save
-            self._save_members_db({
-                "metadata": {
-                    "created": datetime.now().isoformat(),
-                    "version": "1.0",
-                    "total_members": len(self.members),
-                    "last_updated": datetime.now().isoformat()
-                },
-                "members": self.members
-            })
+            self._delete_member_record(member_id)
             
             # Log transaction
             self._log_transaction({
@@ -546,6 +1101,7 @@ class DatabaseManager:
             })
             
             logger.info(f"Deleted member: {member_id}")
+            self._notify_sharing_changed([member_id, *trusted_users])
             return True
             
         except Exception as e:
@@ -564,6 +1120,7 @@ class DatabaseManager:
     # CARD OPERATIONS
     # ============================================
     
+    @_write_operation
     def save_member_card(self, member_id: str, card_path: str) -> Optional[str]:
         """Save member's current card (archives old one if exists)"""
         try:
@@ -617,6 +1174,7 @@ class DatabaseManager:
     # BOOKS OPERATIONS
     # ============================================
     
+    @_write_operation
     def add_book(self, book_data: Dict) -> bool:
         """Add book to inventory"""
         try:
@@ -627,17 +1185,10 @@ class DatabaseManager:
             
             # Add to memory
             self.books[book_id] = book_data
+            self.book_index.update(book_id, book_data)
             
             # Save to disk
-            self._save_books_db({
-                "metadata": {
-                    "created": datetime.now().isoformat(),
-                    "version": "1.0",
-                    "total_books": len(self.books),
-                    "last_updated": datetime.now().isoformat()
-                },
-                "books": self.books
-            })
+            self._save_books(book_id)
             
             logger.info(f"Added book: {book_id}")
             return True
@@ -646,6 +1197,7 @@ class DatabaseManager:
             logger.error(f"Error adding book: {e}", exc_info=True)
             return False
     
+    @_write_operation
     def update_book(self, book_id: str, updates: Dict) -> bool:
         """Update book inventory"""
         try:
@@ -654,16 +1206,9 @@ class DatabaseManager:
                 return False
             
             self._deep_update(self.books[book_id], updates)
+            self.book_index.update(book_id, self.books[book_id])
             
-            self._save_books_db({
-                "metadata": {
-                    "created": datetime.now().isoformat(),
-                    "version": "1.0",
-                    "total_books": len(self.books),
-                    "last_updated": datetime.now().isoformat()
-                },
-                "books": self.books
-            })
+            self._save_books(book_id)
             
             logger.info(f"Updated book: {book_id}")
             return True
@@ -674,24 +1219,35 @@ class DatabaseManager:
     
     def get_book(self, book_id: str) -> Optional[Dict]:
         """Get book data"""
+        self._refresh_if_stale()
         return self.books.get(book_id)
     
     def get_all_books(self) -> List[Dict]:
         """Get all books"""
+        self._refresh_if_stale()
         return list(self.books.values())
     
-    def search_books(self, query: str) -> List[Dict]:
-        """Search books by title, author, or ISBN"""
-        query_lower = query.lower()
-        results = []
+    def search_books(self, query: str, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Search books by title, author, or ISBN (ranked, prefix-aware)
         
-        for book in self.books.values():
-            if (query_lower in book.get('title', '').lower() or
-                query_lower in book.get('author', '').lower() or
-                query_lower in book.get('isbn', '').lower()):
-                results.append(book)
+        Args:
+            query: Words matched by prefix against title and author, or an ISBN prefix
+            limit: Return at most this many results (default: all)
         
-        return results
+        Returns:
+            Matching books, best match first (every book for an empty query)
+        """
+        self._refresh_if_stale()
+        if not query.strip():
+            books = list(self.books.values())
+            return books[:limit] if limit is not None else books
+        
+        return [
+            self.books[book_id]
+            for book_id in self.book_index.search(query, limit)
+            if book_id in self.books
+        ]
     
     # ============================================
     # RENTAL OPERATIONS
@@ -703,20 +1259,8 @@ class DatabaseManager:
         $1 per day, starting at midday after due date
         """
         try:
-            due_dt = datetime.fromisoformat(due_date)
             return_dt = datetime.fromisoformat(return_date) if return_date else datetime.now()
-            
-            # Calculate overdue from midday (12:00) of day after due date
-            overdue_start = due_dt.replace(hour=12, minute=0, second=0, microsecond=0) + timedelta(days=1)
-            
-            if return_dt <= overdue_start:
-                return 0.0
-            
-            # Calculate days overdue (using ceiling to charge partial days)
-            overdue_delta = return_dt - overdue_start
-            days_overdue = math.ceil(overdue_delta.total_seconds() / 86400)  # 86400 seconds in a day
-            
-            return float(days_overdue * 1.00)
+            return float(days_overdue(overdue_start(due_date), return_dt) * DAILY_OVERDUE_FEE)
             
         except Exception as e:
             logger.error(f"Error calculating overdue fee: {e}", exc_info=True)
@@ -725,12 +1269,110 @@ class DatabaseManager:
     def is_overdue(self, due_date: str) -> bool:
         """Check if rental is overdue"""
         try:
-            due_dt = datetime.fromisoformat(due_date)
-            overdue_start = due_dt.replace(hour=12, minute=0, second=0, microsecond=0) + timedelta(days=1)
-            return datetime.now() > overdue_start
+            return datetime.now() > overdue_start(due_date)
         except:
             return False
     
+    def _find_rental(self, member_id: str, key: str) -> Optional[Dict]:
+        """A member's rental by RentalIndex key (rental_id or list position)"""
+        member = self.members.get(member_id) or {}
+        for position, rental in enumerate(member.get('rentals') or []):
+            if rental_key(rental, position) == key:
+                return rental
+        return None
+    
+    def get_overdue_rentals(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Active rentals past their due date, most overdue first
+        
+        Reads the due-date index: O(k log k) for the k most overdue instead
+        of walking every member's rentals.
+        
+        Args:
+            limit: Return at most this many (default: all overdue rentals)
+            
+        Returns:
+            Copies of the rentals with member_id, days_overdue and
+            overdue_fee (accrued so far) added
+        """
+        self._refresh_if_stale()
+        self._index_rentals()
+        now = datetime.now()
+        overdue = []
+        for member_id, key, start_ts in self.rental_index.overdue(now, limit):
+            rental = self._find_rental(member_id, key)
+            if rental is None:
+                continue
+            days = days_overdue(datetime.fromtimestamp(start_ts), now)
+            overdue.append({
+                **rental,
+                'member_id': member_id,
+                'days_overdue': days,
+                'overdue_fee': float(days * DAILY_OVERDUE_FEE)
+            })
+        return overdue
+    
+    @_write_operation
+    def process_overdue_rentals(self) -> Dict:
+        """
+        Accrue overdue fees onto active rentals (the periodic overdue job)
+        
+        Only rentals whose day count went up since the last run are touched
+        (the index keeps a heap of when each rental's fee next changes).
+        Their `overdue_fee` is written to the member record, all in one
+        batch, and a 'rental_overdue' transaction is logged the first time
+        a rental accrues a fee.
+        
+        Returns:
+            Dict with newly_overdue, fees_updated, overdue_rentals and
+            outstanding_fees (accrued on all active overdue rentals)
+        """
+        newly_overdue = fees_updated = 0
+        self._index_rentals()
+        with self.batch():
+            for member_id, key, _, days in self.rental_index.advance():
+                rental = self._find_rental(member_id, key)
+                fee = float(days * DAILY_OVERDUE_FEE)
+                if rental is None or rental.get('overdue_fee') == fee:
+                    continue
+                if not rental.get('overdue_fee'):
+                    newly_overdue += 1
+                    self._log_transaction({
+                        "type": "rental_overdue",
+                        "member_id": member_id,
+                        "rental_id": rental.get('rental_id'),
+                        "book_id": rental.get('book_id'),
+                        "due_date": rental.get('due_date'),
+                        "timestamp": datetime.now().isoformat()
+                    })
+                rental['overdue_fee'] = fee
+                # Save (pin) right away: a lazy cache could otherwise evict the
+                # changed record before the batch commits
+                self._save_member(member_id)
+                fees_updated += 1
+        
+        summary = {
+            "newly_overdue": newly_overdue,
+            "fees_updated": fees_updated,
+            "overdue_rentals": len(self.rental_index.days),
+            "outstanding_fees": float(self.rental_index.outstanding_days * DAILY_OVERDUE_FEE)
+        }
+        if fees_updated:
+            logger.info(
+                f"Overdue job: {newly_overdue} newly overdue, {fees_updated} fee(s) updated, "
+                f"${summary['outstanding_fees']:.2f} outstanding"
+            )
+        return summary
+    
+    def _overdue_loop(self):
+        """Run process_overdue_rentals() every overdue_interval_s until close()"""
+        while not self._overdue_stop.is_set():
+            try:
+                self.process_overdue_rentals()
+            except Exception as e:
+                logger.error(f"Error in overdue job: {e}", exc_info=True)
+            self._overdue_stop.wait(self.overdue_interval_s)
+    
     def get_member_rentals(self, member_id: str) -> List[Dict]:
         """Get all rentals for a member"""
         member = self.get_member(member_id)
@@ -738,6 +1380,7 @@ class DatabaseManager:
             return member.get('rentals', [])
         return []
     
+    @_write_operation
     def add_rental(self, member_id: str, rental_data: Dict) -> bool:
         """Add rental to member's account"""
         try:
@@ -753,20 +1396,21 @@ class DatabaseManager:
             # Add rental
             member['rentals'].append(rental_data)
             
-            # Update book availability
-            book_id = rental_data.get('book_id')
-            if book_id:
-                book = self.get_book(book_id)
-                if book:
-                    available = book.get('available_copies', 0)
-                    copies_out = book.get('copies_out', 0)
-                    self.update_book(book_id, {
-                        'available_copies': max(0, available - 1),
-                        'copies_out': copies_out + 1
-                    })
-            
-            # Save member
-            self.update_member(member_id, {'rentals': member['rentals']})
+            with self.batch():
+                # Update book availability
+                book_id = rental_data.get('book_id')
+                if book_id:
+                    book = self.get_book(book_id)
+                    if book:
+                        available = book.get('available_copies', 0)
+                        copies_out = book.get('copies_out', 0)
+                        self.update_book(book_id, {
+                            'available_copies': max(0, available - 1),
+                            'copies_out': copies_out + 1
+                        })
+                
+                # Save member
+                self.update_member(member_id, {'rentals': member['rentals']})
             
             logger.info(f"Added rental for member: {member_id}")
             return True
@@ -775,6 +1419,7 @@ class DatabaseManager:
             logger.error(f"Error adding rental: {e}", exc_info=True)
             return False
     
+    @_write_operation
     def return_rental(self, member_id: str, rental_id: str) -> Dict:
         """Process book return and calculate fees"""
         try:
@@ -806,20 +1451,21 @@ class DatabaseManager:
             rental['overdue_fee'] = overdue_fee
             rental['status'] = 'returned'
             
-            # Update book availability
-            book_id = rental.get('book_id')
-            if book_id:
-                book = self.get_book(book_id)
-                if book:
-                    available = book.get('available_copies', 0)
-                    copies_out = book.get('copies_out', 0)
-                    self.update_book(book_id, {
-                        'available_copies': available + 1,
-                        'copies_out': max(0, copies_out - 1)
-                    })
-            
-            # Save member
-            self.update_member(member_id, {'rentals': rentals})
+            with self.batch():
+                # Update book availability
+                book_id = rental.get('book_id')
+                if book_id:
+                    book = self.get_book(book_id)
+                    if book:
+                        available = book.get('available_copies', 0)
+                        copies_out = book.get('copies_out', 0)
+                        self.update_book(book_id, {
+                            'available_copies': available + 1,
+                            'copies_out': max(0, copies_out - 1)
+                        })
+                
+                # Save member
+                self.update_member(member_id, {'rentals': rentals})
             
             logger.info(f"Processed return for member: {member_id}, Fee: ${overdue_fee:.2f}")
             
@@ -0,0 +1,233 @@
+"""
+Aurora Archive - Recent Event Cache
+In-process ring buffers of each memory thread's newest events
+
+    thread file -> deque(maxlen=depth) of its last `depth` events, oldest first
+
+UserMemoryBridge serves load_user_context() from here when the request
+fits in the buffer (every tier but Inner Sanctum's unlimited depth), and
+store_user_event() appends write-through. A thread is read from disk once,
+with a tail read, the first time it is requested.
+
+Threads are evicted least recently used once the cached events' JSON size
+exceeds `max_bytes`.
+
+Each hit costs one os.stat() of the thread file and no read. If another
+process (an API worker, the desktop app) appended since, only the new
+bytes are read. If the file was replaced or truncated, the thread is
+reloaded.
+
+A thread whose older events were sealed into segments (thread_segments)
+is filled from them through the `history` callable when its active file
+holds fewer than `depth` events.
+
+Python 3.10+
+Dependencies: none
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional
+
+from jsonl_tail import iter_lines_reverse
+
+
+DEFAULT_DEPTH = 500
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class _ThreadBuffer:
+    """One thread's newest events and how much of its file they reflect"""
+
+    __slots__ = ("events", "sizes", "bytes", "ino", "offset")
+
+    def __init__(self, depth: int, ino: int, offset: int):
+        self.events = deque(maxlen=depth)
+        self.sizes = deque(maxlen=depth)  # JSON bytes per event, for the global cap
+        self.bytes = 0
+        self.ino = ino
+        self.offset = offset  # File bytes consumed (always at a line boundary)
+
+    def push(self, event: Dict, size: int):
+        if len(self.events) == self.events.maxlen:
+            self.bytes -= self.sizes[0]
+        self.events.append(event)
+        self.sizes.append(size)
+        self.bytes += size
+
+
+class RecentEventCache:
+    """
+    LRU of per-thread ring buffers
+
+    Usage:
+        cache = RecentEventCache(depth=500)
+        events = cache.recent(path, 10)   # Newest first, or None -> read disk
+        cache.appended(path, event, line_bytes, end_offset)
+    """
+
+    def __init__(
+        self,
+        depth: int = DEFAULT_DEPTH,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        history: Optional[Callable[[str, int, int], List[bytes]]] = None
+    ):
+        """
+        Args:
+            depth: Events kept per thread (requests for more go to disk)
+            max_bytes: Cap on cached events' JSON size across all threads
+            history: (path, limit, active inode) -> up to `limit` lines older
+                than the active file, newest first
+        """
+        self.depth = depth
+        self.max_bytes = max_bytes
+        self.history = history
+        self._lock = threading.Lock()
+        self._threads: "OrderedDict[str, _ThreadBuffer]" = OrderedDict()
+        self._bytes = 0
+
+        # Diagnostics
+        self.hits = 0
+        self.misses = 0
+        self.catch_ups = 0
+
+    @property
+    def cached_bytes(self) -> int:
+        return self._bytes
+
+    def recent(self, path, n: int) -> Optional[List[Dict]]:
+        """
+        A thread's last `n` events, newest first
+
+        Args:
+            path: Thread JSONL file
+            n: Events wanted
+
+        Returns:
+            Event dicts (copies), or None if `n` exceeds the buffer depth or
+            the file cannot be cached right now (caller reads disk)
+        """
+        if n is None or n > self.depth or self.max_bytes <= 0:
+            return None
+        key = os.path.abspath(path)
+        try:
+            stat = os.stat(key)
+        except FileNotFoundError:
+            self.invalidate(path)
+            return []
+
+        with self._lock:
+            buffer = self._threads.get(key)
+            if buffer is not None and (buffer.ino != stat.st_ino or stat.st_size < buffer.offset):
+                self._drop(key)  # Replaced or cleared
+                buffer = None
+            if buffer is None:
+                self.misses += 1
+                buffer = self._load(key, stat)
+                if buffer is None:
+                    return None
+            else:
+                self.hits += 1
+                if stat.st_size > buffer.offset:
+                    self._catch_up(key, buffer, stat.st_size)
+            self._threads.move_to_end(key)
+            count = len(buffer.events)
+            recent = [dict(buffer.events[i]) for i in range(count - 1, max(count - n, 0) - 1, -1)]
+            self._evict()
+        return recent
+
+    def _load(self, key: str, stat) -> Optional[_ThreadBuffer]:
+        """Fill a buffer from the end of the file (None if an append is mid-write)"""
+        size = stat.st_size
+        if size:
+            with open(key, 'rb') as f:
+                f.seek(size - 1)
+                if f.read(1) != b'\n':
+                    return None
+        newest = []
+        for line in iter_lines_reverse(key, end=size):
+            try:
+                newest.append((json.loads(line), len(line) + 1))
+            except ValueError:
+                continue
+            if len(newest) >= self.depth:
+                break
+        if len(newest) < self.depth and self.history is not None:
+            for line in self.history(key, self.depth - len(newest), stat.st_ino):
+                try:
+                    newest.append((json.loads(line), len(line) + 1))
+                except ValueError:
+                    continue
+        buffer = _ThreadBuffer(self.depth, stat.st_ino, size)
+        for event, line_size in reversed(newest):
+            buffer.push(event, line_size)
+        self._threads[key] = buffer
+        self._bytes += buffer.bytes
+        return buffer
+
+    def _catch_up(self, key: str, buffer: _ThreadBuffer, size: int):
+        """Apply complete lines another process appended since buffer.offset"""
+        with open(key, 'rb') as f:
+            f.seek(buffer.offset)
+            data = f.read(size - buffer.offset)
+        lines = data.split(b'\n')
+        self._bytes -= buffer.bytes
+        for line in lines[:-1]:  # The last piece is empty or an unfinished append
+            if line.strip():
+                try:
+                    buffer.push(json.loads(line), len(line) + 1)
+                except ValueError:
+                    continue
+        self._bytes += buffer.bytes
+        buffer.offset += len(data) - len(lines[-1])
+        self.catch_ups += 1
+
+    def appended(self, path, event: Dict, size: int, end_offset: int):
+        """
+        Write-through after appending one event line to a thread file
+
+        Args:
+            path: Thread JSONL file
+            event: The event written
+            size: Bytes written (line including newline)
+            end_offset: File offset just after the line
+        """
+        key = os.path.abspath(path)
+        with self._lock:
+            buffer = self._threads.get(key)
+            if buffer is None:
+                return  # Not hot; loaded on its first read
+            if end_offset - size != buffer.offset:
+                return  # Another process appended in between; the next read catches up
+            self._bytes -= buffer.bytes
+            buffer.push(event, size)
+            self._bytes += buffer.bytes
+            buffer.offset = end_offset
+            self._threads.move_to_end(key)
+            self._evict()
+
+    def invalidate(self, path):
+        """Forget a thread (its file was cleared or rewritten)"""
+        with self._lock:
+            self._drop(os.path.abspath(path))
+
+    def clear(self):
+        with self._lock:
+            self._threads.clear()
+            self._bytes = 0
+
+    def _drop(self, key: str):
+        buffer = self._threads.pop(key, None)
+        if buffer is not None:
+            self._bytes -= buffer.bytes
+
+    def _evict(self):
+        """Drop least recently used threads until under max_bytes (keeping the newest)"""
+        while self._bytes > self.max_bytes and len(self._threads) > 1:
+            _, buffer = self._threads.popitem(last=False)
+            self._bytes -= buffer.bytes
+
+    def __len__(self) -> int:
+        return len(self._threads)
@@ -0,0 +1,139 @@
+"""
+Aurora Archive - Inter-Process File Lock
+Exclusive lock shared by every process that opens the same data directory
+
+The memory API workers, the member manager GUI and the desktop app each run
+their own DatabaseManager over one data/ directory. Holding this lock while
+reading-modifying-writing keeps their writes from interleaving.
+
+The lock is re-entrant within a process (threads queue on an RLock; the OS
+lock is taken once by the outermost acquire) and exclusive across
+processes via flock() on POSIX or msvcrt.locking() on Windows. Without
+either, it degrades to a process-local lock.
+
+flock_shared() / flock_exclusive() / flock_release() lock an already open
+file directly (POSIX only; no-ops elsewhere, see FLOCK_AVAILABLE): append
+writers hold a thread file shared while they write, the compactor holds it
+exclusively while it renames it away.
+
+Python 3.10+
+Dependencies: none
+"""
+
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+try:
+    import msvcrt
+    MSVCRT_AVAILABLE = True
+except ImportError:
+    MSVCRT_AVAILABLE = False
+
+FLOCK_AVAILABLE = FCNTL_AVAILABLE
+
+
+class InterProcessLock:
+    """
+    Re-entrant, cross-process exclusive lock on a lock file
+
+    Usage:
+        lock = InterProcessLock(data_dir / "aurora_db.lock")
+        with lock:
+            ...  # No other process holding the same lock file runs here
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Lock file (created if missing; its contents are unused)
+        """
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+        # Time spent waiting for other processes (ms), for diagnostics
+        self.wait_ms = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Nesting level of the current holder (0 when free)"""
+        return self._depth
+
+    def acquire(self):
+        self._lock.acquire()
+        if self._depth == 0:
+            try:
+                self._lock_file()
+            except BaseException:
+                self._lock.release()
+                raise
+        self._depth += 1
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            self._unlock_file()
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    def _lock_file(self):
+        if self._file is None:
+            self._file = open(self.path, 'a+b')
+        started = time.perf_counter()
+        if FCNTL_AVAILABLE:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        elif MSVCRT_AVAILABLE:
+            self._file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gives up after ~10 s; keep waiting
+        self.wait_ms += (time.perf_counter() - started) * 1000
+
+    def _unlock_file(self):
+        if FCNTL_AVAILABLE:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        elif MSVCRT_AVAILABLE:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def close(self):
+        """Close the lock file (the lock must not be held)"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def flock_shared(f):
+    """Block until `f` is locked shared (no-op without flock)"""
+    if FCNTL_AVAILABLE:
+        fcntl.flock(f.fileno(), fcntl.LOCK_SH)
+
+
+def flock_exclusive(f):
+    """Block until `f` is locked exclusively (no-op without flock)"""
+    if FCNTL_AVAILABLE:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def flock_release(f):
+    """Release a lock taken by flock_shared() / flock_exclusive()"""
+    if FCNTL_AVAILABLE:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,92 @@
+"""
+Aurora Archive - JSONL Tail Reader
+Read the newest records of an append-only JSONL file without scanning it
+
+Memory threads (memory/threads/{thread_id}.jsonl) only grow, and callers
+want the last few events. tail_jsonl() reads fixed-size blocks backwards
+from the end of the file and stops once it has N records, so the cost is
+O(N) whatever the file's length.
+
+A final line without its newline is a writer's append still in flight
+(or torn by a crash) and is skipped, as are lines that are not valid JSON.
+
+Python 3.10+
+Dependencies: none
+"""
+
+import json
+import os
+from typing import Dict, Iterator, List, Optional
+
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+
+def iter_lines_reverse(path, block_size: int = DEFAULT_BLOCK_SIZE, end: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Complete, non-blank lines of a file, last line first
+
+    Args:
+        path: File to read, or a binary file object (left open)
+        block_size: Bytes read per seek from the end
+        end: Treat the file as ending at this offset (default: its size)
+
+    Yields:
+        Lines without their trailing newline
+    """
+    if hasattr(path, 'read'):
+        yield from _lines_reverse(path, block_size, end)
+        return
+    with open(path, 'rb') as f:
+        yield from _lines_reverse(f, block_size, end)
+
+
+def _lines_reverse(f, block_size: int, end: Optional[int]) -> Iterator[bytes]:
+    position = f.seek(0, os.SEEK_END) if end is None else end
+    buffer = b''
+    found_end = False  # Seen the last newline (anything after it is an unfinished append)
+    while position > 0:
+        read = min(block_size, position)
+        position -= read
+        f.seek(position)
+        buffer = f.read(read) + buffer
+        lines = buffer.split(b'\n')
+        buffer = lines[0]  # May continue in the previous block
+        complete = lines[1:]
+        if not found_end and complete:
+            complete.pop()
+            found_end = True
+        for line in reversed(complete):
+            if line.strip():
+                yield line
+    if found_end and buffer.strip():
+        yield buffer  # First line of the file
+
+
+def tail_jsonl(path, n: Optional[int], block_size: int = DEFAULT_BLOCK_SIZE, end: Optional[int] = None) -> List[Dict]:
+    """
+    Last `n` records of a JSONL file, newest first
+
+    Args:
+        path: JSONL file
+        n: Records to return (None = all)
+        block_size: Bytes read per seek from the end
+        end: Read as if the file ended at this offset (default: its size)
+
+    Returns:
+        Decoded records, newest first ([] if the file is missing)
+    """
+    records = []
+    if n is not None and n <= 0:
+        return records
+    try:
+        for line in iter_lines_reverse(path, block_size, end):
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+            if n is not None and len(records) >= n:
+                break
+    except FileNotFoundError:
+        pass
+    return records
@@ -0,0 +1,283 @@
+"""
+Aurora Archive - LSB Codec
+Vectorized least-significant-bit packing shared by the steganography modules
+
+Both CardSteganography and MutableCardSteganography store the same frame:
+
+    [32-bit big-endian length header][payload bytes, 8 bits each, MSB first]
+
+written into the R, G, B least significant bits of the embed region in
+row-major order (y, then x, then channel). This module performs that packing
+with NumPy instead of per-pixel Python loops; the on-disk format is unchanged.
+
+FrameReader decodes the region lazily, a few pixels at a time, so callers can
+inspect the length header (first 11 pixels) and magic before paying for the
+rest of the region.
+
+Python 3.10+
+Dependencies: NumPy, Pillow
+"""
+
+import math
+
+import numpy as np
+from PIL import Image
+from typing import Optional, Tuple
+
+
+LENGTH_HEADER_BITS = 32
+CHANNELS = 3
+
+
+def region_shape(
+    image_size: Tuple[int, int],
+    region_size: Optional[int]
+) -> Tuple[int, int]:
+    """
+    Calculate the (height, width) of the embed region
+
+    Args:
+        image_size: Pillow (width, height) of the image
+        region_size: Side of the square top-left region, or None for the full image
+
+    Returns:
+        Tuple of (region_height, region_width)
+    """
+    width, height = image_size
+    if region_size is None:
+        return height, width
+    return min(region_size, height), min(region_size, width)
+
+
+def region_capacity_bits(image_size: Tuple[int, int], region_size: Optional[int]) -> int:
+    """Number of LSB slots available in the embed region"""
+    region_height, region_width = region_shape(image_size, region_size)
+    return region_height * region_width * CHANNELS
+
+
+def encode_bytes(frame: bytes) -> np.ndarray:
+    """Unpack bytes MSB-first into a uint8 array of 0/1 values"""
+    return np.unpackbits(np.frombuffer(frame, dtype=np.uint8))
+
+
+def encode_frame(length: int, payload: bytes) -> np.ndarray:
+    """
+    Build the v1 bit frame for a payload
+
+    Args:
+        length: Value stored in the 32-bit length header
+        payload: Raw payload bytes (magic + checksum + data)
+
+    Returns:
+        uint8 array of 0/1 values, header first
+    """
+    return encode_bytes(length.to_bytes(4, 'big') + payload)
+
+
+def region_box(
+    image_size: Tuple[int, int],
+    region_size: Optional[int]
+) -> Tuple[int, int, int, int]:
+    """Pillow crop box for the embed region"""
+    region_height, region_width = region_shape(image_size, region_size)
+    return (0, 0, region_width, region_height)
+
+
+def read_region(img: Image.Image, region_size: Optional[int]) -> np.ndarray:
+    """
+    Decode only the embed region of an image into a writable array
+
+    Args:
+        img: Pillow image (converted to RGB if needed)
+        region_size: Side of the top-left region, or None for the full image
+
+    Returns:
+        (region_height, region_width, 3) uint8 array
+    """
+    region = img.crop(region_box(img.size, region_size))
+    if region.mode != 'RGB':
+        region = region.convert('RGB')
+    return np.array(region, dtype=np.uint8)
+
+
+def write_region(img: Image.Image, region: np.ndarray) -> None:
+    """Paste a modified region array back into the top-left of an RGB image"""
+    img.paste(Image.fromarray(region, 'RGB'), (0, 0))
+
+
+def write_bits(region: np.ndarray, bits: np.ndarray, clear_region: bool = False) -> None:
+    """
+    Write bits into the LSBs of a region array in place
+
+    Args:
+        region: (height, width, 3) uint8 array, modified in place
+        bits: uint8 array of 0/1 values, row-major then channel order
+        clear_region: If True, zero every LSB in the region before writing
+
+    Raises:
+        ValueError: If the region cannot hold the bits
+    """
+    flat = region.reshape(-1)  # View: read_region() always returns a contiguous array
+
+    if bits.size > flat.size:
+        raise ValueError(f"Data requires {bits.size} bits but only {flat.size} available")
+
+    if clear_region:
+        flat &= 0xFE
+        flat[:bits.size] |= bits
+    else:
+        flat[:bits.size] = (flat[:bits.size] & 0xFE) | bits
+
+
+def read_bits(region: np.ndarray, count: Optional[int] = None) -> np.ndarray:
+    """
+    Read LSBs from a region array
+
+    Args:
+        region: (height, width, 3) uint8 array
+        count: Number of bits to read (None = whole region)
+
+    Returns:
+        uint8 array of 0/1 values
+    """
+    flat = region.reshape(-1)
+    if count is not None:
+        flat = flat[:count]
+    return flat & 1
+
+
+def embed_bits(
+    img: Image.Image,
+    bits: np.ndarray,
+    region_size: Optional[int],
+    clear_region: bool = False
+) -> None:
+    """
+    Embed a bit frame into an RGB image in place
+
+    Only the embed region is converted to an array and pasted back, so the
+    cost does not grow with the card's full resolution.
+
+    Args:
+        img: RGB Pillow image, modified in place
+        bits: Frame from encode_frame()
+        region_size: Side of the top-left region, or None for the full image
+        clear_region: If True, zero every LSB in the region before writing
+    """
+    region = read_region(img, region_size)
+    write_bits(region, bits, clear_region)
+    write_region(img, region)
+
+
+def extract_bits(
+    img: Image.Image,
+    region_size: Optional[int],
+    count: Optional[int] = None
+) -> np.ndarray:
+    """Read LSBs from the embed region of an image"""
+    return read_bits(read_region(img, region_size), count)
+
+
+def bits_to_bytes(bits: np.ndarray) -> bytes:
+    """Pack 0/1 values MSB-first into bytes, dropping any trailing partial byte"""
+    usable = bits.size - (bits.size % 8)
+    return np.packbits(bits[:usable]).tobytes()
+
+
+def decode_length(bits: np.ndarray) -> int:
+    """Decode the 32-bit big-endian length header from the start of a bitstream"""
+    return int.from_bytes(bits_to_bytes(bits[:LENGTH_HEADER_BITS]), 'big')
+
+
+class FrameReader:
+    """
+    Incremental reader for a frame embedded in an image region
+
+    Pixels are decoded on demand in row-major order, so a non-Aurora image is
+    rejected after reading only its header (and, at most, the magic) instead
+    of all 10,000 pixels of the region.
+    """
+
+    def __init__(self, img: Image.Image, region_size: Optional[int]):
+        self._img = img
+        self.region_height, self.region_width = region_shape(img.size, region_size)
+        self.capacity_bits = self.region_height * self.region_width * CHANNELS
+        self._bits = np.empty(0, dtype=np.uint8)
+        self.pixels_read = 0
+
+    def _decode_pixels(self, end: int) -> None:
+        """Decode region pixels [pixels_read, end) and append their LSBs"""
+        start = self.pixels_read
+        if end <= start:
+            return
+
+        width = self.region_width
+        first_row, first_col = divmod(start, width)
+        last_row, last_col = divmod(end, width)
+
+        boxes = []
+        if first_row == last_row:
+            boxes.append((first_col, first_row, last_col, first_row + 1))
+        else:
+            boxes.append((first_col, first_row, width, first_row + 1))
+            if last_row > first_row + 1:
+                boxes.append((0, first_row + 1, width, last_row))
+            if last_col:
+                boxes.append((0, last_row, last_col, last_row + 1))
+
+        chunks = [self._bits]
+        for box in boxes:
+            piece = self._img.crop(box)
+            if piece.mode != 'RGB':
+                piece = piece.convert('RGB')
+            chunks.append(np.asarray(piece, dtype=np.uint8).reshape(-1) & 1)
+
+        self._bits = np.concatenate(chunks)
+        self.pixels_read = end
+
+    def read_bits(self, count: int) -> np.ndarray:
+        """
+        Return the first `count` bits of the region, decoding more pixels if needed
+
+        Raises:
+            ValueError: If the region holds fewer than `count` bits
+        """
+        if count > self.capacity_bits:
+            raise ValueError(f"Requested {count} bits but region holds {self.capacity_bits}")
+        self._decode_pixels(math.ceil(count / CHANNELS))
+        return self._bits[:count]
+
+    def read_length(self) -> int:
+        """Decode the 32-bit length header (first 11 pixels)"""
+        return decode_length(self.read_bits(LENGTH_HEADER_BITS))
+
+    def read_bytes(self, end: int, start: int = 0) -> bytes:
+        """Decode frame bytes [start, end) counted from the first region bit"""
+        bits = self.read_bits(end * 8)
+        return bits_to_bytes(bits[start * 8:])
+
+    def bytes_available(self) -> int:
+        """Number of whole bytes the region can hold"""
+        return self.capacity_bits // 8
+
+    def read_payload(self, end: int, start: int = 0) -> bytes:
+        """Decode payload bytes [start, end) that follow the length header"""
+        bits = self.read_bits(LENGTH_HEADER_BITS + end * 8)
+        return bits_to_bytes(bits[LENGTH_HEADER_BITS + start * 8:])
+
+    def payload_bytes_available(self) -> int:
+        """Number of whole payload bytes the region can hold after the header"""
+        return max(0, self.capacity_bits - LENGTH_HEADER_BITS) // 8
+
+    def payload_startswith(self, prefix: bytes, step: int = 4) -> bool:
+        """
+        Check the payload prefix a few bytes at a time
+
+        A mismatch on the first `step` bytes stops after ~22 pixels.
+        """
+        available = self.payload_bytes_available()
+        for start in range(0, len(prefix), step):
+            end = min(start + step, len(prefix))
+            if end > available or self.read_payload(end, start) != prefix[start:end]:
+                return False
+        return True
@@ -0,0 +1,145 @@
+"""
+Aurora Archive - Lazy Member Cache
+LRU of hot member records over a member store, standing in for
+DatabaseManager.members when members are loaded on demand
+
+    members[member_id]   cache hit, else one store read (then cached)
+    members.values()     streams every member from the store
+
+Records with uncommitted changes are pinned (never evicted), and
+uncommitted deletions hide the stored record, so the cache always shows
+what the next commit will write. DatabaseManager passes its own dirty and
+deleted sets for this.
+
+Python 3.10+
+Dependencies: none
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from member_store import MemberStore
+
+
+DEFAULT_CAPACITY = 10000
+
+
+class MemberCache:
+    """Dict-like view of the member store with an LRU of loaded records"""
+
+    def __init__(
+        self,
+        store: MemberStore,
+        capacity: int = DEFAULT_CAPACITY,
+        pinned: Optional[Set[str]] = None,
+        deleted: Optional[Set[str]] = None
+    ):
+        """
+        Args:
+            store: Store supporting on-demand reads (supports_lazy)
+            capacity: Records kept in memory (pinned records may exceed it)
+            pinned: member_ids that must stay cached (uncommitted changes)
+            deleted: member_ids deleted but not yet committed
+        """
+        self.store = store
+        self.capacity = capacity
+        self.pinned = pinned if pinned is not None else set()
+        self.deleted = deleted if deleted is not None else set()
+        self._lock = threading.RLock()
+        self._records: "OrderedDict[str, Dict]" = OrderedDict()
+
+        # Diagnostics
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, member_id: Optional[str], default=None) -> Optional[Dict]:
+        if not member_id or member_id in self.deleted:
+            return default
+        with self._lock:
+            record = self._records.get(member_id)
+            if record is not None:
+                self._records.move_to_end(member_id)
+                self.hits += 1
+                return record
+            self.misses += 1
+            record = self.store.get(member_id)
+            if record is None:
+                return default
+            self._insert(member_id, record)
+            return record
+
+    def __getitem__(self, member_id: str) -> Dict:
+        record = self.get(member_id)
+        if record is None:
+            raise KeyError(member_id)
+        return record
+
+    def __contains__(self, member_id) -> bool:
+        return self.get(member_id) is not None
+
+    def __setitem__(self, member_id: str, record: Dict):
+        with self._lock:
+            self._insert(member_id, record)
+
+    def __delitem__(self, member_id: str):
+        with self._lock:
+            self._records.pop(member_id, None)
+
+    def _insert(self, member_id: str, record: Dict):
+        self._records[member_id] = record
+        self._records.move_to_end(member_id)
+        # Evict least recently used, skipping records with pending writes and
+        # the one just inserted (a caller assigning a record pins it next)
+        for _ in range(len(self._records)):
+            if len(self._records) <= self.capacity:
+                break
+            oldest, oldest_record = self._records.popitem(last=False)
+            if oldest in self.pinned or oldest == member_id:
+                self._records[oldest] = oldest_record
+
+    def cached(self, member_id: str) -> bool:
+        """True if the record is in memory (no store read)"""
+        with self._lock:
+            return member_id in self._records
+
+    def replace(self, member_id: str, record: Dict):
+        """Swap in a newer version of a cached record (uncached records are left to load later)"""
+        with self._lock:
+            if member_id in self._records:
+                self._records[member_id] = record
+
+    def items(self) -> Iterator[Tuple[str, Dict]]:
+        """Stream every member; cached records (possibly uncommitted) win over stored ones"""
+        with self._lock:
+            unstored = {member_id: self._records[member_id] for member_id in self.pinned if member_id in self._records}
+        for member_id, record in self.store.iter_all():
+            if member_id in self.deleted:
+                continue
+            unstored.pop(member_id, None)
+            with self._lock:
+                record = self._records.get(member_id, record)
+            yield member_id, record
+        yield from unstored.items()  # Added but not yet committed
+
+    def values(self) -> Iterator[Dict]:
+        for _, record in self.items():
+            yield record
+
+    def __iter__(self) -> Iterator[str]:
+        for member_id, _ in self.items():
+            yield member_id
+
+    def __len__(self) -> int:
+        """Stored members, adjusted for uncommitted adds and deletes"""
+        with self._lock:
+            pending = [member_id for member_id in self.pinned if member_id in self._records]
+        added = sum(1 for member_id in pending if self.store.get(member_id) is None)
+        return self.store.count() + added - len(self.deleted)
+
+    def clear(self):
+        """Drop every unpinned record"""
+        with self._lock:
+            for member_id in list(self._records):
+                if member_id not in self.pinned:
+                    del self._records[member_id]
@@ -0,0 +1,142 @@
+"""
+Aurora Archive - Member Indexes
+In-memory secondary indexes over DatabaseManager.members
+
+    email        -> member_ids   (Google login lookup)
+    thread_id    -> member_ids   (memory thread owner lookup)
+    access_tier  -> member_ids
+    (access_tier, memory_sharing_mode) -> member_ids   (pooled sharing)
+
+Each member's indexed keys are remembered, so re-indexing after an update
+removes exactly the stale entries. Email and thread lists keep insertion
+order, matching the first-match semantics of the old linear scans.
+
+Python 3.10+
+Dependencies: none
+"""
+
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+
+def normalize_email(email: Optional[str]) -> str:
+    """Lowercased, stripped email ('' for None)"""
+    return (email or '').lower().strip()
+
+
+def member_keys(member: Dict) -> Tuple:
+    """Indexed fields of a member: (email, thread_id, access_tier, memory_sharing_mode)"""
+    return (
+        normalize_email(member.get('email')),
+        member.get('thread_id'),
+        member.get('access_tier'),
+        member.get('memory_sharing_mode', 'isolated'),
+    )
+
+
+def pool_tier(member: Dict) -> int:
+    """Tier whose pooled members a pooled member reads (pooled_tier, else access_tier)"""
+    return member.get('pooled_tier') or member.get('access_tier', 1)
+
+
+class MemberIndex:
+    """Secondary indexes kept consistent through add, update and delete"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: Dict[str, Tuple] = {}  # member_id -> (email, thread_id, tier, mode)
+        self.by_email: Dict[str, List[str]] = {}
+        self.by_thread: Dict[str, List[str]] = {}
+        self.by_tier: Dict[int, Set[str]] = {}
+        self.by_tier_mode: Dict[Tuple[int, str], Set[str]] = {}
+
+    def rebuild(self, members: Dict[str, Dict]):
+        """Index every member from scratch"""
+        with self._lock:
+            self._keys.clear()
+            self.by_email.clear()
+            self.by_thread.clear()
+            self.by_tier.clear()
+            self.by_tier_mode.clear()
+            for member_id, member in members.items():
+                self._add(member_id, member_keys(member))
+
+    def update(self, member_id: str, member: Dict):
+        """(Re-)index one member after it was added or changed"""
+        keys = member_keys(member)
+        with self._lock:
+            old_keys = self._keys.get(member_id)
+            if old_keys == keys:
+                return
+            if old_keys is not None:
+                self._remove(member_id, old_keys)
+            self._add(member_id, keys)
+
+    def remove(self, member_id: str):
+        """Drop a deleted member"""
+        with self._lock:
+            old_keys = self._keys.get(member_id)
+            if old_keys is not None:
+                self._remove(member_id, old_keys)
+
+    def _add(self, member_id: str, keys: Tuple):
+        email, thread_id, tier, mode = keys
+        self._keys[member_id] = keys
+        if email:
+            self.by_email.setdefault(email, []).append(member_id)
+        if thread_id:
+            self.by_thread.setdefault(thread_id, []).append(member_id)
+        self.by_tier.setdefault(tier, set()).add(member_id)
+        self.by_tier_mode.setdefault((tier, mode), set()).add(member_id)
+
+    def _remove(self, member_id: str, keys: Tuple):
+        email, thread_id, tier, mode = keys
+        del self._keys[member_id]
+        if email:
+            self._discard_list(self.by_email, email, member_id)
+        if thread_id:
+            self._discard_list(self.by_thread, thread_id, member_id)
+        self._discard_set(self.by_tier, tier, member_id)
+        self._discard_set(self.by_tier_mode, (tier, mode), member_id)
+
+    @staticmethod
+    def _discard_list(index: Dict, key, member_id: str):
+        ids = index.get(key)
+        if ids and member_id in ids:
+            ids.remove(member_id)
+            if not ids:
+                del index[key]
+
+    @staticmethod
+    def _discard_set(index: Dict, key, member_id: str):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(member_id)
+            if not ids:
+                del index[key]
+
+    def member_id_for_email(self, email: str) -> Optional[str]:
+        with self._lock:
+            ids = self.by_email.get(normalize_email(email))
+            return ids[0] if ids else None
+
+    def member_id_for_thread(self, thread_id: str) -> Optional[str]:
+        with self._lock:
+            ids = self.by_thread.get(thread_id)
+            return ids[0] if ids else None
+
+    def member_ids_for_tier(self, tier: int, mode: Optional[str] = None) -> Set[str]:
+        """Members at a tier, optionally restricted to one sharing mode (copy)"""
+        with self._lock:
+            if mode is None:
+                return set(self.by_tier.get(tier, ()))
+            return set(self.by_tier_mode.get((tier, mode), ()))
+
+    def member_ids_for_mode(self, mode: str) -> Set[str]:
+        """Members with a sharing mode, at any tier (copy)"""
+        with self._lock:
+            return {
+                member_id
+                for (_, member_mode), ids in self.by_tier_mode.items() if member_mode == mode
+                for member_id in ids
+            }
@@ -1074,7 +1074,7 @@ class MemberManagerGUI(QMainWindow):
     def load_members(self):
         """Load all members into table"""
         try:
-            members = self.db.get_all_members()
+            members = list(self.db.get_all_members())
             
             self.members_table.setRowCount(len(members))
             
@@ -0,0 +1,686 @@
+"""
+Aurora Archive - Member Store
+Storage engines behind DatabaseManager's member records
+
+Each backend persists one member per write, so adding or updating a member
+costs O(1) I/O instead of rewriting every member:
+
+    sqlite  SQLite in WAL mode, one row per member (default)
+    log     Append-only JSONL operation log, compacted when mostly garbage
+    json    Legacy full rewrite of members_database.json + .jsonl
+
+The legacy JSON pair is still produced on demand by
+DatabaseManager.export_members_json(), and an existing members_database.json
+is imported once into a new store, which then records legacy_imported in
+its metadata so members deleted later are not imported again.
+
+Several processes may open the same store. poll() returns only the records
+other processes changed since this instance last looked (a generation
+counter for sqlite, the log offset for log, the file stamp for json), so a
+DatabaseManager can refresh its cache without reloading every member.
+Writers coordinate through DatabaseManager's inter-process lock.
+
+The sqlite backend can also serve records on demand (get, iter_all, and
+find_ids over indexed email / thread_id / tier columns), so a lazy
+DatabaseManager never reads every member at startup.
+
+Python 3.10+
+Dependencies: none (sqlite3 is in the standard library)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from atomic_store import atomic_open, atomic_write_json
+from member_index import member_keys, normalize_email
+
+
+BACKENDS = ("sqlite", "log", "json")
+DEFAULT_BACKEND = "sqlite"
+
+
+class PollExpired(Exception):
+    """poll() can no longer list every change since the caller last looked; reload all"""
+    pass
+
+
+class MemberStore:
+    """
+    Interface shared by the member storage backends
+
+    Records are member dicts keyed by member_id. Implementations must be
+    safe to call from several threads (the Flask API is threaded).
+    """
+
+    # Backends that implement the on-demand reads (get, iter_all, count,
+    # find_ids, mark_loaded) set this
+    supports_lazy = False
+
+    def load_all(self) -> Dict[str, Dict]:
+        """Read every member record"""
+        raise NotImplementedError
+
+    def put(self, member_id: str, data: Dict):
+        """Insert or replace one member record"""
+        raise NotImplementedError
+
+    def put_many(self, members: Dict[str, Dict]):
+        """Insert or replace several member records"""
+        for member_id, data in members.items():
+            self.put(member_id, data)
+
+    def delete(self, member_id: str):
+        """Remove one member record (no error if missing)"""
+        raise NotImplementedError
+
+    def apply(self, puts: Dict[str, Dict], deletes: Iterable[str] = ()):
+        """Write several puts and deletes as one commit"""
+        self.put_many(puts)
+        for member_id in deletes:
+            self.delete(member_id)
+
+    def poll(self) -> Tuple[Dict[str, Dict], Set[str]]:
+        """
+        Records other processes changed since the last load_all(), poll() or write
+
+        Returns:
+            (member_id -> current data, deleted member_ids)
+
+        Raises:
+            PollExpired: The deletions since then were pruned; call
+                load_all() (or mark_loaded() and re-read on demand)
+        """
+        return {}, set()
+
+    def is_empty(self) -> bool:
+        """True if the store holds no members"""
+        raise NotImplementedError
+
+    def metadata(self) -> Dict:
+        """Store-level metadata (created, last_updated, legacy_imported)"""
+        raise NotImplementedError
+
+    def set_metadata(self, key: str, value: str):
+        """Persist one store-level metadata value"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release files and connections"""
+        pass
+
+
+class SQLiteMemberStore(MemberStore):
+    """
+    One row per member in a WAL-mode SQLite database
+
+    Every commit bumps meta.generation and stamps the rows it wrote (and a
+    tombstone per delete) with it, so poll() selects just the rows newer
+    than the generation this connection last saw.
+
+    Tombstones are kept for the last TOMBSTONE_GENERATIONS commits; every
+    TOMBSTONE_PRUNE_EVERY commits older ones are deleted and
+    meta.tombstones_pruned records the cut. A reader that last looked
+    before the cut gets PollExpired from poll() and reloads.
+
+    Each row also carries the member's email, thread_id, access_tier and
+    sharing mode in indexed columns for find_ids().
+    """
+
+    supports_lazy = True
+    KEY_COLUMNS = ("email", "thread_id", "access_tier", "sharing_mode")
+    TOMBSTONE_GENERATIONS = 10000
+    TOMBSTONE_PRUNE_EVERY = 500
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._seen = 0  # Last generation reflected in our caller's cache
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints; safe under WAL
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")  # Another process may be creating the schema
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS members ("
+                "member_id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at TEXT NOT NULL, "
+                "generation INTEGER NOT NULL DEFAULT 0)"
+            )
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(members)")]
+            if "generation" not in columns:
+                self._conn.execute("ALTER TABLE members ADD COLUMN generation INTEGER NOT NULL DEFAULT 0")
+            if "email" not in columns:
+                self._add_key_columns()
+            self._conn.execute("CREATE INDEX IF NOT EXISTS members_generation ON members (generation)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS members_email ON members (email)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS members_thread ON members (thread_id)")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS members_tier ON members (access_tier, sharing_mode)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS members_sharing ON members (sharing_mode)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS deleted_members ("
+                "member_id TEXT PRIMARY KEY, generation INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('created', ?)",
+                (datetime.now().isoformat(),)
+            )
+            self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', '0')")
+
+    def _add_key_columns(self):
+        """Add the lookup columns and fill them from existing rows (one-time migration)"""
+        for column in self.KEY_COLUMNS:
+            self._conn.execute(f"ALTER TABLE members ADD COLUMN {column}")
+        rows = self._conn.execute("SELECT member_id, data FROM members").fetchall()
+        self._conn.executemany(
+            "UPDATE members SET email = ?, thread_id = ?, access_tier = ?, sharing_mode = ? "
+            "WHERE member_id = ?",
+            [(*member_keys(json.loads(data)), member_id) for member_id, data in rows]
+        )
+
+    def _generation(self) -> int:
+        return int(self._meta_value("generation", 0))
+
+    def _meta_value(self, key: str, default=None) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def load_all(self) -> Dict[str, Dict]:
+        with self._lock:
+            self._seen = self._generation()
+            rows = self._conn.execute("SELECT member_id, data FROM members").fetchall()
+        return {member_id: json.loads(data) for member_id, data in rows}
+
+    def poll(self) -> Tuple[Dict[str, Dict], Set[str]]:
+        with self._lock:
+            generation = self._generation()
+            if generation == self._seen:
+                return {}, set()
+            if self._seen < int(self._meta_value("tombstones_pruned", 0)):
+                raise PollExpired(f"Tombstones before generation {self._seen} were pruned")
+            rows = self._conn.execute(
+                "SELECT member_id, data FROM members WHERE generation > ?", (self._seen,)
+            ).fetchall()
+            deleted = self._conn.execute(
+                "SELECT member_id FROM deleted_members WHERE generation > ?", (self._seen,)
+            ).fetchall()
+            self._seen = generation
+        return {member_id: json.loads(data) for member_id, data in rows}, {row[0] for row in deleted}
+
+    def put(self, member_id: str, data: Dict):
+        self.apply({member_id: data})
+
+    def put_many(self, members: Dict[str, Dict]):
+        self.apply(members)
+
+    def apply(self, puts: Dict[str, Dict], deletes: Iterable[str] = ()):
+        now = datetime.now().isoformat()
+        payloads = [
+            (member_id, json.dumps(data, ensure_ascii=False), *member_keys(data))
+            for member_id, data in puts.items()
+        ]
+        deletes = [(member_id,) for member_id in deletes]
+        with self._lock:
+            with self._conn:  # One transaction, one WAL commit
+                self._conn.execute("BEGIN IMMEDIATE")
+                generation = self._generation() + 1
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO members (member_id, data, updated_at, generation, "
+                    "email, thread_id, access_tier, sharing_mode) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(member_id, payload, now, generation, *keys) for member_id, payload, *keys in payloads]
+                )
+                self._conn.executemany(
+                    "DELETE FROM deleted_members WHERE member_id = ?",
+                    [(member_id,) for member_id, *_ in payloads]
+                )
+                self._conn.executemany("DELETE FROM members WHERE member_id = ?", deletes)
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO deleted_members (member_id, generation) VALUES (?, ?)",
+                    [(member_id, generation) for (member_id,) in deletes]
+                )
+                if generation % self.TOMBSTONE_PRUNE_EVERY == 0 and generation > self.TOMBSTONE_GENERATIONS:
+                    self._prune_tombstones(generation - self.TOMBSTONE_GENERATIONS)
+                self._set_meta("last_updated", now)
+                self._set_meta("generation", str(generation))
+            if self._seen == generation - 1:
+                self._seen = generation  # Nobody else committed in between
+
+    def delete(self, member_id: str):
+        self.apply({}, [member_id])
+
+    def _prune_tombstones(self, through: int):
+        """Delete tombstones up to a generation (in the caller's transaction)"""
+        self._conn.execute("DELETE FROM deleted_members WHERE generation <= ?", (through,))
+        self._set_meta("tombstones_pruned", str(through))
+
+    def get(self, member_id: str) -> Optional[Dict]:
+        """Read one member record (None if missing)"""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM members WHERE member_id = ?", (member_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_all(self, batch_size: int = 500) -> Iterator[Tuple[str, Dict]]:
+        """Stream (member_id, data) in member_id order, `batch_size` rows per query"""
+        after = ''
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT member_id, data FROM members WHERE member_id > ? ORDER BY member_id LIMIT ?",
+                    (after, batch_size)
+                ).fetchall()
+            for member_id, data in rows:
+                yield member_id, json.loads(data)
+            if len(rows) < batch_size:
+                return
+            after = rows[-1][0]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM members").fetchone()[0]
+
+    def find_ids(
+        self,
+        email: Optional[str] = None,
+        thread_id: Optional[str] = None,
+        tier: Optional[int] = None,
+        mode: Optional[str] = None
+    ) -> List[str]:
+        """
+        member_ids matching every given key, oldest row first
+
+        Args:
+            email: Email (normalized like MemberIndex)
+            thread_id: Memory thread id
+            tier: access_tier
+            mode: memory_sharing_mode (with tier)
+        """
+        clauses, params = [], []
+        for column, value in (("email", normalize_email(email) if email is not None else None),
+                              ("thread_id", thread_id), ("access_tier", tier), ("sharing_mode", mode)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if not clauses:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT member_id FROM members WHERE {' AND '.join(clauses)} ORDER BY rowid", params
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def mark_loaded(self):
+        """Start poll() from now, as if load_all() had just run (for on-demand callers)"""
+        with self._lock:
+            self._seen = self._generation()
+
+    def _set_meta(self, key: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM members LIMIT 1").fetchone() is None
+
+    def metadata(self) -> Dict:
+        with self._lock:
+            meta = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+        meta.pop("generation", None)
+        meta.pop("tombstones_pruned", None)
+        return meta
+
+    def set_metadata(self, key: str, value: str):
+        with self._lock:
+            with self._conn:
+                self._set_meta(key, value)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class AppendLogMemberStore(MemberStore):
+    """
+    Append-only JSONL log of member operations
+
+    Each line is {"op": "put", "member_id": ..., "data": {...}} or
+    {"op": "delete", "member_id": ...}. Replaying the log rebuilds the
+    members; once superseded lines outnumber live members by
+    `compact_ratio`, the log is rewritten with one line per member.
+
+    The byte offset replayed so far is tracked, so records appended by
+    other processes are read incrementally; a compaction elsewhere (new
+    inode) triggers a full replay and reopen.
+    """
+
+    def __init__(self, log_path: Path, compact_ratio: float = 4.0, compact_min_records: int = 1000):
+        self.log_path = Path(log_path)
+        self.compact_ratio = compact_ratio
+        self.compact_min_records = compact_min_records
+        self._lock = threading.Lock()
+        self._members: Dict[str, Dict] = {}
+        self._meta = {"created": datetime.now().isoformat()}
+        self._records = 0
+        self._offset = 0  # Bytes of complete lines applied
+        self._torn = False  # Log ends in an incomplete line
+        self._ino = None
+        self._unreported: Set[str] = set()  # Changed by other processes, not yet polled
+        is_new = not self.log_path.exists()
+        self._replay()
+        self._open()
+        if is_new:
+            self._write([{"op": "meta", "data": self._meta}])
+
+    def _replay(self):
+        """Rebuild the members from the whole log"""
+        self._members = {}
+        self._records = 0
+        self._offset = 0
+        if self.log_path.exists():
+            self._read_new()
+
+    def _read_new(self) -> Set[str]:
+        """Apply complete lines past the current offset; returns touched member_ids"""
+        touched = set()
+        self._torn = False
+        with open(self.log_path, 'rb') as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    self._torn = True  # Mid-append elsewhere, or torn by a crash
+                    break
+                self._offset += len(line)
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self._apply(record)
+                self._records += 1
+                if "member_id" in record:
+                    touched.add(record["member_id"])
+        return touched
+
+    def _open(self):
+        self._file = open(self.log_path, 'ab')
+        self._ino = os.fstat(self._file.fileno()).st_ino
+
+    def _catch_up(self):
+        """Apply what other processes appended, or replay after their compaction"""
+        try:
+            stat = os.stat(self.log_path)
+        except FileNotFoundError:
+            return
+        if stat.st_ino != self._ino:
+            old_members = self._members
+            self._file.close()
+            self._replay()
+            self._open()
+            self._unreported |= {
+                member_id for member_id in old_members.keys() | self._members.keys()
+                if old_members.get(member_id) != self._members.get(member_id)
+            }
+        elif stat.st_size > self._offset:
+            self._unreported |= self._read_new()
+
+    def _apply(self, record: Dict):
+        op = record.get("op")
+        if op == "put":
+            self._members[record["member_id"]] = record["data"]
+        elif op == "delete":
+            self._members.pop(record["member_id"], None)
+        elif op == "meta":
+            self._meta.update(record["data"])
+        if "ts" in record:
+            self._meta["last_updated"] = record["ts"]
+
+    def _write(self, records: List[Dict]):
+        """Append already-applied records as one write"""
+        lines = [b'\n'] if self._torn else []  # Terminate a torn tail first
+        lines += [(json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8') for record in records]
+        self._file.write(b''.join(lines))
+        self._file.flush()
+        self._offset = self._file.tell()
+        self._torn = False
+        self._records += len(records)
+
+    def _append(self, *records: Dict):
+        """Apply and append records, then flush once"""
+        self._catch_up()
+        ts = datetime.now().isoformat()
+        for record in records:
+            record["ts"] = ts
+            self._apply(record)
+        self._write(records)
+        if self._records > max(self.compact_min_records, self.compact_ratio * len(self._members)):
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the log with one put per live member"""
+        self._file.close()
+        try:
+            with atomic_open(self.log_path, 'w') as f:
+                f.write(json.dumps({"op": "meta", "data": self._meta}, ensure_ascii=False) + '\n')
+                for member_id, data in self._members.items():
+                    f.write(json.dumps({"op": "put", "member_id": member_id, "data": data}, ensure_ascii=False) + '\n')
+            self._records = len(self._members) + 1
+        finally:
+            self._open()
+            self._offset = os.fstat(self._file.fileno()).st_size
+            self._torn = False
+
+    def load_all(self) -> Dict[str, Dict]:
+        with self._lock:
+            self._catch_up()
+            self._unreported.clear()
+            # Round-trip so callers never share dicts with the replay state
+            return json.loads(json.dumps(self._members))
+
+    def poll(self) -> Tuple[Dict[str, Dict], Set[str]]:
+        with self._lock:
+            self._catch_up()
+            touched, self._unreported = self._unreported, set()
+            puts = json.loads(json.dumps({
+                member_id: self._members[member_id] for member_id in touched if member_id in self._members
+            }))
+        return puts, touched - puts.keys()
+
+    def put(self, member_id: str, data: Dict):
+        with self._lock:
+            self._append({"op": "put", "member_id": member_id, "data": json.loads(json.dumps(data))})
+
+    def delete(self, member_id: str):
+        with self._lock:
+            self._append({"op": "delete", "member_id": member_id})
+
+    def put_many(self, members: Dict[str, Dict]):
+        self.apply(members)
+
+    def apply(self, puts: Dict[str, Dict], deletes: Iterable[str] = ()):
+        records = [
+            {"op": "put", "member_id": member_id, "data": json.loads(json.dumps(data))}
+            for member_id, data in puts.items()
+        ]
+        records += [{"op": "delete", "member_id": member_id} for member_id in deletes]
+        if records:
+            with self._lock:
+                self._append(*records)
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return not self._members
+
+    def metadata(self) -> Dict:
+        with self._lock:
+            return dict(self._meta)
+
+    def set_metadata(self, key: str, value: str):
+        with self._lock:
+            self._append({"op": "meta", "data": {key: value}})
+
+    def compact(self):
+        """Force a compaction now"""
+        with self._lock:
+            self._compact()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class JsonMemberStore(MemberStore):
+    """
+    Legacy backend: rewrites members_database.json and .jsonl on every write
+
+    Kept for deployments that read the JSON files directly; each write is
+    O(all members). Changes by other processes are noticed from the file's
+    (inode, mtime, size) stamp and found by diffing the reloaded members.
+    """
+
+    def __init__(self, json_path: Path, jsonl_path: Path):
+        self.json_path = Path(json_path)
+        self.jsonl_path = Path(jsonl_path)
+        self._lock = threading.Lock()
+        self._members: Dict[str, Dict] = {}
+        self._meta = {"created": datetime.now().isoformat()}
+        self._stamp = None
+        self._unreported: Set[str] = set()
+        self._load()
+
+    def _file_stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.json_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _load(self):
+        self._stamp = self._file_stamp()
+        if self._stamp is None:
+            return
+        with open(self.json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self._members = data.get('members', {})
+        self._meta.update({
+            k: v for k, v in data.get('metadata', {}).items() if k in ('created', 'last_updated')
+        })
+
+    def _catch_up(self):
+        """Reload if another process rewrote the file, noting which members differ"""
+        if self._file_stamp() == self._stamp:
+            return
+        old_members = self._members
+        self._load()
+        self._unreported |= {
+            member_id for member_id in old_members.keys() | self._members.keys()
+            if old_members.get(member_id) != self._members.get(member_id)
+        }
+
+    def load_all(self) -> Dict[str, Dict]:
+        with self._lock:
+            self._catch_up()
+            self._unreported.clear()
+            return json.loads(json.dumps(self._members))
+
+    def poll(self) -> Tuple[Dict[str, Dict], Set[str]]:
+        with self._lock:
+            self._catch_up()
+            touched, self._unreported = self._unreported, set()
+            puts = json.loads(json.dumps({
+                member_id: self._members[member_id] for member_id in touched if member_id in self._members
+            }))
+        return puts, touched - puts.keys()
+
+    def put(self, member_id: str, data: Dict):
+        self.apply({member_id: data})
+
+    def put_many(self, members: Dict[str, Dict]):
+        self.apply(members)
+
+    def apply(self, puts: Dict[str, Dict], deletes: Iterable[str] = ()):
+        with self._lock:
+            self._catch_up()
+            self._members.update(json.loads(json.dumps(puts)))
+            for member_id in deletes:
+                self._members.pop(member_id, None)
+            self._write()
+
+    def delete(self, member_id: str):
+        self.apply({}, [member_id])
+
+    def _write(self):
+        self._meta["last_updated"] = datetime.now().isoformat()
+        write_members_json(self.json_path, self.jsonl_path, self._members, self._meta)
+        self._stamp = self._file_stamp()
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return not self._members
+
+    def metadata(self) -> Dict:
+        with self._lock:
+            # The legacy JSON is this backend's own file; there is never anything to import
+            return {**self._meta, "legacy_imported": self._meta.get("created", "")}
+
+    def set_metadata(self, key: str, value: str):
+        with self._lock:
+            self._meta[key] = value  # Only created / last_updated are kept in the file
+
+
+def write_members_json(json_path: Path, jsonl_path: Path, members: Dict[str, Dict], meta: Dict):
+    """
+    Write the legacy members_database.json (indent=2) and one-member-per-line .jsonl
+
+    Args:
+        json_path: members_database.json path
+        jsonl_path: members_database.jsonl path
+        members: member_id -> member dict
+        meta: Store metadata (created, last_updated)
+    """
+    data = {
+        "metadata": {
+            "created": meta.get("created", datetime.now().isoformat()),
+            "version": "1.0",
+            "total_members": len(members),
+            "last_updated": meta.get("last_updated", datetime.now().isoformat())
+        },
+        "members": members
+    }
+
+    atomic_write_json(json_path, data, indent=2, ensure_ascii=False)
+
+    with atomic_open(jsonl_path, 'w') as f:
+        for member_id, member_data in members.items():
+            entry = {"member_id": member_id, **member_data}
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def open_member_store(data_dir: Path, backend: Optional[str] = None) -> MemberStore:
+    """
+    Open the member store for a data directory
+
+    Args:
+        data_dir: DatabaseManager data directory
+        backend: 'sqlite', 'log' or 'json' (default: $AURORA_DB_BACKEND, else 'sqlite')
+
+    Returns:
+        MemberStore instance
+    """
+    backend = backend or os.getenv('AURORA_DB_BACKEND', DEFAULT_BACKEND)
+    data_dir = Path(data_dir)
+
+    if backend == "sqlite":
+        return SQLiteMemberStore(data_dir / "members.sqlite3")
+    if backend == "log":
+        return AppendLogMemberStore(data_dir / "members.log.jsonl")
+    if backend == "json":
+        return JsonMemberStore(data_dir / "members_database.json", data_dir / "members_database.jsonl")
+    raise ValueError(f"Unknown member store backend '{backend}' (choose from {', '.join(BACKENDS)})")
@@ -19,12 +19,13 @@ from pathlib import Path
 from typing import Dict, List, Optional
 import sys
 import os
+import threading
 from functools import wraps
 
 # Add Aurora directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from user_memory_bridge import UserMemoryBridge
+from user_memory_bridge import UserMemoryBridge, get_shared_views, get_thread_compactor
 from database_manager import get_database
 from session_manager import SessionManager
 from admin_analytics import AdminAnalytics
@@ -47,6 +48,18 @@ db = get_database()
 # Initialize admin analytics
 admin_analytics = AdminAnalytics(db)
 
+# Seal growing memory threads into segments and compress cold ones
+get_thread_compactor().start()
+
+# Keep pooled / trusted shared context views in step with sharing changes
+db.add_sharing_listener(lambda member_ids: get_shared_views().refresh_members(db, member_ids))
+# Catch up with sharing changes made while the server was down. Reads only
+# use a view whose member threads match exactly, so until this finishes
+# they merge the threads instead
+threading.Thread(
+    target=get_shared_views().refresh_all, args=(db,), name="aurora-views-refresh", daemon=True
+).start()
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # ADMIN CHECK - Verify user has admin privileges
@@ -157,6 +170,20 @@ def health_check():
     })
 
 
+def event_error(event) -> Optional[str]:
+    """Why a store_batch event cannot be stored (None if it can)"""
+    if not isinstance(event, dict):
+        return "must be an object"
+    if not event.get('role'):
+        return "role is required"
+    if not event.get('content'):
+        return "content is required"
+    for field in ('emotion_state', 'metadata'):
+        if event.get(field) is not None and not isinstance(event[field], dict):
+            return f"{field} must be an object"
+    return None
+
+
 @app.route('/api/memory/store', methods=['POST'])
 @require_auth
 def store_event():
@@ -218,6 +245,113 @@ def store_event():
         return jsonify({"error": str(e)}), 500
 
 
+# Largest batch /api/memory/store_batch accepts
+MAX_BATCH_EVENTS = int(os.getenv('AURORA_MEMORY_MAX_BATCH', 100))
+
+
+@app.route('/api/memory/store_batch', methods=['POST'])
+@require_auth
+def store_event_batch():
+    """
+    Store several conversation events with one request (requires JWT auth)
+
+    AuroraMemoryClient buffers storeEvent() calls and sends them here, so a
+    user/assistant turn costs one request, one JWT check and one file append.
+    Events are validated one by one: invalid ones are rejected and the rest
+    stored (400 only if none is valid). Batches flushed as a page unloads
+    are sent concurrently and may arrive out of order; each stored event's
+    metadata keeps the batch's client-side `sequence` as batch_sequence so
+    the send order can be restored.
+
+    Request JSON:
+    {
+        "source": "edrive|oracle|redverse",   // default for events without one
+        "sequence": 12,                       // optional, per client, increasing
+        "events": [
+            {"role": "user", "content": "...", "emotion_state": {...}, "metadata": {}},
+            ...
+        ]
+    }
+
+    Response:
+    {
+        "success": true,
+        "stored": 2,
+        "event_ids": ["uuid1", null, "uuid3"],   // by position; null = rejected
+        "rejected": [{"index": 1, "error": "content is required"}]
+    }
+
+    Note: thread_id and access_tier come from JWT, not request body
+    """
+    try:
+        data = request.json or {}
+        events = data.get('events')
+
+        if not isinstance(events, list) or not events:
+            return jsonify({"error": "events must be a non-empty list"}), 400
+        if len(events) > MAX_BATCH_EVENTS:
+            return jsonify({"error": f"at most {MAX_BATCH_EVENTS} events per batch"}), 413
+
+        # One bad event must not drop the rest of the batch
+        rejected = []
+        valid = []
+        for position, event in enumerate(events):
+            error = event_error(event)
+            if error:
+                rejected.append({"index": position, "error": error})
+            else:
+                valid.append(position)
+        if not valid:
+            return jsonify({"error": "no valid events", "rejected": rejected}), 400
+
+        # Use JWT-provided values (guaranteed by @require_auth)
+        thread_id = request.thread_id
+        access_tier = request.access_tier
+        member_id = request.member_id
+        source = data.get('source', 'edrive')
+        sequence = data.get('sequence')
+        if not isinstance(sequence, int) or isinstance(sequence, bool):
+            sequence = None
+
+        def metadata(event: Dict) -> Optional[Dict]:
+            if sequence is None:
+                return event.get('metadata')
+            return dict(event.get('metadata') or {}, batch_sequence=sequence)
+
+        logger.info(f"[MEMORY] Storing {len(valid)} events for {member_id} (tier {access_tier})"
+                    + (f", {len(rejected)} rejected" if rejected else ""))
+
+        bridge = get_user_bridge(thread_id, access_tier, source)
+        stored = bridge.store_user_events([
+            {
+                "role": events[position]['role'],
+                "content": events[position]['content'],
+                "source": events[position].get('source', source),
+                "emotion_state": events[position].get('emotion_state'),
+                "metadata": metadata(events[position])
+            }
+            for position in valid
+        ])
+        if not stored:
+            return jsonify({"error": "Failed to store events"}), 500
+
+        event_ids = [None] * len(events)
+        for position, event in zip(valid, stored):
+            event_ids[position] = event['event_id']
+        return jsonify({
+            "success": True,
+            "stored": len(stored),
+            "event_ids": event_ids,
+            "rejected": rejected,
+            "member_id": member_id,
+            "thread_id": thread_id
+        })
+
+    except Exception as e:
+        logger.error(f"Error storing event batch: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route('/api/memory/load', methods=['POST'])
 @require_auth
 def load_context():
@@ -689,11 +823,7 @@ def get_accessible_contexts():
         thread_details = []
         for thread_id in accessible_threads:
             # Find which member owns this thread
-            owner_member = None
-            for m in db.get_all_members():
-                if m.get('thread_id') == thread_id:
-                    owner_member = m
-                    break
+            owner_member = db.get_member_by_thread_id(thread_id)
 
             detail = {
                 "thread_id": thread_id,
@@ -6,13 +6,44 @@
  * Works with memory_api_server.py Flask backend
  */
 
+// Browsers cap the total body size of all keepalive requests in flight at
+// once (64 KiB); stay a little under it
+const KEEPALIVE_MAX_BYTES = 60000;
+
 class AuroraMemoryClient {
-    constructor(apiBaseUrl = 'http://localhost:5000/api') {
+    /**
+     * @param {string} apiBaseUrl - memory_api_server.py base URL
+     * @param {Object} options - Event buffering:
+     *   batchSize: send once this many events are queued (default 20)
+     *   flushIntervalMs: send queued events after this long (default 1000)
+     */
+    constructor(apiBaseUrl = 'http://localhost:5000/api', options = {}) {
         this.apiBaseUrl = apiBaseUrl;
         this.threadId = null;
         this.accessTier = 1;
         this.tierName = 'Wanderer';
         this.sessionLoaded = false;
+
+        // storeEvent() queues here; flush() sends the queue to /memory/store_batch
+        this.batchSize = options.batchSize || 20;
+        this.flushIntervalMs = options.flushIntervalMs ?? 1000;
+        this._queue = [];
+        this._flushTimer = null;
+        this._sending = Promise.resolve();
+        this._sequence = 0;  // Per batch, so the server can restore send order
+        this._keepaliveBytes = 0;  // Bodies of keepalive requests still in flight
+
+        // Don't lose queued events when the page goes away
+        if (typeof window !== 'undefined') {
+            window.addEventListener('pagehide', () => this.flush({ keepalive: true }));
+        }
+        if (typeof document !== 'undefined') {
+            document.addEventListener('visibilitychange', () => {
+                if (document.visibilityState === 'hidden') {
+                    this.flush({ keepalive: true });
+                }
+            });
+        }
     }
 
     /**
@@ -65,46 +96,194 @@ class AuroraMemoryClient {
 
     /**
      * Store a conversation event
+     *
+     * Events are buffered and sent in batches (on batchSize, after
+     * flushIntervalMs, before a read, or when the page is hidden); the
+     * returned promise resolves once the event's batch is stored. Events
+     * the server would reject are not queued (they resolve null at once),
+     * so they cannot cost the rest of their batch.
+     *
      * @param {string} role - "user" or "assistant" or "system"
      * @param {string} content - Message content
      * @param {string} source - "edrive", "oracle", or "redverse"
      * @param {Object} emotionState - { primary: "joy", intensity: 0.8 }
      * @param {Object} metadata - Additional metadata
+     * @returns {Object} Batch result with this event's event_id
+     *     ({ stored, event_id, event_ids, ... }), or null if not stored
      */
-    async storeEvent(role, content, source = 'edrive', emotionState = null, metadata = {}) {
+    storeEvent(role, content, source = 'edrive', emotionState = null, metadata = {}) {
         if (!this.sessionLoaded) {
             console.warn('[Aurora Memory] Session not loaded, skipping event storage');
-            return null;
+            return Promise.resolve(null);
         }
 
-        try {
-            const response = await fetch(`${this.apiBaseUrl}/memory/store`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    thread_id: this.threadId,
-                    access_tier: this.accessTier,
+        const error = this._eventError(role, content, emotionState, metadata);
+        if (error) {
+            console.warn(`[Aurora Memory] Not storing event: ${error}`);
+            return Promise.resolve(null);
+        }
+
+        return new Promise((resolve) => {
+            this._queue.push({
+                event: {
                     role: role,
                     content: content,
                     source: source,
                     emotion_state: emotionState,
                     metadata: metadata
-                })
+                },
+                resolve: resolve
             });
 
+            if (this._queue.length >= this.batchSize) {
+                this.flush();
+            } else if (this._flushTimer === null) {
+                this._flushTimer = setTimeout(() => this.flush(), this.flushIntervalMs);
+            }
+        });
+    }
+
+    /**
+     * Send all queued events now
+     *
+     * Normally batches go out one at a time so events stay in order. With
+     * keepalive (the page is going away) every batch is sent at once: a page
+     * being unloaded never gets to send a batch queued behind a request
+     * still in flight. Batches use keepalive while their bodies, plus those
+     * of keepalive requests already in flight, fit KEEPALIVE_MAX_BYTES; the
+     * rest are sent without it and may be lost when the page unloads.
+     *
+     * @param {Object} options - keepalive: let the requests outlive the page
+     * @returns {Promise} Resolves once everything queued so far is sent
+     */
+    flush({ keepalive = false } = {}) {
+        if (this._flushTimer !== null) {
+            clearTimeout(this._flushTimer);
+            this._flushTimer = null;
+        }
+
+        const batches = [];
+        while (this._queue.length > 0) {
+            batches.push(this._queue.splice(0, this.batchSize));
+        }
+        if (keepalive) {
+            let budget = KEEPALIVE_MAX_BYTES - this._keepaliveBytes;
+            let overBudget = 0;
+            const sent = batches
+                .flatMap(batch => this._keepaliveBatches(batch))
+                .map(batch => {
+                    const body = this._batchBody(batch, this._sequence++);
+                    const bytes = this._bodyBytes(body);
+                    if (bytes > budget) {
+                        overBudget += batch.length;
+                        return this._sendBatch(batch, body, false);
+                    }
+                    budget -= bytes;
+                    return this._sendBatch(batch, body, true);
+                });
+            if (overBudget > 0) {
+                console.warn(`[Aurora Memory] ${overBudget} events over the keepalive budget; ` +
+                    'sent without keepalive, so they are lost if the page unloads first');
+            }
+            this._sending = Promise.all([this._sending, ...sent]);
+        } else {
+            batches.forEach(batch => {
+                const body = this._batchBody(batch, this._sequence++);
+                this._sending = this._sending.then(() => this._sendBatch(batch, body, false));
+            });
+        }
+        return this._sending;
+    }
+
+    /**
+     * Split a batch into batches whose bodies fit KEEPALIVE_MAX_BYTES
+     * @private
+     */
+    _keepaliveBatches(batch) {
+        if (batch.length < 2 || this._bodyBytes(this._batchBody(batch, this._sequence)) <= KEEPALIVE_MAX_BYTES) {
+            return [batch];
+        }
+        const half = Math.ceil(batch.length / 2);
+        return [
+            ...this._keepaliveBatches(batch.slice(0, half)),
+            ...this._keepaliveBatches(batch.slice(half))
+        ];
+    }
+
+    /** @private */
+    _batchBody(batch, sequence) {
+        return JSON.stringify({
+            thread_id: this.threadId,
+            access_tier: this.accessTier,
+            sequence: sequence,
+            events: batch.map(item => item.event)
+        });
+    }
+
+    /**
+     * UTF-8 size of a request body (the keepalive limit counts bytes)
+     * @private
+     */
+    _bodyBytes(body) {
+        return new TextEncoder().encode(body).length;
+    }
+
+    /**
+     * Why the server would reject an event (null if it would store it)
+     * @private
+     */
+    _eventError(role, content, emotionState, metadata) {
+        const isObject = value => value === null || value === undefined ||
+            (typeof value === 'object' && !Array.isArray(value));
+        if (!role) return 'role is required';
+        if (!content) return 'content is required';
+        if (!isObject(emotionState)) return 'emotionState must be an object';
+        if (!isObject(metadata)) return 'metadata must be an object';
+        return null;
+    }
+
+    /**
+     * POST one batch body to /memory/store_batch
+     * @private
+     */
+    async _sendBatch(batch, body, keepalive) {
+        const keepaliveBytes = keepalive ? this._bodyBytes(body) : 0;
+        this._keepaliveBytes += keepaliveBytes;
+        let result = null;
+
+        try {
+            let response;
+            try {
+                response = await fetch(`${this.apiBaseUrl}/memory/store_batch`, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: body,
+                    keepalive: keepalive
+                });
+            } finally {
+                this._keepaliveBytes -= keepaliveBytes;
+            }
+
             const data = await response.json();
 
             if (response.ok) {
-                console.log(`[Aurora Memory] Event stored: ${role} (${source})`);
-                return data;
+                console.log(`[Aurora Memory] Stored ${data.stored} events`);
+                result = data;
             } else {
-                console.error('[Aurora Memory] Failed to store event:', data.error);
-                return null;
+                console.error('[Aurora Memory] Failed to store events:', data.error);
             }
+            (data.rejected || []).forEach(rejected => {
+                console.error(`[Aurora Memory] Event rejected: ${rejected.error}`);
+            });
         } catch (error) {
-            console.error('[Aurora Memory] Error storing event:', error);
-            return null;
+            console.error('[Aurora Memory] Error storing events:', error);
         }
+
+        // event_ids is positional; null where the server rejected the event
+        batch.forEach((item, position) => {
+            const eventId = result && result.event_ids[position];
+            item.resolve(eventId ? { ...result, event_id: eventId } : null);
+        });
     }
 
     /**
@@ -118,6 +297,8 @@ class AuroraMemoryClient {
             return [];
         }
 
+        await this.flush();  // Include events still buffered
+
         try {
             const response = await fetch(`${this.apiBaseUrl}/memory/load`, {
                 method: 'POST',
@@ -154,6 +335,8 @@ class AuroraMemoryClient {
             return [];
         }
 
+        await this.flush();  // Include events still buffered
+
         try {
             const response = await fetch(`${this.apiBaseUrl}/memory/conversation_history`, {
                 method: 'POST',
@@ -189,6 +372,8 @@ class AuroraMemoryClient {
             return '';
         }
 
+        await this.flush();  // Include events still buffered
+
         try {
             const response = await fetch(`${this.apiBaseUrl}/memory/cross_site_summary`, {
                 method: 'POST',
@@ -230,6 +415,8 @@ class AuroraMemoryClient {
             return null;
         }
 
+        await this.flush();  // Include events still buffered
+
         try {
             const response = await fetch(`${this.apiBaseUrl}/memory/emotions`, {
                 method: 'POST',
@@ -265,6 +452,8 @@ class AuroraMemoryClient {
             return null;
         }
 
+        await this.flush();  // Include events still buffered
+
         try {
             const response = await fetch(`${this.apiBaseUrl}/memory/stats`, {
                 method: 'POST',
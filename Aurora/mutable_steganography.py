@@ -3,18 +3,27 @@ Aurora Archive - Mutable Steganography System
 Advanced card data management with force_overwrite and async edit capabilities
 
 Python 3.10+
-Dependencies: Pillow, aiofiles
+Dependencies: Pillow, NumPy, aiofiles
 """
 
+import io
+import os
 import json
 import hashlib
 import asyncio
 import aiofiles
+import numpy as np
 from PIL import Image
-from typing import Dict, Optional, Callable, Any
+from typing import Dict, Optional, Callable, Any, Tuple
 from pathlib import Path
 from datetime import datetime
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+import card_png
+import lsb_codec
+import payload_format
+from card_cache import CardDataCache, get_card_cache
 
 
 class CardLockError(Exception):
@@ -22,6 +31,127 @@ class CardLockError(Exception):
     pass
 
 
+class CardHandle:
+    """
+    A card image decoded once and shared across a read-modify-write
+    
+    Holds the decoded RGB image and parses the embedded frame lazily
+    (header -> payload -> data). Writing a new frame resets the parsed
+    state, so embed, extract, update and metadata reads on one handle cost
+    a single PNG decode plus one encode when saved.
+    """
+    
+    def __init__(
+        self,
+        image: Image.Image,
+        region_size: int,
+        magic: str,
+        path: Optional[str] = None,
+        source: Optional[bytes] = None
+    ):
+        self.image = image if image.mode == 'RGB' else image.convert('RGB')
+        self.region_size = region_size
+        self.magic = magic
+        self.path = path
+        # Encoded file the image was decoded from. Only the embed region is
+        # ever rewritten, so save() can reuse its compressed rows below it.
+        self.source = source
+        self._reset()
+    
+    @classmethod
+    def open(cls, image_path: str, region_size: int, magic: str) -> 'CardHandle':
+        """Decode a PNG from disk"""
+        with open(image_path, 'rb') as f:
+            source = f.read()
+        with Image.open(io.BytesIO(source)) as img:
+            image = img.convert('RGB')
+        return cls(image, region_size, magic, str(image_path), source)
+    
+    def _reset(self):
+        self.reader = lsb_codec.FrameReader(self.image, self.region_size)
+        self._header = None
+        self._payload = None
+        self.data = None  # Parsed dict, filled in by MutableCardSteganography
+    
+    @property
+    def pixels(self) -> np.ndarray:
+        """Copy of the embed region as a (height, width, 3) uint8 array"""
+        return lsb_codec.read_region(self.image, self.region_size)
+    
+    @property
+    def header(self) -> int:
+        """Data length from the 32-bit header (first 11 pixels)"""
+        if self._header is None:
+            if self.reader.capacity_bits < lsb_codec.LENGTH_HEADER_BITS:
+                raise ValueError("No embedded data found")
+            self._header = self.reader.read_length()
+        return self._header
+    
+    @property
+    def version(self) -> int:
+        """Payload format version, detected from the first 32 bits"""
+        if self.reader.capacity_bits < lsb_codec.LENGTH_HEADER_BITS:
+            raise ValueError("No embedded data found")
+        return 2 if payload_format.is_v2(self.reader.read_bytes(len(payload_format.V2_MAGIC))) else 1
+    
+    @property
+    def payload(self) -> str:
+        """Validated raw v1 payload (magic + checksum + JSON)"""
+        if self._payload is None:
+            self._payload = self.read_payload()
+        return self._payload
+    
+    def read_payload(self, require_complete: bool = True) -> str:
+        """
+        Decode the raw payload (magic + checksum + JSON) from the embed region
+        
+        Only the pixels the payload covers are decoded. In strict mode, images
+        whose header overruns the region or whose magic doesn't match are
+        rejected before the payload is read.
+        
+        Args:
+            require_complete: If True, raise on a truncated payload or bad magic
+            
+        Returns:
+            Payload string (checksum not yet verified)
+        """
+        payload_bytes = 12 + 8 + self.header  # magic + checksum + data
+        available_bytes = self.reader.payload_bytes_available()
+        
+        if payload_bytes > available_bytes:
+            if require_complete:
+                raise ValueError("Incomplete embedded data")
+            payload_bytes = available_bytes
+        
+        # Verify magic header before decoding the rest
+        if require_complete and not self.reader.payload_startswith(self.magic.encode()):
+            raise ValueError("Invalid Aurora card - magic header mismatch")
+        
+        return self.reader.read_payload(payload_bytes).decode('latin-1')
+    
+    def write_frame(self, bits: np.ndarray):
+        """Clear the embed region's LSBs and write a new frame"""
+        lsb_codec.embed_bits(self.image, bits, self.region_size, clear_region=True)
+        self._reset()
+    
+    def save(self, output_path: str, save_mode: str = card_png.DEFAULT_SAVE_MODE) -> Optional[Tuple[int, int]]:
+        """
+        Encode the image to PNG (JPEG would destroy the LSB data)
+        
+        Args:
+            output_path: Destination path
+            save_mode: One of card_png.SAVE_MODES
+            
+        Returns:
+            (mtime_ns, size) of the written file
+        """
+        stamp = card_png.save_card_png(
+            self.image, output_path, self.region_size, save_mode, self.source
+        )
+        self.source = None  # Re-read on the next open
+        return stamp
+
+
 class MutableCardSteganography:
     """
     Advanced steganography system with:
@@ -34,15 +164,62 @@ class MutableCardSteganography:
     MAGIC_HEADER = "415552524152"  # "AURORA" in hex
     EMBED_REGION_SIZE = 100
     VERSION = "1.0"
+    PAYLOAD_VERSION = 2  # Written format; v1 and v2 are both readable
     
-    def __init__(self):
-        self._locks = {}  # Card path -> asyncio.Lock
+    def __init__(
+        self,
+        cache: Optional[CardDataCache] = None,
+        payload_version: int = PAYLOAD_VERSION,
+        max_concurrency: Optional[int] = None,
+        save_mode: Optional[str] = None,
+        compact_payloads: Optional[bool] = None
+    ):
+        """
+        Args:
+            cache: Extraction cache (default: the shared process-wide cache)
+            payload_version: 2 for the compact binary format, 1 for legacy JSON
+            max_concurrency: Worker threads for async decode/encode and the
+                default batch_update bound (default: CPU count)
+            save_mode: PNG save mode from card_png.SAVE_MODES (default:
+                $AURORA_CARD_SAVE_MODE, else 'region'). 'hot' writes
+                uncompressed cards and recompresses them in the background.
+            compact_payloads: Write v2 bodies with msgpack / zstd when installed.
+                Cards written this way need them to be read
+                (default: $AURORA_COMPACT_PAYLOADS, else off: JSON + deflate)
+        """
+        save_mode = save_mode or os.getenv('AURORA_CARD_SAVE_MODE', card_png.DEFAULT_SAVE_MODE)
+        if save_mode not in card_png.SAVE_MODES:
+            raise ValueError(
+                f"Unknown save mode '{save_mode}' (choose from {', '.join(card_png.SAVE_MODES)})"
+            )
+        
+        if compact_payloads is None:
+            compact_payloads = os.getenv('AURORA_COMPACT_PAYLOADS', '').lower() in ('1', 'true', 'yes')
+        self.payload_version = payload_version
+        self.compact_payloads = compact_payloads
+        self.save_mode = save_mode
+        self.max_concurrency = max_concurrency or os.cpu_count() or 4
+        self._executor = None  # Created on first async call
+        self._locks = {}  # Resolved card path -> asyncio.Lock
         self._edit_history = {}  # Card path -> list of edits
+        self.cache = cache if cache is not None else get_card_cache()
     
     # ============================================
     # BASIC OPERATIONS (Sync)
     # ============================================
     
+    def open_card(self, image_path: str) -> CardHandle:
+        """
+        Decode a card image once for reuse across reads and writes
+        
+        Args:
+            image_path: Path to card image
+            
+        Returns:
+            CardHandle wrapping the decoded image
+        """
+        return CardHandle.open(image_path, self.EMBED_REGION_SIZE, self.MAGIC_HEADER)
+    
     def embed_data(
         self,
         image_path: str,
@@ -62,19 +239,54 @@ class MutableCardSteganography:
         Returns:
             Path to output image
         """
-        # Check if data exists and handle accordingly
-        has_existing_data = self.has_embedded_data(image_path)
+        card = self.open_card(image_path)
         
-        if has_existing_data and not force_overwrite:
+        # Check if data exists and handle accordingly
+        if not force_overwrite and self._card_has_data(card):
             raise ValueError(
                 f"Image already contains embedded data. Use force_overwrite=True or update_data() instead"
             )
         
-        # Load image (fresh, ignoring any existing LSB data)
-        img = Image.open(image_path).convert('RGB')
-        pixels = img.load()
-        width, height = img.size
+        if output_path is None:
+            output_path = image_path
+        
+        return self._embed_card(card, data, output_path)
+    
+    def embed_image_data(self, image: Image.Image, data: Dict) -> Image.Image:
+        """
+        Embed data into an already-decoded image without touching disk
+        
+        Args:
+            image: Pillow image (e.g. a resized seal); left unmodified
+            data: Dictionary to embed
+            
+        Returns:
+            New RGB image holding the data in its top-left embed region
+        """
+        # CardHandle converts non-RGB images to a new copy; copy RGB ones here
+        source = image.copy() if image.mode == 'RGB' else image
+        card = CardHandle(source, self.EMBED_REGION_SIZE, self.MAGIC_HEADER)
+        self._write_card_data(card, data)
+        return card.image
+    
+    def _embed_card(self, card: CardHandle, data: Dict, output_path: str) -> str:
+        """Write data into an open card (ignoring any existing LSB data) and save it"""
+        self._write_card_data(card, data)
         
+        # Save
+        if not output_path.lower().endswith('.png'):
+            output_path += '.png'
+        
+        stamp = card.save(output_path, self.save_mode)
+        self.cache.invalidate(output_path)
+        
+        if self.save_mode == "hot":
+            card_png.get_recompressor().submit(output_path, stamp, self.cache)
+        
+        return output_path
+    
+    def _write_card_data(self, card: CardHandle, data: Dict):
+        """Replace the frame in an open card's embed region (in memory only)"""
         # Add metadata
         data_with_meta = {
             **data,
@@ -85,72 +297,28 @@ class MutableCardSteganography:
             }
         }
         
-        # Prepare payload
-        json_data = json.dumps(data_with_meta, separators=(',', ':'))
-        checksum = hashlib.md5(json_data.encode()).hexdigest()[:8]
-        full_data = f"{self.MAGIC_HEADER}{checksum}{json_data}"
-        
-        # Convert to binary
-        binary_data = ''.join(format(ord(char), '08b') for char in full_data)
-        length_header = format(len(json_data), '032b')
-        full_binary = length_header + binary_data
+        # Prepare payload and convert to bit frame
+        if self.payload_version >= 2:
+            full_binary = lsb_codec.encode_bytes(
+                payload_format.encode_v2(data_with_meta, compact=self.compact_payloads)
+            )
+        else:
+            json_data = json.dumps(data_with_meta, separators=(',', ':'))
+            checksum = hashlib.md5(json_data.encode()).hexdigest()[:8]
+            full_data = f"{self.MAGIC_HEADER}{checksum}{json_data}"
+            full_binary = lsb_codec.encode_frame(len(json_data), full_data.encode('latin-1'))
         
         # Check capacity
-        max_region_width = min(self.EMBED_REGION_SIZE, width)
-        max_region_height = min(self.EMBED_REGION_SIZE, height)
-        available_bits = max_region_width * max_region_height * 3
+        available_bits = lsb_codec.region_capacity_bits(card.image.size, self.EMBED_REGION_SIZE)
         
-        if len(full_binary) > available_bits:
+        if full_binary.size > available_bits:
             raise ValueError(
-                f"Data too large: {len(full_binary)} bits needed, {available_bits} available"
+                f"Data too large: {full_binary.size} bits needed, {available_bits} available"
             )
         
         # CRITICAL: Clear the entire embed region first
         # This ensures old data doesn't bleed through
-        for y in range(max_region_height):
-            for x in range(max_region_width):
-                r, g, b = pixels[x, y]
-                # Clear LSBs (set all to 0)
-                r = r & 0xFE
-                g = g & 0xFE
-                b = b & 0xFE
-                pixels[x, y] = (r, g, b)
-        
-        # Embed new data
-        data_index = 0
-        for y in range(max_region_height):
-            for x in range(max_region_width):
-                if data_index >= len(full_binary):
-                    break
-                
-                r, g, b = pixels[x, y]
-                
-                # Set LSB to data bits
-                if data_index < len(full_binary):
-                    r = (r & 0xFE) | int(full_binary[data_index])
-                    data_index += 1
-                if data_index < len(full_binary):
-                    g = (g & 0xFE) | int(full_binary[data_index])
-                    data_index += 1
-                if data_index < len(full_binary):
-                    b = (b & 0xFE) | int(full_binary[data_index])
-                    data_index += 1
-                
-                pixels[x, y] = (r, g, b)
-            
-            if data_index >= len(full_binary):
-                break
-        
-        # Save
-        if output_path is None:
-            output_path = image_path
-        
-        if not output_path.lower().endswith('.png'):
-            output_path += '.png'
-        
-        img.save(output_path, 'PNG', optimize=False)
-        
-        return output_path
+        card.write_frame(full_binary)
     
     def extract_data(self, image_path: str) -> Dict:
         """
@@ -162,48 +330,38 @@ class MutableCardSteganography:
         Returns:
             Dictionary of embedded data (without _aurora_meta)
         """
-        img = Image.open(image_path).convert('RGB')
-        pixels = img.load()
-        width, height = img.size
-        
-        max_region_width = min(self.EMBED_REGION_SIZE, width)
-        max_region_height = min(self.EMBED_REGION_SIZE, height)
-        
-        # Extract binary data
-        binary_data = ''
-        for y in range(max_region_height):
-            for x in range(max_region_width):
-                r, g, b = pixels[x, y]
-                binary_data += str(r & 1)
-                binary_data += str(g & 1)
-                binary_data += str(b & 1)
-        
-        # Read length header
-        if len(binary_data) < 32:
-            raise ValueError("No embedded data found")
-        
-        data_length = int(binary_data[:32], 2)
-        
-        # Extract payload
-        expected_chars = 12 + 8 + data_length  # magic + checksum + data
-        expected_bits = expected_chars * 8
-        total_bits = 32 + expected_bits
-        
-        if len(binary_data) < total_bits:
-            raise ValueError("Incomplete embedded data")
+        stamp = CardDataCache.file_stamp(image_path)
+        cached = self.cache.get(image_path, stamp=stamp)
+        if cached is not None:
+            return cached
+        
+        data = self._strip_meta(self._read_card_data(self.open_card(image_path)))
+        self.cache.put(image_path, data, stamp=stamp)
+        return data
+    
+    def extract_image_data(self, image: Image.Image) -> Dict:
+        """
+        Extract embedded data from an already-decoded image (e.g. a cropped seal)
         
-        payload_binary = binary_data[32:total_bits]
+        Args:
+            image: Pillow image holding the embed region at its top-left
+            
+        Returns:
+            Dictionary of embedded data (without _aurora_meta)
+        """
+        card = CardHandle(image, self.EMBED_REGION_SIZE, self.MAGIC_HEADER)
+        return self._strip_meta(self._read_card_data(card))
+    
+    def _read_card_data(self, card: CardHandle) -> Dict:
+        """Parse and verify the full embedded dict (including _aurora_meta)"""
+        if card.data is not None:
+            return card.data
         
-        # Convert to text
-        payload = ''
-        for i in range(0, len(payload_binary), 8):
-            byte = payload_binary[i:i+8]
-            if len(byte) == 8:
-                payload += chr(int(byte, 2))
+        if card.version == 2:
+            card.data = payload_format.read_v2(card.reader.read_bytes, card.reader.bytes_available())
+            return card.data
         
-        # Verify magic header
-        if not payload.startswith(self.MAGIC_HEADER):
-            raise ValueError("Invalid Aurora card - magic header mismatch")
+        payload = card.payload
         
         # Extract components
         checksum = payload[12:20]
@@ -215,15 +373,23 @@ class MutableCardSteganography:
             raise ValueError(f"Data corrupted - checksum mismatch")
         
         # Parse JSON
-        full_data = json.loads(json_data)
-        
-        # Return data without metadata
+        card.data = json.loads(json_data)
+        return card.data
+    
+    @staticmethod
+    def _strip_meta(full_data: Dict) -> Dict:
+        """Return data without metadata"""
         return {k: v for k, v in full_data.items() if k != '_aurora_meta'}
     
     def has_embedded_data(self, image_path: str) -> bool:
         """Check if image contains valid Aurora data"""
+        if self.cache.get(image_path) is not None:
+            return True
+        return self._card_has_data(self.open_card(image_path))
+    
+    def _card_has_data(self, card: CardHandle) -> bool:
         try:
-            self.extract_data(image_path)
+            self._read_card_data(card)
             return True
         except (ValueError, json.JSONDecodeError):
             return False
@@ -231,36 +397,22 @@ class MutableCardSteganography:
     def get_metadata(self, image_path: str) -> Optional[Dict]:
         """Get Aurora metadata from card"""
         try:
-            img = Image.open(image_path).convert('RGB')
-            pixels = img.load()
-            width, height = img.size
-            
-            max_region_width = min(self.EMBED_REGION_SIZE, width)
-            max_region_height = min(self.EMBED_REGION_SIZE, height)
-            
-            # Extract binary data
-            binary_data = ''
-            for y in range(max_region_height):
-                for x in range(max_region_width):
-                    r, g, b = pixels[x, y]
-                    binary_data += str(r & 1)
-                    binary_data += str(g & 1)
-                    binary_data += str(b & 1)
-            
-            data_length = int(binary_data[:32], 2)
-            expected_chars = 12 + 8 + data_length
-            expected_bits = expected_chars * 8
-            total_bits = 32 + expected_bits
-            
-            payload_binary = binary_data[32:total_bits]
-            
-            payload = ''
-            for i in range(0, len(payload_binary), 8):
-                byte = payload_binary[i:i+8]
-                if len(byte) == 8:
-                    payload += chr(int(byte, 2))
+            return self._card_metadata(self.open_card(image_path))
+        except:
+            return None
+    
+    def _card_metadata(self, card: CardHandle) -> Optional[Dict]:
+        """Read _aurora_meta, tolerating a bad magic, checksum or truncated payload"""
+        try:
+            return self._read_card_data(card).get('_aurora_meta')
+        except (ValueError, json.JSONDecodeError):
+            pass
+        
+        try:
+            if card.version == 2:
+                return None  # v2 has no lenient path: the CRC already failed
             
-            json_data = payload[20:]
+            json_data = card.read_payload(require_complete=False)[20:]
             full_data = json.loads(json_data)
             
             return full_data.get('_aurora_meta')
@@ -272,6 +424,9 @@ class MutableCardSteganography:
         """
         Update specific fields in embedded data
         
+        One decode and one encode: the card is opened once and the same
+        decoded image is read, modified and re-embedded.
+        
         Args:
             image_path: Card to update
             updates: Dict of field -> new value
@@ -279,14 +434,16 @@ class MutableCardSteganography:
         Returns:
             Updated data
         """
+        card = self.open_card(image_path)
+        
         # Extract current data
-        current_data = self.extract_data(image_path)
+        current_data = self._strip_meta(self._read_card_data(card))
         
         # Update fields
         current_data.update(updates)
         
         # Re-embed (force_overwrite)
-        self.embed_data(image_path, current_data, output_path=image_path, force_overwrite=True)
+        self._embed_card(card, current_data, image_path)
         
         return current_data 
     
@@ -294,6 +451,28 @@ class MutableCardSteganography:
     # ASYNC OPERATIONS
     # ============================================
     
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Thread pool for Pillow/NumPy work (both release the GIL while encoding)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="aurora-stego"
+            )
+        return self._executor
+    
+    async def _run(self, func: Callable, *args):
+        """Run CPU-bound card work off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), func, *args)
+    
+    def _lock_for(self, image_path: str) -> asyncio.Lock:
+        """Per-card lock: edits to one card serialize, different cards run in parallel"""
+        key = str(Path(image_path).resolve())
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+    
     async def async_embed_data(
         self,
         image_path: str,
@@ -301,21 +480,20 @@ class MutableCardSteganography:
         output_path: Optional[str] = None,
         force_overwrite: bool = True
     ) -> str:
-        """Async version of embed_data"""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            self.embed_data,
-            image_path,
-            data,
-            output_path,
-            force_overwrite
-        )
+        """Async version of embed_data (holds the written card's lock)"""
+        async with self._lock_for(output_path or image_path):
+            return await self._run(
+                self.embed_data,
+                image_path,
+                data,
+                output_path,
+                force_overwrite
+            )
     
     async def async_extract_data(self, image_path: str) -> Dict:
-        """Async version of extract_data"""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.extract_data, image_path)
+        """Async version of extract_data (holds the card's lock: cards are saved in place)"""
+        async with self._lock_for(image_path):
+            return await self._run(self.extract_data, image_path)
     
     @asynccontextmanager
     async def edit_card(self, image_path: str):
@@ -328,15 +506,11 @@ class MutableCardSteganography:
                 data['credits'] += 100
             # Data automatically saved when context exits
         """
-        # Get or create lock for this card
-        if image_path not in self._locks:
-            self._locks[image_path] = asyncio.Lock()
-        
-        lock = self._locks[image_path]
-        
-        async with lock:
-            # Load current data
-            data = await self.async_extract_data(image_path)
+        async with self._lock_for(image_path):
+            # Decode the card once (off the event loop); the same handle serves
+            # the metadata read and the save
+            card = await self._run(self.open_card, image_path)
+            data = self._strip_meta(await self._run(self._read_card_data, card))
             
             # Create editable wrapper
             editor = CardDataEditor(data, image_path, self)
@@ -347,7 +521,7 @@ class MutableCardSteganography:
                 # Save changes if modified
                 if editor.is_modified:
                     # Update edit count
-                    metadata = self.get_metadata(image_path) or {}
+                    metadata = self._card_metadata(card) or {}
                     edit_count = metadata.get('edit_count', 0) + 1
                     
                     data['_aurora_meta'] = {
@@ -358,12 +532,7 @@ class MutableCardSteganography:
                     }
                     
                     # Save
-                    await self.async_embed_data(
-                        image_path,
-                        editor.data,
-                        output_path=image_path,
-                        force_overwrite=True
-                    )
+                    await self._run(self._embed_card, card, editor.data, image_path)
                     
                     # Track edit history
                     if image_path not in self._edit_history:
@@ -400,19 +569,31 @@ class MutableCardSteganography:
     
     async def batch_update(
         self,
-        updates: list[tuple[str, Dict]]
+        updates: list[tuple[str, Dict]],
+        max_concurrency: Optional[int] = None
     ) -> list[Dict]:
         """
         Update multiple cards concurrently
         
+        Different cards are decoded and encoded in parallel on the worker
+        pool; repeated entries for the same card are serialized by its lock
+        and applied in list order.
+        
         Args:
             updates: List of (image_path, updates_dict) tuples
+            max_concurrency: Cards in flight at once (default: self.max_concurrency)
             
         Returns:
-            List of updated data dicts
+            List of updated data dicts, in input order
         """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        
+        async def bounded_update(image_path: str, update_dict: Dict) -> Dict:
+            async with semaphore:
+                return await self.update_fields(image_path, update_dict)
+        
         tasks = [
-            self.update_fields(image_path, update_dict)
+            bounded_update(image_path, update_dict)
             for image_path, update_dict in updates
         ]
         return await asyncio.gather(*tasks)
@@ -13,11 +13,7 @@ Python 3.10+ | PyQt6
 """
 
 import sys
-import json
-import hashlib
-from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional, Tuple
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -27,155 +23,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, pyqtSignal
 from PyQt6.QtGui import QFont, QPixmap, QPainter, QColor
 
-# Import steganography module
-try:
-    from mutable_steganography import MutableCardSteganography
-    STEG_AVAILABLE = True
-except ImportError:
-    STEG_AVAILABLE = False
-    print("❌ FATAL: mutable_steganography module not available")
-    print("The Obelisk cannot function without it.")
-
-
-class ObeliskValidator:
-    """
-    The Obelisk's validation logic
-    
-    Checks for:
-    1. Valid Aurora magic header
-    2. Crimson Collective seal presence
-    3. Sigil authenticity
-    4. Timeline integrity
-    5. Authenticity markers
-    """
-    
-    def __init__(self):
-        self.steg = MutableCardSteganography() if STEG_AVAILABLE else None
-    
-    def validate_soulcard(self, card_path: str) -> Tuple[bool, str, Optional[Dict]]:
-        """
-        Validate a soul card at the Obelisk gates
-        
-        Args:
-            card_path: Path to card image
-            
-        Returns:
-            Tuple of (is_valid, reason, card_data)
-            - is_valid: True if card passes all checks
-            - reason: Why it passed or failed
-            - card_data: Extracted data if valid, None if invalid
-        """
-        if not self.steg:
-            return False, "🚫 Obelisk offline - steganography unavailable", None
-        
-        # Step 1: Extract data
-        try:
-            card_data = self.steg.extract_data(card_path)
-        except Exception as e:
-            return False, f"🚫 CORRUPTED: Cannot read card data - {str(e)}", None
-        
-        # Step 2: Check for Crimson Collective seal
-        if 'crimson_collective' not in card_data:
-            return False, "🚫 UNAUTHORIZED: No Crimson Collective seal found", None
-        
-        crimson_seal = card_data['crimson_collective']
-        
-        # Step 3: Validate sigil presence
-        if 'sigil' not in crimson_seal or not crimson_seal['sigil']:
-            return False, "🚫 FRAUDULENT: Missing sigil", None
-        
-        # Step 4: Validate seal structure
-        required_fields = ['sigil', 'seal', 'covenant', 'authority', 'generation']
-        missing = [f for f in required_fields if f not in crimson_seal]
-        if missing:
-            return False, f"🚫 INCOMPLETE SEAL: Missing {', '.join(missing)}", None
-        
-        # Step 5: Check authority
-        if crimson_seal.get('authority') != 'Aurora Archive - Crimson Artisan Guild':
-            return False, "🚫 INVALID AUTHORITY: Not issued by Crimson Artisan Guild", None
-        
-        # Step 6: Validate generation epoch
-        valid_generations = [
-            'Second Era of Digital Arcana',
-            'First Era of Digital Arcana',
-            'Third Era of Digital Arcana'
-        ]
-        if crimson_seal.get('generation') not in valid_generations:
-            return False, f"🚫 UNKNOWN GENERATION: {crimson_seal.get('generation')}", None
-        
-        # Step 7: Check authenticity markers
-        if 'authenticity' in card_data:
-            auth = card_data['authenticity']
-            
-            if not auth.get('genuine', False):
-                return False, "🚫 MARKED FAKE: authenticity.genuine = false", None
-            
-            if auth.get('tamper_seal') != 'INTACT':
-                return False, f"🚫 TAMPERED: tamper_seal = {auth.get('tamper_seal')}", None
-            
-            # Cross-verify sigil with verification_hash
-            if 'verification_hash' in auth:
-                if auth['verification_hash'] != crimson_seal['sigil']:
-                    return False, "🚫 SIGIL MISMATCH: verification_hash doesn't match sigil", None
-        
-        # Step 8: Validate timeline
-        if 'timeline' in card_data:
-            timeline = card_data['timeline']
-            
-            if 'created' not in timeline or 'exported' not in timeline:
-                return False, "🚫 INCOMPLETE TIMELINE: Missing timestamps", None
-        
-        # Step 9: All checks passed!
-        sigil = crimson_seal['sigil']
-        seal_text = crimson_seal['seal']
-        
-        return True, f"✅ VALIDATED: Sigil {sigil[:8]}... | {seal_text}", card_data
-    
-    def append_validation_mark(self, card_path: str, card_data: Dict) -> bool:
-        """
-        Append the Obelisk's validation mark to the card
-        
-        This mark proves the card has passed customs and can unlock the Account Realm
-        
-        Args:
-            card_path: Path to card image
-            card_data: Existing card data
-            
-        Returns:
-            True if mark successfully appended
-        """
-        if not self.steg:
-            return False
-        
-        try:
-            # Generate validation mark using new format
-            validation_sigil = hashlib.sha256(
-                (card_data['crimson_collective']['sigil'] + datetime.now().isoformat()).encode()
-            ).hexdigest()[:16]
-            
-            validation_mark = {
-                'obelisk_verification': {
-                    'passed': True,
-                    'verification_sigil': validation_sigil,
-                    'timestamp': datetime.now().isoformat(),
-                    'gate': 'GATE_1_CUSTOMS',
-                    'status': 'CLEARED',
-                    'validator': 'Obelisk Customs Checkpoint v1.0',
-                    'access_level': 'account_realm'
-                }
-            }
-            
-            # Merge with existing data
-            enhanced_data = {**card_data, **validation_mark}
-            
-            # Re-embed with validation mark
-            self.steg.embed_data(card_path, enhanced_data, force_overwrite=True)
-            
-            return True
-            
-        except Exception as e:
-            print(f"❌ Failed to append validation mark: {e}")
-            return False
+# Validation rules live in a headless module so CLI tools can share them
+from obelisk_validator import ObeliskValidator
 
 
 class ObeliskMainWindow(QMainWindow):
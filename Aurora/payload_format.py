@@ -0,0 +1,214 @@
+"""
+Aurora Archive - Card Payload Format (v2)
+Compact binary payload for card and seal steganography
+
+v1 (legacy, still readable):
+    [32-bit length][hex "AURORA" magic][8-char MD5 prefix][compact JSON]
+
+v2:
+    [4-byte magic A5 'R' 'V' 02][flags][varint body length][CRC32][body]
+
+    flags bits 0-1: serializer  (0 = JSON, 1 = msgpack)
+    flags bits 2-3: compression (0 = none, 1 = raw deflate, 2 = zstd)
+
+The v2 magic occupies the same 32 bits as the v1 length header. Its first byte
+(0xA5) would mean a v1 length of over 2.7 GB, which no embed region can hold,
+so extractors tell the versions apart from the first 11 pixels.
+
+Cards are portable files, so by default the body is JSON, stored raw or raw
+deflate: any install can read it with the standard library. msgpack and zstd
+are opt-in (encode_v2(compact=True)) for deployments where every reader has
+them installed.
+
+Python 3.10+
+Dependencies: msgpack (optional), zstandard (optional)
+"""
+
+import json
+import zlib
+from typing import Dict, Optional, Tuple
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+V2_MAGIC = b'\xa5RV\x02'
+
+SERIALIZER_JSON = 0
+SERIALIZER_MSGPACK = 1
+
+COMPRESSION_NONE = 0
+COMPRESSION_DEFLATE = 1
+COMPRESSION_ZSTD = 2
+
+MAX_VARINT_BYTES = 5  # Enough for any 32-bit length
+CRC_BYTES = 4
+
+
+class PayloadFormatError(ValueError):
+    """Raised when a v2 payload is malformed or uses an unavailable codec"""
+    pass
+
+
+def encode_varint(value: int) -> bytes:
+    """Unsigned LEB128"""
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def decode_varint(buf: bytes, offset: int = 0) -> Tuple[int, int]:
+    """
+    Decode an unsigned LEB128 value
+
+    Returns:
+        Tuple of (value, offset just past the varint)
+
+    Raises:
+        PayloadFormatError: If the varint is truncated or too long
+    """
+    value = 0
+    for i in range(MAX_VARINT_BYTES):
+        if offset + i >= len(buf):
+            raise PayloadFormatError("Truncated varint")
+        byte = buf[offset + i]
+        value |= (byte & 0x7F) << (7 * i)
+        if not byte & 0x80:
+            return value, offset + i + 1
+    raise PayloadFormatError("Varint too long")
+
+
+def _serialize(data: Dict, serializer: int) -> bytes:
+    if serializer == SERIALIZER_MSGPACK:
+        return msgpack.packb(data, use_bin_type=True)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _deserialize(body: bytes, serializer: int) -> Dict:
+    if serializer == SERIALIZER_MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise PayloadFormatError("Payload uses msgpack - install with: pip install msgpack")
+        return msgpack.unpackb(body, raw=False)
+    if serializer == SERIALIZER_JSON:
+        return json.loads(body.decode('utf-8'))
+    raise PayloadFormatError(f"Unknown serializer {serializer}")
+
+
+def _compress(raw: bytes, compression: int) -> bytes:
+    if compression == COMPRESSION_DEFLATE:
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15)  # Raw deflate: CRC32 covers integrity
+        return compressor.compress(raw) + compressor.flush()
+    if compression == COMPRESSION_ZSTD:
+        return zstandard.ZstdCompressor(level=19, write_checksum=False).compress(raw)
+    return raw
+
+
+def _decompress(body: bytes, compression: int) -> bytes:
+    if compression == COMPRESSION_NONE:
+        return body
+    if compression == COMPRESSION_DEFLATE:
+        return zlib.decompress(body, -15)
+    if compression == COMPRESSION_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise PayloadFormatError("Payload uses zstd - install with: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(body)
+    raise PayloadFormatError(f"Unknown compression {compression}")
+
+
+def encode_v2(data: Dict, serializer: Optional[int] = None, compact: bool = False) -> bytes:
+    """
+    Encode a dict as a v2 frame
+
+    The body is stored with whichever allowed compression is smallest
+    (tiny seal payloads are often best left uncompressed).
+
+    Args:
+        data: Dictionary to encode
+        serializer: SERIALIZER_JSON or SERIALIZER_MSGPACK (default: JSON, or
+            msgpack if `compact` and installed)
+        compact: Also allow msgpack and zstd when installed. Readers then
+            need the same packages, so only opt in where they all have them
+
+    Returns:
+        Complete frame bytes, magic first
+    """
+    if serializer is None:
+        serializer = SERIALIZER_MSGPACK if compact and MSGPACK_AVAILABLE else SERIALIZER_JSON
+    if serializer == SERIALIZER_MSGPACK and not MSGPACK_AVAILABLE:
+        raise PayloadFormatError("msgpack payloads need msgpack - install with: pip install msgpack")
+
+    raw = _serialize(data, serializer)
+
+    compressions = [COMPRESSION_NONE, COMPRESSION_DEFLATE]
+    if compact and ZSTD_AVAILABLE:
+        compressions.append(COMPRESSION_ZSTD)
+    compression, body = min(
+        ((c, _compress(raw, c)) for c in compressions),
+        key=lambda candidate: len(candidate[1])
+    )
+
+    flags = serializer | (compression << 2)
+    crc = zlib.crc32(body).to_bytes(CRC_BYTES, 'big')
+    return V2_MAGIC + bytes([flags]) + encode_varint(len(body)) + crc + body
+
+
+def is_v2(prefix: bytes) -> bool:
+    """True if the first four frame bytes are the v2 magic"""
+    return prefix[:len(V2_MAGIC)] == V2_MAGIC
+
+
+def read_v2(read_bytes, available: int) -> Dict:
+    """
+    Decode a v2 frame incrementally
+
+    Args:
+        read_bytes: Callable(end) -> frame bytes [0, end), decoding pixels on demand
+        available: Number of whole bytes the embed region can hold
+
+    Returns:
+        Decoded dictionary
+
+    Raises:
+        PayloadFormatError: If the frame is not v2, truncated or corrupted
+    """
+    head_end = min(available, len(V2_MAGIC) + 1 + MAX_VARINT_BYTES)
+    head = read_bytes(head_end)
+    if not is_v2(head):
+        raise PayloadFormatError("Not a v2 payload")
+
+    flags = head[len(V2_MAGIC)]
+    body_length, offset = decode_varint(head, len(V2_MAGIC) + 1)
+
+    body_start = offset + CRC_BYTES
+    body_end = body_start + body_length
+    if body_end > available:
+        raise PayloadFormatError("Incomplete embedded data")
+
+    frame = read_bytes(body_end)
+    crc = int.from_bytes(frame[offset:body_start], 'big')
+    body = frame[body_start:body_end]
+    if zlib.crc32(body) != crc:
+        raise PayloadFormatError("Data corrupted - CRC32 mismatch")
+
+    try:
+        raw = _decompress(body, (flags >> 2) & 0x3)
+        return _deserialize(raw, flags & 0x3)
+    except PayloadFormatError:
+        raise
+    except Exception as e:
+        raise PayloadFormatError(f"Invalid v2 body: {e}")
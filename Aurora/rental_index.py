@@ -0,0 +1,210 @@
+"""
+Aurora Archive - Rental Due-Date Index
+Min-heaps over every active rental in DatabaseManager.members
+
+    due heap  (overdue_start, member_id, rental_key)  -> "what is overdue now"
+    fee heap  (next fee change, member_id, rental_key) -> incremental fee accrual
+
+A rental is active until it has a return_date or status 'returned'. Fees
+accrue $1 per started day from midday of the day after the due date
+(overdue_start); the fee heap holds, per rental, the moment its day count
+next goes up, so advance() touches only rentals whose fee changed.
+
+Heap entries are never removed in place: a returned or re-dated rental
+leaves a stale entry that is skipped (and dropped when the heap is
+rebuilt after stale entries outnumber live ones).
+
+Python 3.10+
+Dependencies: none
+"""
+
+import heapq
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+
+DAILY_OVERDUE_FEE = 1.00
+DAY_SECONDS = 86400
+
+
+def overdue_start(due_date: str) -> datetime:
+    """Moment fees start: midday (12:00) of the day after the due date"""
+    due_dt = datetime.fromisoformat(due_date)
+    return due_dt.replace(hour=12, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+
+def days_overdue(start: datetime, when: datetime) -> int:
+    """Started days past overdue_start (partial days count as whole days)"""
+    if when <= start:
+        return 0
+    return math.ceil((when - start).total_seconds() / DAY_SECONDS)
+
+
+def rental_key(rental: Dict, position: int) -> str:
+    """rental_id, or the rental's list position for older records without one"""
+    return rental.get('rental_id') or f"#{position}"
+
+
+def is_active(rental: Dict) -> bool:
+    return not rental.get('return_date') and rental.get('status') != 'returned'
+
+
+class RentalIndex:
+    """Due-date and fee heaps kept consistent as members' rentals change"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rentals: Dict[str, Dict[str, Tuple[float, str]]] = {}  # member_id -> {rental_key: (start_ts, due_date)}
+        self._due: List[Tuple[float, str, str]] = []
+        self._fee_due: List[Tuple[float, str, str, float]] = []  # (..., start_ts the entry was made for)
+        self._active = 0
+
+        # Maintained by advance()
+        self.days: Dict[Tuple[str, str], int] = {}  # (member_id, rental_key) -> days overdue
+        self.outstanding_days = 0
+
+    @staticmethod
+    def _member_rentals(member: Dict) -> Dict[str, Tuple[float, str]]:
+        rentals = {}
+        for position, rental in enumerate(member.get('rentals') or []):
+            if not is_active(rental) or not rental.get('due_date'):
+                continue
+            try:
+                start = overdue_start(rental['due_date'])
+            except (TypeError, ValueError):
+                continue
+            rentals[rental_key(rental, position)] = (start.timestamp(), rental['due_date'])
+        return rentals
+
+    def rebuild(self, members: Dict[str, Dict]):
+        """Index every member's active rentals from scratch"""
+        with self._lock:
+            self._rentals = {}
+            for member_id, member in members.items():
+                rentals = self._member_rentals(member)
+                if rentals:
+                    self._rentals[member_id] = rentals
+            self.days = {}
+            self.outstanding_days = 0
+            self._rebuild_heaps()
+
+    def _rebuild_heaps(self):
+        self._due = [
+            (start_ts, member_id, key)
+            for member_id, rentals in self._rentals.items()
+            for key, (start_ts, _) in rentals.items()
+        ]
+        heapq.heapify(self._due)
+        self._fee_due = [(start_ts, member_id, key, start_ts) for start_ts, member_id, key in self._due]
+        heapq.heapify(self._fee_due)
+        self._active = len(self._due)
+
+    def update(self, member_id: str, member: Dict):
+        """Re-index one member's rentals after a rental was added, returned or changed"""
+        rentals = self._member_rentals(member)
+        with self._lock:
+            old = self._rentals.get(member_id, {})
+            if old == rentals:
+                return
+            for key, (start_ts, _) in rentals.items():
+                if key not in old or old[key][0] != start_ts:
+                    heapq.heappush(self._due, (start_ts, member_id, key))
+                    heapq.heappush(self._fee_due, (start_ts, member_id, key, start_ts))
+                    self._forget_days(member_id, key)
+            for key in old.keys() - rentals.keys():
+                self._forget_days(member_id, key)
+            self._active += len(rentals) - len(old)
+            if rentals:
+                self._rentals[member_id] = rentals
+            else:
+                self._rentals.pop(member_id, None)
+            self._maybe_compact()
+
+    def remove(self, member_id: str):
+        """Drop a deleted member's rentals"""
+        self.update(member_id, {})
+
+    def _forget_days(self, member_id: str, key: str):
+        self.outstanding_days -= self.days.pop((member_id, key), 0)
+
+    def _maybe_compact(self):
+        if len(self._due) > 2 * self._active + 64 or len(self._fee_due) > 2 * self._active + 64:
+            days = self.days
+            self._rebuild_heaps()
+            self.days = days  # Rebuilt fee entries re-derive the same day counts; keep them
+
+    def _live(self, start_ts: float, member_id: str, key: str) -> bool:
+        entry = self._rentals.get(member_id, {}).get(key)
+        return entry is not None and entry[0] == start_ts
+
+    def overdue(self, now: Optional[datetime] = None, limit: Optional[int] = None) -> List[Tuple[str, str, float]]:
+        """
+        Active rentals past overdue_start, most overdue first
+
+        Walks the due heap as a tree with a frontier heap, so the k most
+        overdue cost O(k log k) plus any stale entries passed on the way.
+        Without a limit every overdue entry is sorted instead.
+
+        Args:
+            now: Reference time (default: datetime.now())
+            limit: Return at most this many (default: all overdue)
+
+        Returns:
+            (member_id, rental_key, overdue_start timestamp) tuples
+        """
+        now_ts = (now or datetime.now()).timestamp()
+        results = []
+        seen = set()
+        with self._lock:
+            heap = self._due
+            if limit is None:
+                for start_ts, member_id, key in sorted(entry for entry in heap if entry[0] < now_ts):
+                    if self._live(start_ts, member_id, key) and (member_id, key) not in seen:
+                        seen.add((member_id, key))
+                        results.append((member_id, key, start_ts))
+                return results
+            frontier = [(heap[0], 0)] if heap else []
+            while frontier and (limit is None or len(results) < limit):
+                entry, position = heapq.heappop(frontier)
+                start_ts, member_id, key = entry
+                if start_ts >= now_ts:
+                    break
+                if self._live(start_ts, member_id, key) and (member_id, key) not in seen:
+                    seen.add((member_id, key))
+                    results.append((member_id, key, start_ts))
+                for child in (2 * position + 1, 2 * position + 2):
+                    if child < len(heap):
+                        heapq.heappush(frontier, (heap[child], child))
+        return results
+
+    def advance(self, now: Optional[datetime] = None) -> List[Tuple[str, str, int, int]]:
+        """
+        Bring day counts up to `now`, touching only rentals whose count changed
+
+        Args:
+            now: Reference time (default: datetime.now())
+
+        Returns:
+            (member_id, rental_key, old_days, new_days) per changed rental
+        """
+        now_ts = (now or datetime.now()).timestamp()
+        changes = []
+        with self._lock:
+            while self._fee_due and self._fee_due[0][0] < now_ts:
+                _, member_id, key, start_ts = heapq.heappop(self._fee_due)
+                if not self._live(start_ts, member_id, key):
+                    continue
+                days = math.ceil((now_ts - start_ts) / DAY_SECONDS)
+                old_days = self.days.get((member_id, key), 0)
+                if days != old_days:
+                    self.days[(member_id, key)] = days
+                    self.outstanding_days += days - old_days
+                    changes.append((member_id, key, old_days, days))
+                # The count goes up again just after start + days whole days
+                heapq.heappush(self._fee_due, (start_ts + days * DAY_SECONDS, member_id, key, start_ts))
+        return changes
+
+    def __len__(self) -> int:
+        return self._active
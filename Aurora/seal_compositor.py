@@ -3,10 +3,13 @@ Aurora Archive - RedSeal Compositor
 Embeds account data into RedSeal.png, then composites onto card bottom-left corner
 
 Process:
-1. Resize RedSeal.png to 100x100px
+1. Resize RedSeal.png to 100x100px (once per compositor)
 2. Embed member data INTO the seal using steganography
 3. Composite the embedded seal onto bottom-left of card image
 
+Every step works on in-memory images, so concurrent signups never share a
+temporary file.
+
 Python 3.10+
 Dependencies: Pillow, mutable_steganography
 """
@@ -16,8 +19,11 @@ from pathlib import Path
 from typing import Dict, Optional
 from PIL import Image
 from mutable_steganography import MutableCardSteganography
+from card_cache import CardDataCache
 
 # Setup logging
+Path('logs').mkdir(exist_ok=True)
+
 logging.basicConfig(
     level=logging.DEBUG,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -44,6 +50,7 @@ class SealCompositor:
         else:
             self.seal_path = Path(__file__).parent / 'data' / 'RedSeal.png'
         self.stego = MutableCardSteganography()
+        self._resized_seal = None  # Loaded on first use by _get_resized_seal
         
         # Ensure seal exists
         if not self.seal_path.exists():
@@ -90,6 +97,9 @@ class SealCompositor:
         """
         Complete workflow: Embed data in seal, then composite onto card
         
+        The seal is resized, embedded and composited in memory; the only file
+        written is the final card.
+        
         Args:
             card_path: Path to base card image (512x768)
             member_data: Complete member account data to embed
@@ -102,15 +112,15 @@ class SealCompositor:
             logger.info(f"Starting seal embedding and compositing for card: {card_path}")
             
             # Step 1: Create embedded seal
-            embedded_seal_path = self._create_embedded_seal(member_data)
-            if not embedded_seal_path:
+            embedded_seal = self._create_embedded_seal(member_data)
+            if embedded_seal is None:
                 logger.error("Failed to create embedded seal")
                 return None
             
             # Step 2: Composite seal onto card
             final_card_path = self._composite_seal_on_card(
                 card_path,
-                embedded_seal_path,
+                embedded_seal,
                 output_path
             )
             
@@ -125,29 +135,34 @@ class SealCompositor:
             logger.error(f"Error in embed_and_composite: {e}", exc_info=True)
             return None
     
-    def _create_embedded_seal(self, member_data: Dict) -> Optional[str]:
+    def _get_resized_seal(self) -> Image.Image:
         """
-        Step 1: Embed member data into RedSeal
+        RedSeal resized to SEAL_SIZE, loaded once per compositor
         
         Returns:
-            Path to temporary embedded seal image
+            Shared RGB image - callers must not modify it
         """
-        try:
-            # Load original seal
-            seal_img = Image.open(str(self.seal_path))
-            
-            # Resize to 25x25 (LANCZOS for quality)
-            seal_resized = seal_img.resize(self.SEAL_SIZE, Image.Resampling.LANCZOS)
-            
-            # Save temporary resized seal
-            temp_seal_path = self.seal_path.parent / "Redseal.png"
-            seal_resized.save(str(temp_seal_path), 'PNG')
+        if self._resized_seal is None:
+            with Image.open(str(self.seal_path)) as seal_img:
+                # Resize to SEAL_SIZE (LANCZOS for quality)
+                seal_resized = seal_img.resize(self.SEAL_SIZE, Image.Resampling.LANCZOS)
             
+            # The embedded seal is stored as opaque RGB, as the LSB data needs
+            self._resized_seal = seal_resized.convert('RGB')
             logger.debug(f"Resized seal to {self.SEAL_SIZE}")
-            
+        
+        return self._resized_seal
+    
+    def _create_embedded_seal(self, member_data: Dict) -> Optional[Image.Image]:
+        """
+        Step 1: Embed member data into RedSeal
+        
+        Returns:
+            Embedded seal image (RGB, SEAL_SIZE), or None on failure
+        """
+        try:
             # Embed member data into the seal using steganography
-            # Note: 25x25 = 625 pixels * 3 channels = 1875 bits ≈ 234 bytes capacity
-            # We need to compress the data or use minimal fields
+            # Note: 100x100 = 10,000 pixels * 3 channels = 30,000 bits ≈ 3.7 KB capacity
             
             # Create compact data for seal embedding
             compact_data = {
@@ -158,18 +173,12 @@ class SealCompositor:
                 "seal_version": "1.0"
             }
             
-            # Embed into seal
-            embedded_seal_path = self.seal_path.parent / "Redseal_embedded.png"
-            self.stego.embed_data(
-                str(temp_seal_path),
-                compact_data,
-                str(embedded_seal_path),
-                force_overwrite=True
-            )
+            # Embed into a copy of the cached seal
+            embedded_seal = self.stego.embed_image_data(self._get_resized_seal(), compact_data)
             
-            logger.debug(f"Embedded data into seal: {embedded_seal_path}")
+            logger.debug("Embedded data into seal")
             
-            return str(embedded_seal_path)
+            return embedded_seal
             
         except Exception as e:
             logger.error(f"Error creating embedded seal: {e}", exc_info=True)
@@ -178,7 +187,7 @@ class SealCompositor:
     def _composite_seal_on_card(
         self,
         card_path: str,
-        seal_path: str,
+        seal_img: Image.Image,
         output_path: Optional[str] = None
     ) -> Optional[str]:
         """
@@ -186,16 +195,16 @@ class SealCompositor:
         
         Args:
             card_path: Base card image (512x768)
-            seal_path: Embedded seal image (25x25)
+            seal_img: Embedded seal image (100x100, opaque)
             output_path: Where to save (default: overwrites card_path)
         
         Returns:
             Path to final composited card
         """
         try:
-            # Load card and seal
-            card_img = Image.open(card_path).convert('RGBA')
-            seal_img = Image.open(seal_path).convert('RGBA')
+            # Load card
+            with Image.open(card_path) as img:
+                card_img = img.convert('RGBA')
             
             card_width, card_height = card_img.size
             seal_width, seal_height = seal_img.size
@@ -206,8 +215,8 @@ class SealCompositor:
             
             logger.debug(f"Compositing seal at position ({x_pos}, {y_pos})")
             
-            # Composite seal onto card (alpha blending)
-            card_img.paste(seal_img, (x_pos, y_pos), seal_img)
+            # The seal is opaque, so a plain paste keeps its LSBs exact
+            card_img.paste(seal_img, (x_pos, y_pos))
             
             # Save final card
             if output_path is None:
@@ -215,6 +224,7 @@ class SealCompositor:
             
             # Convert back to RGB if needed (PNG supports RGBA)
             card_img.save(output_path, 'PNG')
+            self.stego.cache.invalidate(output_path)
             
             logger.info(f"Composited seal onto card: {output_path}")
             
@@ -235,11 +245,17 @@ class SealCompositor:
             Extracted seal data or None if not found/invalid
         """
         try:
+            stamp = CardDataCache.file_stamp(card_path)
+            cached = self.stego.cache.get(card_path, kind="seal", stamp=stamp)
+            if cached is not None:
+                return cached
+            
             # Load card
-            card_img = Image.open(card_path).convert('RGBA')
+            with Image.open(card_path) as img:
+                card_img = img.convert('RGBA')
             card_width, card_height = card_img.size
             
-            # Extract seal region (bottom-left 25x25)
+            # Extract seal region (bottom-left 100x100)
             x_pos = self.SEAL_POSITION[0]
             y_pos = card_height - self.SEAL_SIZE[1] - 10
             
@@ -250,12 +266,10 @@ class SealCompositor:
                 y_pos + self.SEAL_SIZE[1]
             ))
             
-            # Save temporary seal
-            temp_seal_path = self.seal_path.parent / "Redseal_extracted.png"
-            seal_region.save(str(temp_seal_path), 'PNG')
-            
-            # Extract data from seal
-            seal_data = self.stego.extract_data(str(temp_seal_path))
+            # Extract data from seal (in memory: a shared temp file races
+            # when several processes validate at once)
+            seal_data = self.stego.extract_image_data(seal_region)
+            self.stego.cache.put(card_path, seal_data, kind="seal", stamp=stamp)
             
             logger.info(f"Extracted seal data from card: {card_path}")
             
@@ -0,0 +1,374 @@
+"""
+Aurora Archive - Shared Context Views
+Materialized "recent events" rings for shared memory, updated as events
+are stored
+
+    memory/views/pool-{tier}.jsonl          pooled members at that access tier
+    memory/views/trusted-{thread_id}.jsonl  a trusted-mode member plus everyone they trust
+    memory/views/registry.json              view -> member thread_ids
+
+A view file holds the newest events of all its member threads, oldest
+first, each tagged with "_from_thread" like load_shared_context() output.
+store_user_event() appends every event to each view its thread belongs
+to, so a shared context load whose threads are exactly a view's members
+is one tail read of that file instead of a merge over every thread.
+
+Views are rebuilt from the member threads (merge_newest) when membership
+changes: DatabaseManager reports sharing mode, trust, tier changes and
+deletions to its sharing listeners, and refresh_members() recomputes the
+affected views. A view is trimmed back to its newest
+`depth` events once its file outgrows `max_bytes`; reads deeper than
+`depth` fall back to the merge.
+
+View appends, trims and rebuilds hold one inter-process lock, and an
+appender re-reads the registry under it, so an event never lands in a
+view its thread has just left. An event stored while its view is being
+rebuilt can be both merged in and appended; reads drop the duplicate by
+event_id.
+
+Python 3.10+
+Dependencies: none
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from atomic_store import atomic_write_bytes, atomic_write_json
+from event_cache import RecentEventCache
+from file_lock import InterProcessLock
+from jsonl_tail import iter_lines_reverse, tail_jsonl
+from member_index import pool_tier
+from thread_segments import merge_newest
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_DEPTH = 500
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+MIN_VIEW_THREADS = 2  # A member alone needs no view
+
+
+def pool_view_key(tier: int) -> str:
+    return f"pool-{tier}"
+
+
+def trusted_view_key(thread_id: str) -> str:
+    return f"trusted-{thread_id}"
+
+
+class SharedContextViews:
+    """
+    Per-pool / per-trust-circle event rings under memory/views
+
+    Usage:
+        views = SharedContextViews(Path("memory"))
+        views.refresh_members(db, [member_id])         # After a sharing change
+        views.append(thread_id, *events)               # From store_user_event(s)
+        views.recent(db.get_accessible_thread_ids(member_id), 50)
+    """
+
+    def __init__(
+        self,
+        memory_dir=Path("memory"),
+        depth: int = DEFAULT_DEPTH,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        cache: Optional[RecentEventCache] = None
+    ):
+        """
+        Args:
+            memory_dir: Memory root (threads/ is read, views/ is written)
+            depth: Events a view always keeps (deeper reads return None)
+            max_bytes: Trim a view file back to `depth` events past this size
+            cache: Recent-event cache to serve view reads from (optional)
+        """
+        self.memory_dir = Path(memory_dir)
+        self.threads_dir = self.memory_dir / "threads"
+        self.views_dir = self.memory_dir / "views"
+        self.registry_path = self.views_dir / "registry.json"
+        self.depth = depth
+        self.max_bytes = max_bytes
+        self.cache = cache
+        self.views_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = InterProcessLock(self.views_dir / ".lock")
+        self._state_lock = threading.Lock()
+        self._registry_stamp = None
+        self._views: Dict[str, List[str]] = {}
+        self._by_thread: Dict[str, List[str]] = {}
+        self._by_members: Dict[frozenset, str] = {}
+        self._trim_at: Dict[str, int] = {}
+
+        # Diagnostics
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key: str) -> Path:
+        return self.views_dir / f"{key}.jsonl"
+
+    # ============================================
+    # REGISTRY
+    # ============================================
+
+    def _load_registry(self):
+        """(Re)read registry.json if another process changed it"""
+        try:
+            stat = os.stat(self.registry_path)
+            stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            stamp = None
+        with self._state_lock:
+            if stamp == self._registry_stamp:
+                return
+            views = {}
+            if stamp is not None:
+                with open(self.registry_path, 'r', encoding='utf-8') as f:
+                    views = json.load(f).get('views', {})
+            self._set_views(views, stamp)
+
+    def _save_registry(self, views: Dict[str, List[str]]):
+        atomic_write_json(self.registry_path, {"version": 1, "views": views}, ensure_ascii=False)
+        stat = os.stat(self.registry_path)
+        with self._state_lock:
+            self._set_views(views, (stat.st_ino, stat.st_mtime_ns, stat.st_size))
+
+    def _set_views(self, views: Dict[str, List[str]], stamp):
+        by_thread: Dict[str, List[str]] = {}
+        for key, thread_ids in views.items():
+            for thread_id in thread_ids:
+                by_thread.setdefault(thread_id, []).append(key)
+        self._views = views
+        self._by_thread = by_thread
+        self._by_members = {frozenset(thread_ids): key for key, thread_ids in views.items()}
+        self._registry_stamp = stamp
+
+    def views_for_thread(self, thread_id: str) -> List[str]:
+        """Views a thread's events are appended to"""
+        self._load_registry()
+        return list(self._by_thread.get(thread_id, []))
+
+    def view_for(self, thread_ids: Iterable[str]) -> Optional[str]:
+        """The view whose members are exactly these threads, if any"""
+        self._load_registry()
+        return self._by_members.get(frozenset(thread_id for thread_id in thread_ids if thread_id))
+
+    # ============================================
+    # WRITING
+    # ============================================
+
+    def append(self, thread_id: str, *events: Dict):
+        """Add stored events to every view their thread belongs to (one write per view)"""
+        if not events or not self.views_for_thread(thread_id):
+            return  # Common case: one stat() of the registry
+        tagged = [dict(event, _from_thread=thread_id) for event in events]
+        lines = [(json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8') for event in tagged]
+        data = b''.join(lines)
+        with self._lock:
+            for key in self.views_for_thread(thread_id):  # Membership as of now (rebuilds hold the lock)
+                path = self.path(key)
+                with open(path, 'ab') as f:
+                    f.write(data)
+                    end_offset = f.tell()
+                if self.cache is not None:
+                    offset = end_offset - len(data)
+                    for event, line in zip(tagged, lines):
+                        offset += len(line)
+                        self.cache.appended(path, event, len(line), offset)
+                if end_offset > self._trim_at.get(key, self.max_bytes):
+                    self._trim(key)
+
+    def _trim(self, key: str):
+        """Rewrite a view with only its newest `depth` events (lock held)"""
+        path = self.path(key)
+        newest = []
+        for line in iter_lines_reverse(path):
+            newest.append(line + b'\n')
+            if len(newest) >= self.depth:
+                break
+        data = b''.join(reversed(newest))
+        atomic_write_bytes(path, data, fsync=False)
+        # Events larger than max_bytes / depth would otherwise trim on every append
+        self._trim_at[key] = max(self.max_bytes, 2 * len(data))
+
+    def set_view(self, key: str, thread_ids: Iterable[str], force: bool = False) -> bool:
+        """
+        Define a view's member threads and rebuild its file from them
+
+        Args:
+            key: View name (pool_view_key / trusted_view_key)
+            thread_ids: Member threads (fewer than two drops the view)
+            force: Rebuild even if membership is unchanged
+
+        Returns:
+            True if the view was (re)built
+        """
+        members = sorted({thread_id for thread_id in thread_ids if thread_id})
+        if len(members) < MIN_VIEW_THREADS:
+            self.drop_view(key)
+            return False
+        path = self.path(key)
+        with self._lock:
+            self._load_registry()
+            if not force and self._views.get(key) == members and path.exists():
+                return False
+            # Writers fan out to the new membership from here on; they wait
+            # on the lock, so their events land after the rebuilt content
+            views = dict(self._views)
+            views[key] = members
+            self._save_registry(views)
+
+            lines = []
+            merged = merge_newest(self.threads_dir, members)
+            try:
+                for thread_id, line in merged:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    event['_from_thread'] = thread_id
+                    lines.append((json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8'))
+                    if len(lines) >= self.depth:
+                        break
+            finally:
+                merged.close()
+            atomic_write_bytes(path, b''.join(reversed(lines)), fsync=False)
+            self._trim_at.pop(key, None)
+        if self.cache is not None:
+            self.cache.invalidate(path)
+        logger.info(f"Rebuilt shared view {key} ({len(members)} threads, {len(lines)} events)")
+        return True
+
+    def drop_view(self, key: str):
+        """Forget a view and delete its file"""
+        path = self.path(key)
+        with self._lock:
+            self._load_registry()
+            if key in self._views:
+                views = dict(self._views)
+                del views[key]
+                self._save_registry(views)
+            if path.exists():
+                path.unlink()
+            self._trim_at.pop(key, None)
+        if self.cache is not None:
+            self.cache.invalidate(path)
+
+    # ============================================
+    # MEMBERSHIP
+    # ============================================
+
+    def refresh_members(self, db, member_ids: Iterable[str]):
+        """
+        Rebuild the views whose membership these members' sharing settings decide
+
+        A pool view holds the pooled members at one access tier: what a
+        member pooling at that tier reads (pooled_tier, else access_tier,
+        as in get_accessible_thread_ids).
+
+        Args:
+            db: DatabaseManager
+            member_ids: Members whose sharing mode, tier or trusted users
+                changed, or who were deleted
+        """
+        pools = set()
+        deleted = False
+        for member_id in member_ids:
+            member = db.get_member(member_id)
+            if not member:
+                deleted = True
+                continue
+            thread_id = member.get('thread_id')
+            tier = member.get('access_tier', 1)
+            mode = member.get('memory_sharing_mode', 'isolated')
+            if mode == 'trusted' and tier >= 4:
+                self.set_view(trusted_view_key(thread_id), db.get_accessible_thread_ids(member_id))
+            else:
+                self.drop_view(trusted_view_key(thread_id))
+            if mode == 'pooled':
+                pools.add(tier)  # The pool the member's thread belongs to
+                pools.add(pool_tier(member))  # The pool the member reads
+            # Pools the member was in before the change
+            pools.update(int(key[len("pool-"):]) for key in self.views_for_thread(thread_id) if key.startswith("pool-"))
+        if deleted:
+            pools.update(self._refresh_orphaned(db))
+        for tier in pools:
+            self.set_view(pool_view_key(tier), [member.get('thread_id') for member in db.get_members_by_tier(tier, 'pooled')])
+
+    def _refresh_orphaned(self, db) -> List[int]:
+        """Rebuild trusted views holding a deleted member's thread; returns such pool tiers"""
+        self._load_registry()
+        pools = []
+        for key, thread_ids in list(self._views.items()):
+            if all(db.get_member_by_thread_id(thread_id) for thread_id in thread_ids):
+                continue
+            if key.startswith("pool-"):
+                pools.append(int(key[len("pool-"):]))
+                continue
+            owner = db.get_member_by_thread_id(key[len("trusted-"):])
+            if owner:
+                self.set_view(key, db.get_accessible_thread_ids(owner.get('member_id') or owner.get('id')))
+            else:
+                self.drop_view(key)
+        return pools
+
+    def refresh_all(self, db):
+        """
+        Bring every view in line with the database (cheap when nothing changed)
+
+        Only trusted and pooled members are read, through the sharing-mode
+        index, so this costs nothing per isolated member.
+        """
+        member_ids = [
+            member.get('member_id') or member.get('id')
+            for mode in ('trusted', 'pooled')
+            for member in db.get_members_by_sharing_mode(mode)
+        ]
+        self.refresh_members(db, member_ids)
+
+    def refresh_thread(self, thread_id: str):
+        """Rebuild every view containing a thread whose history was rewritten (e.g. cleared)"""
+        self._load_registry()
+        for key in self.views_for_thread(thread_id):
+            self.set_view(key, self._views.get(key, []), force=True)
+
+    # ============================================
+    # READING
+    # ============================================
+
+    def recent(self, thread_ids: Iterable[str], n: Optional[int]) -> Optional[List[Dict]]:
+        """
+        Newest `n` events across threads, from the view they make up
+
+        Args:
+            thread_ids: Threads the caller may read (must match a view exactly)
+            n: Events wanted
+
+        Returns:
+            Events newest first (tagged with _from_thread), or None if no
+            view matches or `n` is beyond the view depth (caller merges)
+        """
+        if n is None or n <= 0 or n > self.depth:
+            return None
+        key = self.view_for(thread_ids)
+        if key is None or not self.path(key).exists():
+            self.misses += 1
+            return None
+        self.hits += 1
+        path = self.path(key)
+        for want in (n, 2 * n):  # Read further if a rebuild left duplicates
+            raw = self.cache.recent(path, want) if self.cache is not None else None
+            if raw is None:
+                raw = tail_jsonl(path, want)
+            events, seen = [], set()
+            for event in raw:
+                event_id = event.get('event_id')
+                if event_id is not None:
+                    if event_id in seen:
+                        continue
+                    seen.add(event_id)
+                events.append(event)
+            if len(events) >= n or len(raw) < want:
+                break
+        return events[:n]
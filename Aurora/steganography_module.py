@@ -3,15 +3,20 @@ Aurora Archive - Steganography Module
 Embeds and extracts member data from card images using LSB steganography
 
 Python 3.10+
-Dependencies: Pillow, cryptography (optional for encryption)
+Dependencies: Pillow, NumPy, cryptography (optional for encryption),
+              msgpack/zstandard (optional, opt-in compact v2 payloads)
 """
 
 import json
 import hashlib
+import os
 from PIL import Image
 from typing import Dict, Optional, Tuple
 from pathlib import Path
 
+import lsb_codec
+import payload_format
+
 card_image_path = Path("Desktop/Redverse/Sables_Room/test_card_embedded.png")
 
 
@@ -44,13 +49,30 @@ class CardSteganography:
     # Embed in first N pixels for fast extraction (100x100 = 30KB capacity)
     EMBED_REGION_SIZE = 100
     
-    def __init__(self, use_encryption: bool = False):
+    # Written payload format (see payload_format.py); v1 and v2 are both readable
+    PAYLOAD_VERSION = 2
+    
+    def __init__(
+        self,
+        use_encryption: bool = False,
+        payload_version: int = PAYLOAD_VERSION,
+        compact_payloads: Optional[bool] = None
+    ):
         """
         Initialize steganography system
         
         Args:
             use_encryption: If True, encrypt data before embedding (requires cryptography lib)
+            payload_version: 2 for the compact binary format, 1 for legacy JSON.
+                Encrypted payloads are always written as v1.
+            compact_payloads: Write v2 bodies with msgpack / zstd when installed.
+                Cards written this way need them to be read
+                (default: $AURORA_COMPACT_PAYLOADS, else off: JSON + deflate)
         """
+        if compact_payloads is None:
+            compact_payloads = os.getenv('AURORA_COMPACT_PAYLOADS', '').lower() in ('1', 'true', 'yes')
+        self.payload_version = payload_version
+        self.compact_payloads = compact_payloads
         self.use_encryption = use_encryption
         self.cipher = None
         
@@ -90,71 +112,41 @@ class CardSteganography:
         try:
             # Load image
             img = Image.open(card_image_path).convert('RGB')
-            pixels = img.load()
             width, height = img.size
             
-            # Prepare data
-            json_data = json.dumps(member_data, separators=(',', ':'))
-            
-            # Add checksum for corruption detection
-            checksum = hashlib.md5(json_data.encode()).hexdigest()[:8]
-            
-            # Build full payload: MAGIC + LENGTH + CHECKSUM + DATA
-            full_data = f"{self.MAGIC_HEADER}{checksum}{json_data}"
-            
-            # Optional encryption
-            if self.use_encryption:
-                full_data = self._encrypt(full_data)
-            
-            # Convert to binary
-            binary_data = ''.join(format(ord(char), '08b') for char in full_data)
-            data_length = len(binary_data)
-            
-            # Add 32-bit length header
-            length_header = format(len(json_data), '032b')
-            full_binary = length_header + binary_data
+            if self.payload_version >= 2 and not self.use_encryption:
+                # Compact binary frame: magic + flags + varint length + CRC32 + body
+                full_binary = lsb_codec.encode_bytes(
+                    payload_format.encode_v2(member_data, compact=self.compact_payloads)
+                )
+            else:
+                # Prepare data
+                json_data = json.dumps(member_data, separators=(',', ':'))
+                
+                # Add checksum for corruption detection
+                checksum = hashlib.md5(json_data.encode()).hexdigest()[:8]
+                
+                # Build full payload: MAGIC + LENGTH + CHECKSUM + DATA
+                full_data = f"{self.MAGIC_HEADER}{checksum}{json_data}"
+                
+                # Optional encryption
+                if self.use_encryption:
+                    full_data = self._encrypt(full_data)
+                
+                # Convert to bit frame: 32-bit length header + 8 bits per char
+                full_binary = lsb_codec.encode_frame(len(json_data), full_data.encode('latin-1'))
             
             # Check capacity
-            max_region_width = min(self.EMBED_REGION_SIZE, width)
-            max_region_height = min(self.EMBED_REGION_SIZE, height)
+            region_size = self.EMBED_REGION_SIZE if region_only else None
+            available_bits = lsb_codec.region_capacity_bits((width, height), region_size)
             
-            if region_only:
-                available_bits = max_region_width * max_region_height * 3
-            else:
-                available_bits = width * height * 3
-            
-            if len(full_binary) > available_bits:
+            if full_binary.size > available_bits:
                 raise InsufficientCapacityError(
-                    f"Data requires {len(full_binary)} bits but only {available_bits} available"
+                    f"Data requires {full_binary.size} bits but only {available_bits} available"
                 )
             
-            # Embed data
-            data_index = 0
-            embed_height = max_region_height if region_only else height
-            embed_width = max_region_width if region_only else width
-            
-            for y in range(embed_height):
-                for x in range(embed_width):
-                    if data_index >= len(full_binary):
-                        break
-                    
-                    r, g, b = pixels[x, y]
-                    
-                    # Modify LSB of each channel
-                    if data_index < len(full_binary):
-                        r = (r & 0xFE) | int(full_binary[data_index])
-                        data_index += 1
-                    if data_index < len(full_binary):
-                        g = (g & 0xFE) | int(full_binary[data_index])
-                        data_index += 1
-                    if data_index < len(full_binary):
-                        b = (b & 0xFE) | int(full_binary[data_index])
-                        data_index += 1
-                    
-                    pixels[x, y] = (r, g, b)
-                
-                if data_index >= len(full_binary):
-                    break
+            # Embed data (single masked write over the region's LSBs)
+            lsb_codec.embed_bits(img, full_binary, region_size)
             
             # Save image
             if output_path is None:
@@ -193,53 +185,36 @@ class CardSteganography:
             SteganographyError: If extraction fails
         """
         try:
-            # Load image
-            img = Image.open(card_image_path).convert('RGB')
-            pixels = img.load()
-            width, height = img.size
+            # Open image; pixels are decoded lazily, header first
+            region_size = self.EMBED_REGION_SIZE if region_only else None
+            reader = lsb_codec.FrameReader(Image.open(card_image_path), region_size)
             
-            # Determine extraction region
-            max_region_width = min(self.EMBED_REGION_SIZE, width)
-            max_region_height = min(self.EMBED_REGION_SIZE, height)
-            
-            extract_height = max_region_height if region_only else height
-            extract_width = max_region_width if region_only else width
-            
-            # Extract binary data
-            binary_data = ''
-            for y in range(extract_height):
-                for x in range(extract_width):
-                    r, g, b = pixels[x, y]
-                    
-                    # Extract LSB from each channel
-                    binary_data += str(r & 1)
-                    binary_data += str(g & 1)
-                    binary_data += str(b & 1)
-            
-            # Read length header (first 32 bits)
-            if len(binary_data) < 32:
+            # Read length header (first 32 bits / 11 pixels)
+            if reader.capacity_bits < lsb_codec.LENGTH_HEADER_BITS:
                 raise CorruptedDataError("Insufficient data in image")
             
-            data_length = int(binary_data[:32], 2)
+            # v2 frames replace the length header with their own magic
+            if payload_format.is_v2(reader.read_bytes(len(payload_format.V2_MAGIC))):
+                try:
+                    return payload_format.read_v2(reader.read_bytes, reader.bytes_available())
+                except payload_format.PayloadFormatError as e:
+                    raise CorruptedDataError(str(e))
             
-            # Calculate expected bits (length header + magic + checksum + data)
+            data_length = reader.read_length()
+            
+            # Calculate expected bytes (magic + checksum + data)
             # Magic = 12 chars, Checksum = 8 chars, Data = data_length chars
             expected_chars = 12 + 8 + data_length
-            expected_bits = expected_chars * 8
-            total_bits_needed = 32 + expected_bits
             
-            if len(binary_data) < total_bits_needed:
+            if expected_chars > reader.payload_bytes_available():
                 raise CorruptedDataError("Image does not contain complete data")
             
-            # Extract full payload
-            payload_binary = binary_data[32:total_bits_needed]
+            # Plaintext payloads can be rejected on the magic before the rest is read
+            if not self.use_encryption and not reader.payload_startswith(self.MAGIC_HEADER.encode()):
+                raise CorruptedDataError("Invalid magic header - not an Aurora card or data corrupted")
             
-            # Convert binary to text
-            payload = ''
-            for i in range(0, len(payload_binary), 8):
-                byte = payload_binary[i:i+8]
-                if len(byte) == 8:
-                    payload += chr(int(byte, 2))
+            # Convert payload bits to text
+            payload = reader.read_payload(expected_chars).decode('latin-1')
             
             # Optional decryption
             if self.use_encryption:
@@ -0,0 +1,532 @@
+"""
+Aurora Archive - Memory Thread Segments
+Fixed-size sealed segments and a manifest behind each memory thread
+
+    memory/threads/{thread_id}.jsonl                       active segment (appended to)
+    memory/threads/{thread_id}.segments/000001.jsonl[.gz]  sealed segments, oldest first
+    memory/threads/{thread_id}.segments/manifest.json      events / time range / bytes per segment
+
+Writers only ever append to the active file, exactly as before. The
+compactor (ThreadCompactor, run in the background by the memory API)
+seals an active file once it reaches `segment_bytes`: it is renamed to
+{thread_id}.segments/sealing.jsonl, split at line boundaries into
+segment_bytes-sized segments and recorded in the manifest. Segments whose
+file has not changed for `compress_after_s` are gzipped.
+
+Readers then touch only what they need: tail(n) reads the active file and
+as many sealed segments (newest first) as it takes to find n events, and
+stats() answers from the manifest plus the bounded active file.
+
+Writers hold the active file flock()ed shared from checking that the path
+still names their handle's inode until their write is done (see
+append_writer); the compactor renames it away only while holding it
+exclusively, so every append lands either in the sealing file or in the
+new active file. Without flock (Windows) the compactor instead waits
+SETTLE_S after renaming. A crash mid-seal is finished by the next seal
+of that thread; a sealing file already recorded in the manifest (crash
+before its unlink) is dropped, not sealed twice.
+
+Python 3.10+
+Dependencies: none
+"""
+
+import gzip
+import heapq
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from itertools import islice
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from atomic_store import atomic_write_bytes, atomic_write_json, fsync_directory
+from file_lock import FLOCK_AVAILABLE, InterProcessLock, flock_exclusive, flock_release
+from jsonl_tail import iter_lines_reverse
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SEGMENT_BYTES = 1024 * 1024
+DEFAULT_COMPRESS_AFTER_S = 24 * 3600
+SETTLE_S = 0.05  # Only without flock
+
+SEALING_NAME = "sealing.jsonl"
+MANIFEST_NAME = "manifest.json"
+
+
+TIMESTAMP_FIELD = b'"timestamp": "'
+
+
+def line_timestamp(line: bytes) -> Optional[str]:
+    """
+    An event line's timestamp, found without parsing the line when possible
+
+    store_user_event writes "timestamp" before any free text, and a quote
+    inside a JSON string is escaped, so the first match is the event's own.
+    """
+    start = line.find(TIMESTAMP_FIELD)
+    if start >= 0:
+        start += len(TIMESTAMP_FIELD)
+        end = line.find(b'"', start)
+        if end >= 0:
+            return line[start:end].decode('utf-8', 'replace')
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return record.get('timestamp') if isinstance(record, dict) else None
+
+
+class ThreadSegments:
+    """
+    One memory thread: its active JSONL file plus sealed segments
+
+    Usage:
+        thread = ThreadSegments(threads_dir / f"{thread_id}.jsonl")
+        thread.tail(10)      # Newest first, across segments
+        thread.stats()       # From the manifest, no scan
+        thread.seal()        # Compactor: move a full active file into segments
+    """
+
+    def __init__(self, path, segment_bytes: int = DEFAULT_SEGMENT_BYTES):
+        """
+        Args:
+            path: The thread's active JSONL file
+            segment_bytes: Seal the active file at this size; size of sealed segments
+        """
+        self.path = Path(path)
+        self.segments_dir = self.path.with_name(self.path.stem + ".segments")
+        self.manifest_path = self.segments_dir / MANIFEST_NAME
+        self.sealing_path = self.segments_dir / SEALING_NAME
+        self.segment_bytes = segment_bytes
+
+    # ============================================
+    # MANIFEST
+    # ============================================
+
+    def manifest(self) -> Dict:
+        """{"segments": [{name, events, first, last, bytes, stored_bytes}, ...]}"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"version": 1, "segments": []}
+
+    def _save_manifest(self, manifest: Dict):
+        atomic_write_json(self.manifest_path, manifest, ensure_ascii=False)
+
+    def exists(self) -> bool:
+        return self.path.exists() or self.manifest_path.exists()
+
+    # ============================================
+    # READING
+    # ============================================
+
+    def _open_segment(self, name: str):
+        path = self.segments_dir / name
+        try:
+            return gzip.open(path, 'rb') if path.suffix == '.gz' else open(path, 'rb')
+        except FileNotFoundError:
+            if path.suffix == '.gz':
+                raise
+            return gzip.open(path.with_name(name + '.gz'), 'rb')  # Compressed since the manifest was read
+
+    def _segment_lines_reverse(self, name: str) -> Iterator[bytes]:
+        """Lines of one sealed segment, last first"""
+        with self._open_segment(name) as f:
+            if isinstance(f, gzip.GzipFile):
+                for line in reversed(f.read().split(b'\n')):
+                    if line.strip():
+                        yield line
+            else:
+                yield from iter_lines_reverse(f)
+
+    def iter_reverse(self, include_active: bool = True, skip_ino: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Raw lines of the thread, newest first, read lazily
+
+        The manifest, the active file and a half-finished seal are all
+        opened on the first next(), so a seal running while the caller
+        consumes lines neither hides nor repeats events.
+
+        Args:
+            include_active: Start with the active file (False = sealed events only)
+            skip_ino: Inode of an active file the caller has already read
+
+        Yields:
+            JSON lines without their newline
+        """
+        handles = []
+        try:
+            manifest = self.manifest()
+            paths = [self.path, self.sealing_path] if include_active else [self.sealing_path]
+            handles.extend(self._unsealed(paths, manifest, skip_ino))
+            for f in handles:
+                yield from iter_lines_reverse(f)
+            for segment in reversed(manifest['segments']):
+                yield from self._segment_lines_reverse(segment['name'])
+        finally:
+            for f in handles:
+                f.close()
+
+    def _unsealed(self, paths: List[Path], manifest: Dict, skip_ino: Optional[int] = None) -> List:
+        """
+        Open the given active / sealing files, leaving out content already
+        sealed: a sealing.jsonl recorded in the manifest (found before its
+        unlink) and the file with inode `skip_ino`
+
+        Returns:
+            Open binary files (the caller closes them)
+        """
+        files = []
+        seen = {skip_ino}
+        for path in paths:
+            try:
+                f = open(path, 'rb')
+            except FileNotFoundError:
+                continue
+            ino = os.fstat(f.fileno()).st_ino
+            if ino in seen or (path == self.sealing_path and ino == manifest.get('sealed_ino')):
+                f.close()
+                continue
+            seen.add(ino)
+            files.append(f)
+        return files
+
+    def lines_reverse(self, limit: Optional[int] = None, include_active: bool = True,
+                      skip_ino: Optional[int] = None) -> List[bytes]:
+        """Newest `limit` raw lines (None = all); see iter_reverse()"""
+        if limit is not None and limit <= 0:
+            return []
+        lines = self.iter_reverse(include_active, skip_ino)
+        try:
+            return list(islice(lines, limit))
+        finally:
+            lines.close()
+
+    def tail(self, n: Optional[int]) -> List[Dict]:
+        """
+        Last `n` events, newest first
+
+        Args:
+            n: Events to return (None = the whole thread)
+
+        Returns:
+            Decoded events (unparseable lines skipped)
+        """
+        events = []
+        for line in self.lines_reverse(n):
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+        return events
+
+    def stats(self) -> Dict:
+        """
+        Event count, size and time range without reading sealed segments
+
+        Returns:
+            Dict with events, bytes (on disk), segments, first_event, last_event
+        """
+        manifest = self.manifest()
+        segments = manifest['segments']
+        events = sum(segment['events'] for segment in segments)
+        stored = sum(segment['stored_bytes'] for segment in segments)
+        first = segments[0]['first'] if segments else None
+        last = segments[-1]['last'] if segments else None
+
+        for f in self._unsealed([self.sealing_path, self.path], manifest):  # Unsealed tail, bounded by segment_bytes
+            with f:
+                data = f.read()
+            stored += len(data)
+            lines = [line for line in data.split(b'\n') if line.strip()]
+            events += len(lines)
+            if lines:
+                first = first or line_timestamp(lines[0])
+                last = line_timestamp(lines[-1]) or last
+        return {
+            "events": events,
+            "bytes": stored,
+            "segments": len(segments),
+            "first_event": first,
+            "last_event": last,
+        }
+
+    # ============================================
+    # COMPACTION
+    # ============================================
+
+    def _lock(self) -> InterProcessLock:
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        return InterProcessLock(self.segments_dir / ".lock")
+
+    def seal(self, force: bool = False) -> int:
+        """
+        Move the active file into sealed segments
+
+        Args:
+            force: Seal even if the active file is below segment_bytes
+
+        Returns:
+            Number of segments written
+        """
+        try:
+            size = os.stat(self.path).st_size
+        except FileNotFoundError:
+            size = 0
+        if not self.sealing_path.exists() and (not size or (size < self.segment_bytes and not force)):
+            return 0
+        lock = self._lock()
+        try:
+            with lock:
+                written = self._finish_seal()  # A seal interrupted by a crash
+                try:
+                    size = os.stat(self.path).st_size
+                except FileNotFoundError:
+                    size = 0
+                if size and (force or size >= self.segment_bytes):
+                    self._rotate_active()
+                    written += self._finish_seal()
+                return written
+        finally:
+            lock.close()
+
+    def _rotate_active(self):
+        """Rename the active file to sealing.jsonl once no append is in flight"""
+        with open(self.path, 'rb') as active:
+            flock_exclusive(active)  # Waits out writers holding it shared
+            try:
+                os.replace(self.path, self.sealing_path)
+                with open(self.path, 'ab'):
+                    pass  # Keep the active file's existence for readers
+            finally:
+                flock_release(active)  # Waiting writers now find the new inode and reopen
+        fsync_directory(self.path.parent)
+        if not FLOCK_AVAILABLE:
+            time.sleep(SETTLE_S)  # Appends already holding the old file land in it
+
+    def _finish_seal(self) -> int:
+        """Split sealing.jsonl into segments and record them (idempotent after a crash)"""
+        manifest = self.manifest()
+        try:
+            ino = os.stat(self.sealing_path).st_ino
+        except FileNotFoundError:
+            ino = None
+        if 'sealed_ino' in manifest and ino != manifest['sealed_ino']:
+            del manifest['sealed_ino']  # Its file is gone; the inode number may be reused
+            self._save_manifest(manifest)
+        if ino is None:
+            return 0
+        if ino == manifest.get('sealed_ino'):
+            self.sealing_path.unlink()  # Sealed and recorded, crashed before the unlink
+            fsync_directory(self.segments_dir)
+            return 0
+        known = {segment['name'] for segment in manifest['segments']}
+        for stray in self.segments_dir.glob("[0-9]*.jsonl*"):
+            if stray.name not in known:
+                stray.unlink()  # Written by the interrupted seal, not yet in the manifest
+
+        number = len(manifest['segments'])
+        chunk: List[bytes] = []
+        chunk_bytes = 0
+        written = 0
+
+        def flush():
+            nonlocal number, chunk, chunk_bytes, written
+            lines = [line for line in chunk if line.strip()]
+            if lines:
+                number += 1
+                name = f"{number:06d}.jsonl"
+                data = b''.join(chunk)
+                atomic_write_bytes(self.segments_dir / name, data, fsync=False)
+                manifest['segments'].append({
+                    "name": name,
+                    "events": len(lines),
+                    "first": line_timestamp(lines[0]),
+                    "last": line_timestamp(lines[-1]),
+                    "bytes": len(data),
+                    "stored_bytes": len(data),
+                })
+                written += 1
+            chunk, chunk_bytes = [], 0
+
+        with open(self.sealing_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    line += b'\n'  # Torn by a crash; kept, and skipped as invalid JSON by readers
+                chunk.append(line)
+                chunk_bytes += len(line)
+                if chunk_bytes >= self.segment_bytes:
+                    flush()
+        flush()
+
+        for segment in manifest['segments'][-written:] if written else []:
+            with open(self.segments_dir / segment['name'], 'rb') as f:
+                os.fsync(f.fileno())
+        # Readers that still find sealing.jsonl before it is unlinked skip it by inode
+        manifest['sealed_ino'] = ino
+        self._save_manifest(manifest)
+        self.sealing_path.unlink()
+        fsync_directory(self.segments_dir)
+        return written
+
+    def compress(self, older_than_s: float = DEFAULT_COMPRESS_AFTER_S) -> int:
+        """
+        gzip sealed segments not modified for `older_than_s`
+
+        Returns:
+            Number of segments compressed
+        """
+        if not self.manifest_path.exists():
+            return 0
+        cutoff = time.time() - older_than_s
+        lock = self._lock()
+        try:
+            with lock:
+                manifest = self.manifest()
+                compressed = 0
+                for segment in manifest['segments']:
+                    plain = self.segments_dir / segment['name']
+                    if plain.suffix == '.gz' or plain.stat().st_mtime > cutoff:
+                        continue
+                    target = plain.with_name(plain.name + '.gz')
+                    temp = target.with_name(target.name + '.tmp')
+                    with open(plain, 'rb') as source, gzip.open(temp, 'wb') as sink:
+                        shutil.copyfileobj(source, sink)
+                    os.replace(temp, target)
+                    segment['name'] = target.name
+                    segment['stored_bytes'] = target.stat().st_size
+                    compressed += 1
+                if compressed:
+                    self._save_manifest(manifest)  # Readers switch to the .gz names...
+                    for segment in manifest['segments']:
+                        if segment['name'].endswith('.gz'):
+                            plain = self.segments_dir / segment['name'][:-3]
+                            if plain.exists():
+                                plain.unlink()  # ...before the plain copies go
+                return compressed
+        finally:
+            lock.close()
+
+    def remove(self):
+        """Delete the thread's active file and every sealed segment"""
+        if self.path.exists():
+            self.path.unlink()
+        if self.segments_dir.exists():
+            shutil.rmtree(self.segments_dir)
+
+
+def merge_newest(threads_dir, thread_ids: Iterable[str]) -> Iterator[Tuple[str, bytes]]:
+    """
+    Lines of several threads, newest first across all of them
+
+    Each thread is streamed newest first (iter_reverse) and the streams are
+    merged on line_timestamp() with heapq.merge, so a thread is read only as
+    far back as the merge reaches and no line is parsed here.
+
+    Args:
+        threads_dir: Directory of {thread_id}.jsonl files
+        thread_ids: Threads to merge
+
+    Yields:
+        (thread_id, raw JSON line)
+    """
+    streams = [_timestamped_lines(ThreadSegments(Path(threads_dir) / f"{thread_id}.jsonl"), thread_id)
+               for thread_id in thread_ids]
+    try:
+        for _, thread_id, line in heapq.merge(*streams, key=itemgetter(0), reverse=True):
+            yield thread_id, line
+    finally:
+        for stream in streams:
+            stream.close()
+
+
+def _timestamped_lines(thread: ThreadSegments, thread_id: str) -> Iterator[Tuple[str, str, bytes]]:
+    """(timestamp, thread_id, raw line) newest first; a thread that fails to read just ends"""
+    lines = thread.iter_reverse()
+    try:
+        for line in lines:
+            yield line_timestamp(line) or '', thread_id, line
+    except Exception as e:
+        logger.warning(f"Error reading thread {thread_id}: {e}")
+    finally:
+        lines.close()
+
+
+class ThreadCompactor:
+    """
+    Background sealing and compression for every thread in a directory
+
+    Usage:
+        compactor = ThreadCompactor(Path("memory/threads"), interval_s=300)
+        compactor.start()
+    """
+
+    def __init__(
+        self,
+        threads_dir,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        compress_after_s: float = DEFAULT_COMPRESS_AFTER_S,
+        interval_s: float = 300
+    ):
+        """
+        Args:
+            threads_dir: Directory of {thread_id}.jsonl files
+            segment_bytes: Seal active files at this size
+            compress_after_s: gzip segments untouched this long (0 = never compress)
+            interval_s: Seconds between passes
+        """
+        self.threads_dir = Path(threads_dir)
+        self.segment_bytes = segment_bytes
+        self.compress_after_s = compress_after_s
+        self.interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Totals since start, for diagnostics
+        self.sealed = 0
+        self.compressed = 0
+
+    def run_once(self) -> Dict:
+        """
+        One pass over every thread
+
+        Returns:
+            {"sealed": segments written, "compressed": segments gzipped}
+        """
+        sealed = compressed = 0
+        if not self.threads_dir.exists():
+            return {"sealed": 0, "compressed": 0}
+        for path in self.threads_dir.glob("*.jsonl"):
+            thread = ThreadSegments(path, self.segment_bytes)
+            try:
+                sealed += thread.seal()
+                if self.compress_after_s:
+                    compressed += thread.compress(self.compress_after_s)
+            except OSError as e:
+                logger.warning(f"Compacting {path.name} failed: {e}")
+        self.sealed += sealed
+        self.compressed += compressed
+        return {"sealed": sealed, "compressed": compressed}
+
+    def start(self):
+        """Run passes every interval_s on a daemon thread"""
+        if self._thread is not None or self.interval_s <= 0:
+            return
+        self._thread = threading.Thread(target=self._loop, name="memory-compactor", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval_s):
+            self.run_once()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,361 @@
+"""
+Aurora Archive - Transaction Log
+Segmented, indexed storage behind DatabaseManager's transactions.jsonl
+
+    data/transactions.jsonl                     active segment (appended to)
+    data/transaction_segments/*.jsonl[.gz]      sealed segments, oldest first
+    data/transactions.index.json                one summary per sealed segment
+
+The active segment is sealed (moved into transaction_segments/, gzipped if
+`compress`) once it reaches `max_bytes` or its first record is older than
+`max_age_s`. Sealing scans it once to write a sparse index entry:
+
+    first / last timestamp
+    member_ids and transaction types present
+    (timestamp, byte offset) every CHECKPOINT_BYTES, for seeking to `since`
+
+query() reads only the sealed segments whose entry can match (time range,
+member, type), seeks past older records where the segment is uncompressed,
+and scans the active segment, which is bounded by max_bytes.
+
+Appends and sealing must be serialized across processes by the caller
+(DatabaseManager logs transactions under its inter-process lock).
+Segments sealed by a crashed writer before the index was updated are
+indexed on the next load.
+
+Python 3.10+
+Dependencies: none
+"""
+
+import bisect
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+from atomic_store import atomic_write_json, fsync_directory
+
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_MAX_AGE_S = 30 * 86400
+CHECKPOINT_BYTES = 64 * 1024
+
+
+def _timestamp(value: Union[str, datetime, None]) -> Optional[str]:
+    """ISO timestamp string for comparisons (transactions store isoformat())"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class TransactionLog:
+    """
+    Append-only transaction history in size/time-rotated segments
+
+    Usage:
+        log = TransactionLog(data_dir / "transactions.jsonl", compress=True)
+        log.append({"type": "member_added", "member_id": ..., "timestamp": ...})
+        log.query(member_id=..., since="2025-01-01", type="rental_overdue")
+    """
+
+    def __init__(
+        self,
+        path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_s: float = DEFAULT_MAX_AGE_S,
+        compress: bool = False
+    ):
+        """
+        Args:
+            path: Active segment (segments and index are created beside it)
+            max_bytes: Seal the active segment at this size (0 = never)
+            max_age_s: Seal it once its first record is this old (0 = never)
+            compress: gzip sealed segments
+        """
+        self.path = Path(path)
+        self.segments_dir = self.path.parent / "transaction_segments"
+        self.index_path = self.path.with_name(self.path.stem + ".index.json")
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.compress = compress
+        self._lock = threading.Lock()
+        self._segments: List[Dict] = []
+        self._member_sets: Dict[str, set] = {}  # Segment name -> its member_ids
+        self._index_stamp = None
+        self._active_ino = None
+        self._active_started = None  # Epoch seconds of the active segment's first record
+
+        # Diagnostics from the last query()
+        self.segments_read = 0
+
+    # ============================================
+    # INDEX
+    # ============================================
+
+    def _load_index(self):
+        """(Re)read the segment index if another process changed it; index stray segments"""
+        try:
+            stat = os.stat(self.index_path)
+            stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            stamp = None
+        if stamp == self._index_stamp and stamp is not None:
+            return
+        segments = []
+        if stamp is not None:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                segments = json.load(f).get('segments', [])
+        self._segments = segments
+        self._member_sets = {}
+        self._index_stamp = stamp
+
+        indexed = {segment['name'] for segment in segments}
+        stray = sorted(
+            path for path in self.segments_dir.glob("transactions-*")
+            if path.name not in indexed and not path.name.endswith('.tmp')
+        ) if self.segments_dir.exists() else []
+        for path in list(stray):
+            # A crash between compressing a sealed segment and removing the
+            # original leaves both; the .gz is complete (renamed into place)
+            if path.suffix == '.jsonl' and path.with_name(path.name + '.gz').exists():
+                stray.remove(path)
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        if stray:
+            for path in stray:
+                self._segments.append(self._summarize(path))
+            self._segments.sort(key=lambda segment: segment['name'])
+            self._save_index()
+
+    def _save_index(self):
+        atomic_write_json(self.index_path, {"version": 1, "segments": self._segments}, ensure_ascii=False)
+        stat = os.stat(self.index_path)
+        self._index_stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _open_segment(path: Path):
+        if path.suffix == '.gz':
+            return gzip.open(path, 'rb')
+        return open(path, 'rb')
+
+    def _summarize(self, path: Path) -> Dict:
+        """Sparse index entry for one segment file"""
+        first = last = None
+        members, types = set(), set()
+        checkpoints = []
+        count = 0
+        offset = next_checkpoint = 0
+        with self._open_segment(path) as f:
+            for line in f:
+                record = self._parse(line)
+                if record is not None:
+                    timestamp = record.get('timestamp')
+                    if timestamp:
+                        first = timestamp if first is None else min(first, timestamp)
+                        last = timestamp if last is None else max(last, timestamp)
+                        if offset >= next_checkpoint:
+                            checkpoints.append([timestamp, offset])
+                            next_checkpoint = offset + CHECKPOINT_BYTES
+                    if record.get('member_id'):
+                        members.add(str(record['member_id']))
+                    if record.get('type'):
+                        types.add(record['type'])
+                    count += 1
+                offset += len(line)
+        return {
+            "name": path.name,
+            "first": first,
+            "last": last,
+            "count": count,
+            "bytes": offset,
+            "members": sorted(members),
+            "types": sorted(types),
+            # Offsets index the uncompressed stream; only used for plain segments
+            "checkpoints": checkpoints if path.suffix != '.gz' else [],
+        }
+
+    @staticmethod
+    def _parse(line: bytes) -> Optional[Dict]:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None  # Torn or foreign line
+        return record if isinstance(record, dict) else None
+
+    # ============================================
+    # WRITING
+    # ============================================
+
+    def append(self, transaction: Dict):
+        """Append one transaction, sealing the active segment when it is full or old"""
+        line = (json.dumps(transaction, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._lock:
+            with open(self.path, 'ab') as f:
+                f.write(line)
+                f.flush()
+                stat = os.fstat(f.fileno())
+            if stat.st_ino != self._active_ino:
+                self._active_ino = stat.st_ino
+                # A segment we just started is as old as this append
+                self._active_started = time.time() if stat.st_size == len(line) else self._first_record_time()
+            too_big = self.max_bytes and stat.st_size >= self.max_bytes
+            too_old = (self.max_age_s and self._active_started is not None
+                       and time.time() - self._active_started >= self.max_age_s)
+            if too_big or too_old:
+                self._seal()
+
+    def _first_record_time(self) -> Optional[float]:
+        """Epoch time of the active segment's first record (its file time if unparseable)"""
+        try:
+            with open(self.path, 'rb') as f:
+                record = self._parse(f.readline())
+            return datetime.fromisoformat(record['timestamp']).timestamp()
+        except (OSError, TypeError, KeyError, ValueError):
+            try:
+                return os.stat(self.path).st_mtime
+            except OSError:
+                return None
+
+    def rotate(self):
+        """Seal the active segment now (no-op if it is empty)"""
+        with self._lock:
+            if self.path.exists() and self.path.stat().st_size:
+                self._seal()
+
+    def _seal(self):
+        """Move the active segment into transaction_segments/ and index it"""
+        self._load_index()
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        number = len(self._segments) + 1
+        started = datetime.fromtimestamp(self._active_started or time.time())
+        name = f"transactions-{number:06d}-{started.strftime('%Y%m%dT%H%M%S')}.jsonl"
+        sealed = self.segments_dir / name
+
+        os.replace(self.path, sealed)
+        fsync_directory(self.segments_dir)
+        if self.compress:
+            compressed = sealed.with_name(name + '.gz')
+            temp = compressed.with_name(compressed.name + '.tmp')
+            with open(sealed, 'rb') as source, gzip.open(temp, 'wb') as target:
+                shutil.copyfileobj(source, target)
+            os.replace(temp, compressed)
+            os.remove(sealed)
+            sealed = compressed
+
+        self._segments.append(self._summarize(sealed))
+        self._save_index()
+        self._active_ino = None
+
+    # ============================================
+    # QUERIES
+    # ============================================
+
+    def query(
+        self,
+        member_id: Optional[str] = None,
+        since: Union[str, datetime, None] = None,
+        until: Union[str, datetime, None] = None,
+        type: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Transactions matching every given filter, oldest first
+
+        Args:
+            member_id: Only this member's transactions
+            since: Timestamp (ISO string or datetime) at or after which to include
+            until: Timestamp before which to include
+            type: Transaction type (e.g. 'rental_overdue')
+            limit: Return at most this many (the newest ones)
+
+        Returns:
+            Transaction dicts
+        """
+        since, until = _timestamp(since), _timestamp(until)
+        with self._lock:
+            self._load_index()
+            segments = [
+                segment for segment in self._segments
+                if not (since and segment['last'] and segment['last'] < since)
+                and not (until and segment['first'] and segment['first'] >= until)
+                and not (member_id is not None and str(member_id) not in self._members(segment))
+                and not (type is not None and type not in segment['types'])
+            ]
+        self.segments_read = len(segments)
+
+        results = []
+        # Cheap byte tests before parsing a line (the exact checks follow)
+        needles = [
+            json.dumps(str(value), ensure_ascii=False).encode('utf-8')
+            for value in (member_id, type) if value is not None
+        ]
+        sources = [(self.segments_dir / segment['name'], segment) for segment in segments]
+        sources.append((self.path, None))
+        for path, segment in sources:
+            for record in self._read(path, segment, since, until, needles):
+                if member_id is not None and str(record.get('member_id')) != str(member_id):
+                    continue
+                if type is not None and record.get('type') != type:
+                    continue
+                timestamp = record.get('timestamp') or ''
+                if (since and timestamp < since) or (until and timestamp >= until):
+                    continue
+                results.append(record)
+        if limit is not None:
+            return results[-limit:] if limit else []
+        return results
+
+    def _members(self, segment: Dict) -> set:
+        """Segment's member_ids as a set (cached per index load)"""
+        members = self._member_sets.get(segment['name'])
+        if members is None:
+            members = self._member_sets[segment['name']] = set(segment['members'])
+        return members
+
+    def _read(
+        self,
+        path: Path,
+        segment: Optional[Dict],
+        since: Optional[str],
+        until: Optional[str],
+        needles: List[bytes]
+    ) -> Iterator[Dict]:
+        """Records of one segment, between the checkpoints around [since, until)"""
+        start, end = 0, None
+        checkpoints = segment.get('checkpoints') if segment else None
+        if checkpoints:
+            timestamps = [timestamp for timestamp, _ in checkpoints]
+            if since:
+                position = bisect.bisect_left(timestamps, since)
+                start = checkpoints[position - 1][1] if position else 0
+            if until:
+                position = bisect.bisect_left(timestamps, until)
+                end = checkpoints[position][1] if position < len(checkpoints) else None
+        try:
+            f = self._open_segment(path)
+        except FileNotFoundError:
+            return  # Sealed by another process since the index was read
+        with f:
+            if start:
+                f.seek(start)
+            offset = start
+            for line in f:
+                if end is not None and offset >= end:
+                    break
+                offset += len(line)
+                if not all(needle in line for needle in needles):
+                    continue
+                record = self._parse(line)
+                if record is not None:
+                    yield record
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Every transaction, oldest first"""
+        return iter(self.query())
@@ -3,7 +3,10 @@ Aurora Archive - User Memory Bridge
 Per-user JSONL memory system for cross-site AI continuity
 
 Phase 2 Implementation:
-- Each user gets their own conversation memory file (threads/{thread_id}.jsonl)
+- Each user gets their own conversation memory file (threads/{thread_id}.jsonl),
+  sealed into fixed-size segments by a background compactor as it grows
+- Events are appended by a per-process background writer (append_writer)
+  with a configurable fsync policy
 - Memory persists across sessions and pages (E-Drive, Oracle, RedVerse)
 - Tier-based memory depth limits
 - Cross-site context awareness for seamless AI continuity
@@ -13,12 +16,20 @@ Python 3.10+ | Part of the Crimson Gate Protocol
 
 import json
 import os
+import threading
 import uuid
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
 import logging
 
+from append_writer import DEFAULT_FSYNC_MS, DEFAULT_MAX_OPEN, DEFAULT_QUEUE_SIZE, AppendWriter
+from event_cache import RecentEventCache
+from shared_views import SharedContextViews
+from thread_segments import (
+    DEFAULT_COMPRESS_AFTER_S, DEFAULT_SEGMENT_BYTES, ThreadCompactor, ThreadSegments, merge_newest
+)
+
 # Setup logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -64,6 +75,7 @@ class UserMemoryBridge:
         self.memory_dir = Path("memory")
         self.threads_dir = self.memory_dir / "threads"
         self.user_memory_file = self.threads_dir / f"{thread_id}.jsonl"
+        self.segments = ThreadSegments(self.user_memory_file)
 
         # Ensure directories exist
         self.threads_dir.mkdir(parents=True, exist_ok=True)
@@ -93,25 +105,21 @@ class UserMemoryBridge:
         if last_n == -1:
             last_n = None  # Load all
 
+        get_append_writer().flush(self.user_memory_file)  # Our own queued events
+
         # Check if memory file exists
-        if not self.user_memory_file.exists():
+        if not self.segments.exists():
             logger.debug(f"No memory file found for thread_id={self.thread_id}")
             return []
 
-        # Load events from JSONL
-        events = []
+        # Hot threads come from the in-process ring buffer; otherwise read the
+        # last N events backwards from the end of the active file, then from
+        # sealed segments newest first until N are found (cost grows with N,
+        # not with the length of the thread's history)
         try:
-            with open(self.user_memory_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        events.append(json.loads(line))
-
-            # Return last N events (newest first)
-            if last_n is not None:
-                events = events[-last_n:]
-
-            events.reverse()  # Newest first
+            events = get_event_cache().recent(self.user_memory_file, last_n) if last_n is not None else None
+            if events is None:
+                events = self.segments.tail(last_n)  # Newest first
             logger.info(f"Loaded {len(events)} events for thread_id={self.thread_id}")
             return events
 
@@ -123,9 +131,16 @@ class UserMemoryBridge:
         """
         Load events from multiple thread_ids (for shared memories)
 
+        If the threads are exactly a pool's or trust circle's members, this is
+        one bounded read of that group's materialized view (shared_views).
+        Otherwise each thread is streamed newest first and the streams are
+        merged by timestamp (heapq.merge), so only the first `last_n` merged
+        lines are parsed and no thread is read further back than the merge
+        reaches.
+
         Args:
             thread_ids: List of thread_ids to load from
-            last_n: Number of events to load per thread (None uses tier default)
+            last_n: Number of events to load in total (None uses tier default)
 
         Returns:
             Combined list of events from all threads, sorted by timestamp (newest first)
@@ -137,36 +152,37 @@ class UserMemoryBridge:
             logger.debug(f"Tier {self.access_tier}: No memory access")
             return []
 
-        all_events = []
+        writer = get_append_writer()
+        if writer.pending():
+            for thread_id in thread_ids:
+                writer.flush(self.threads_dir / f"{thread_id}.jsonl")
+
+        events = get_shared_views().recent(thread_ids, last_n)
+        if events is not None:
+            logger.info(f"Loaded {len(events)} shared events from a view of {len(thread_ids)} threads")
+            return events
 
+        existing = []
         for thread_id in thread_ids:
-            thread_file = self.threads_dir / f"{thread_id}.jsonl"
-            if not thread_file.exists():
+            if not ThreadSegments(self.threads_dir / f"{thread_id}.jsonl").exists():
                 logger.debug(f"Memory file not found for thread_id={thread_id}")
                 continue
+            existing.append(thread_id)
 
-            try:
-                with open(thread_file, 'r', encoding='utf-8') as f:
-                    events = []
-                    for line in f:
-                        line = line.strip()
-                        if line:
-                            events.append(json.loads(line))
-
-                    # Add ownership marker
-                    for event in events:
-                        event['_from_thread'] = thread_id  # Track which user's memory
-                        all_events.append(event)
-
-            except Exception as e:
-                logger.warning(f"Error loading context from thread {thread_id}: {e}")
-                continue
-
-        # Sort by timestamp (newest first) and limit
-        all_events.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-
-        if last_n is not None and last_n > 0:
-            all_events = all_events[:last_n]
+        all_events = []
+        merged = merge_newest(self.threads_dir, existing)
+        try:
+            for thread_id, line in merged:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                event['_from_thread'] = thread_id  # Track which user's memory
+                all_events.append(event)
+                if last_n > 0 and len(all_events) >= last_n:
+                    break
+        finally:
+            merged.close()
 
         logger.info(f"Loaded {len(all_events)} shared events from {len(thread_ids)} threads")
         return all_events
@@ -180,7 +196,8 @@ class UserMemoryBridge:
         metadata: Optional[Dict] = None
     ):
         """
-        Append event to user's JSONL file.
+        Append event to user's JSONL file (queued for the background
+        append writer; returns before it is written).
 
         Args:
             role: Message role (user, assistant, system)
@@ -189,6 +206,53 @@ class UserMemoryBridge:
             emotion_state: Emotional state dict (optional)
             metadata: Additional metadata (optional)
         """
+        event = self._new_event(role, content, source, emotion_state, metadata)
+
+        try:
+            self._append_events([event])
+            logger.debug(f"Stored {role} event for thread_id={self.thread_id} from {event['source']}")
+
+        except Exception as e:
+            logger.error(f"Error storing user event: {e}", exc_info=True)
+
+    def store_user_events(self, events: List[Dict]) -> List[Dict]:
+        """
+        Append several events to user's JSONL file with a single write.
+
+        Args:
+            events: Dicts with role, content and optionally source,
+                emotion_state, metadata (as for store_user_event)
+
+        Returns:
+            The stored events (with event_id and timestamp), in order;
+            [] if they could not be queued
+        """
+        stored = [
+            self._new_event(
+                item['role'], item['content'], item.get('source'), item.get('emotion_state'), item.get('metadata')
+            )
+            for item in events
+        ]
+        if not stored:
+            return []
+
+        try:
+            self._append_events(stored)
+            logger.debug(f"Stored {len(stored)} events for thread_id={self.thread_id}")
+            return stored
+
+        except Exception as e:
+            logger.error(f"Error storing user events: {e}", exc_info=True)
+            return []
+
+    def _new_event(
+        self,
+        role: str,
+        content: str,
+        source: Optional[str],
+        emotion_state: Optional[Dict],
+        metadata: Optional[Dict]
+    ) -> Dict:
         event = {
             "event_id": str(uuid.uuid4()),
             "timestamp": datetime.utcnow().isoformat() + "Z",
@@ -202,16 +266,29 @@ class UserMemoryBridge:
         # Ensure metadata includes tier info
         event["metadata"]["tier_at_time"] = self.access_tier
         event["metadata"]["tier_name"] = self.tier_name
+        return event
 
-        try:
-            # Append to JSONL file
-            with open(self.user_memory_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(event, ensure_ascii=False) + '\n')
+    def _append_events(self, events: List[Dict]):
+        """
+        Queue the events for the process's append writer as one write
 
-            logger.debug(f"Stored {role} event for thread_id={self.thread_id} from {event['source']}")
+        Returns once queued (blocking while the writer's queue is full).
+        When the write lands, the events go to the cached recent events and
+        shared views.
+        """
+        lines = [(json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8') for event in events]
+        path = self.user_memory_file
+        thread_id = self.thread_id
 
-        except Exception as e:
-            logger.error(f"Error storing user event: {e}", exc_info=True)
+        def written(end_offset: int):
+            cache = get_event_cache()
+            offset = end_offset - sum(len(line) for line in lines)
+            for event, line in zip(events, lines):
+                offset += len(line)
+                cache.appended(path, event, len(line), offset)
+            get_shared_views().append(thread_id, *events)
+
+        get_append_writer().append(path, b''.join(lines), written)
 
     def get_cross_site_summary(self, limit: int = 10) -> str:
         """
@@ -326,58 +403,157 @@ class UserMemoryBridge:
         Clear all memory for this user (admin function).
         WARNING: This is destructive and cannot be undone.
         """
-        if self.user_memory_file.exists():
-            self.user_memory_file.unlink()
+        get_append_writer().flush(self.user_memory_file)
+        if self.segments.exists():
+            self.segments.remove()
+            get_event_cache().invalidate(self.user_memory_file)
+            get_shared_views().refresh_thread(self.thread_id)
             logger.warning(f"Cleared all memory for thread_id={self.thread_id}")
 
     def get_memory_stats(self) -> Dict:
         """
         Get statistics about this user's memory.
 
+        Answered from the segment manifest and the active file, without
+        reading sealed segments.
+
         Returns:
             Dict with event count, file size, date range
         """
-        if not self.user_memory_file.exists():
+        get_append_writer().flush(self.user_memory_file)
+        if not self.segments.exists():
             return {
                 "exists": False,
                 "event_count": 0,
                 "file_size_bytes": 0
             }
 
-        # Count lines
-        event_count = 0
-        first_timestamp = None
-        last_timestamp = None
-
         try:
-            with open(self.user_memory_file, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f):
-                    if line.strip():
-                        event_count += 1
-                        event = json.loads(line)
-                        timestamp = event.get("timestamp")
-
-                        if line_num == 0:
-                            first_timestamp = timestamp
-                        last_timestamp = timestamp
-
+            stats = self.segments.stats()
         except Exception as e:
             logger.error(f"Error getting memory stats: {e}")
-
-        file_size = self.user_memory_file.stat().st_size
+            stats = {"events": 0, "bytes": 0, "segments": 0, "first_event": None, "last_event": None}
 
         return {
             "exists": True,
-            "event_count": event_count,
-            "file_size_bytes": file_size,
-            "first_event": first_timestamp,
-            "last_event": last_timestamp,
+            "event_count": stats["events"],
+            "file_size_bytes": stats["bytes"],
+            "segment_count": stats["segments"],
+            "first_event": stats["first_event"],
+            "last_event": stats["last_event"],
             "tier": self.access_tier,
             "tier_name": self.tier_name,
             "memory_depth_limit": self.memory_depth
         }
 
 
+# Guards creation of the process-wide instances below; reentrant because
+# get_shared_views() creates the event cache
+_singletons_lock = threading.RLock()
+
+# Recent-event cache shared by every bridge in this process
+_event_cache = None
+
+def get_event_cache() -> RecentEventCache:
+    """
+    Get the process-wide recent-event cache
+
+    Buffers are as deep as the largest finite tier memory depth (Inner
+    Sanctum's unlimited loads read disk). $AURORA_MEMORY_CACHE_MB caps the
+    cached events' JSON size (default 64; 0 disables the cache).
+    """
+    global _event_cache
+    if _event_cache is None:
+        with _singletons_lock:
+            if _event_cache is None:
+                depth = max(config["memory_depth"] for config in UserMemoryBridge.TIER_CONFIG.values())
+                max_mb = float(os.getenv('AURORA_MEMORY_CACHE_MB', 64))
+                _event_cache = RecentEventCache(depth=depth, max_bytes=int(max_mb * 1024 * 1024), history=_sealed_history)
+    return _event_cache
+
+
+def _sealed_history(path: str, limit: int, active_ino: int) -> List[bytes]:
+    """Events sealed out of a thread's active file, newest first (for cache loads)"""
+    return ThreadSegments(path).lines_reverse(limit, include_active=False, skip_ino=active_ino)
+
+
+# Shared context views for memory/
+_shared_views = None
+
+def get_shared_views() -> SharedContextViews:
+    """
+    Get the process-wide shared context views (pooled tiers, trust circles)
+
+    Views keep the newest events up to the largest finite tier memory
+    depth; $AURORA_SHARED_VIEW_MAX_MB is the size at which a view file is
+    trimmed back to that many events (default 4).
+    """
+    global _shared_views
+    if _shared_views is None:
+        with _singletons_lock:
+            if _shared_views is None:
+                depth = max(config["memory_depth"] for config in UserMemoryBridge.TIER_CONFIG.values())
+                max_mb = float(os.getenv('AURORA_SHARED_VIEW_MAX_MB', 4))
+                _shared_views = SharedContextViews(
+                    Path("memory"), depth=depth, max_bytes=int(max_mb * 1024 * 1024), cache=get_event_cache()
+                )
+    return _shared_views
+
+
+# Background appender for memory/threads
+_append_writer = None
+
+def get_append_writer() -> AppendWriter:
+    """
+    Get the process-wide append writer for thread files
+
+    $AURORA_MEMORY_FSYNC picks the durability policy: "always" (fsync every
+    write), "interval" (default; every $AURORA_MEMORY_FSYNC_MS, default
+    1000) or "os" (never fsync). $AURORA_MEMORY_WRITE_QUEUE bounds the
+    queued appends before store_user_event() blocks (default 10000) and
+    $AURORA_MEMORY_OPEN_FILES the append handles kept open (default 128).
+    """
+    global _append_writer
+    if _append_writer is None:
+        with _singletons_lock:
+            if _append_writer is None:
+                _append_writer = AppendWriter(
+                    fsync=os.getenv('AURORA_MEMORY_FSYNC', 'interval').lower(),
+                    fsync_ms=float(os.getenv('AURORA_MEMORY_FSYNC_MS', DEFAULT_FSYNC_MS)),
+                    queue_size=int(os.getenv('AURORA_MEMORY_WRITE_QUEUE', DEFAULT_QUEUE_SIZE)),
+                    max_open=int(os.getenv('AURORA_MEMORY_OPEN_FILES', DEFAULT_MAX_OPEN))
+                )
+    return _append_writer
+
+
+# Segment compactor for memory/threads
+_thread_compactor = None
+
+def get_thread_compactor() -> ThreadCompactor:
+    """
+    Get the process-wide memory thread compactor (call .start() to run it)
+
+    $AURORA_MEMORY_SEGMENT_KB sets the segment size (default 1024),
+    $AURORA_MEMORY_COMPRESS_AFTER_H how long a sealed segment stays
+    uncompressed (default 24; 0 never compresses) and
+    $AURORA_MEMORY_COMPACT_INTERVAL_S the time between passes (default 300;
+    0 disables the background thread).
+    """
+    global _thread_compactor
+    if _thread_compactor is None:
+        with _singletons_lock:
+            if _thread_compactor is None:
+                segment_kb = int(os.getenv('AURORA_MEMORY_SEGMENT_KB', DEFAULT_SEGMENT_BYTES // 1024))
+                compress_after_h = float(os.getenv('AURORA_MEMORY_COMPRESS_AFTER_H', DEFAULT_COMPRESS_AFTER_S / 3600))
+                _thread_compactor = ThreadCompactor(
+                    Path("memory") / "threads",
+                    segment_bytes=segment_kb * 1024,
+                    compress_after_s=compress_after_h * 3600,
+                    interval_s=float(os.getenv('AURORA_MEMORY_COMPACT_INTERVAL_S', 300))
+                )
+    return _thread_compactor
+
+
 # Example usage and testing
 if __name__ == '__main__':
     print("=" * 70)
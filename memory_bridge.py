@@ -21,6 +21,11 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 from collections import Counter
 
+try:
+    from Aurora.atomic_store import JsonJournal, atomic_open, atomic_write_json
+except ImportError:  # Running from inside Aurora/
+    from atomic_store import JsonJournal, atomic_open, atomic_write_json
+
 # ─── Configuration ────────────────────────────────────────────────────────────
 
 MEMORY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "memory")
@@ -40,7 +45,13 @@ class MemoryBridge:
 
     def __init__(self, module_name: str = "EDrive",
                  session_id: str = None,
-                 auto_persist: bool = True):
+                 auto_persist: bool = True,
+                 journal: bool = False):
+        """
+        journal: Append each turn to a trajectory journal and rewrite the
+                 trajectory JSON only every few hundred turns (restart
+                 replays just the journal tail).
+        """
         self.module_name = module_name
         self.session_id = session_id or f"{module_name}-{int(time.time())}"
         self.auto_persist = auto_persist
@@ -57,6 +68,9 @@ class MemoryBridge:
         self._trajectory_file = os.path.join(
             MEMORY_DIR, f"trajectory_{self.session_id}.json"
         )
+        self._journal = JsonJournal(os.path.join(
+            MEMORY_DIR, f"trajectory_{self.session_id}.journal"
+        )) if journal else None
 
         # Load existing session data if resuming
         self._load_session()
@@ -97,8 +111,7 @@ class MemoryBridge:
             ),
         }
 
-        self._events.append(turn_data)
-        self._emotional_trajectory.append({
+        trajectory_entry = {
             "turn": self._turn_count,
             "zone": zone,
             "dominant": dominant_emotion,
@@ -107,11 +120,13 @@ class MemoryBridge:
                 sorted(emotional_state.items(),
                        key=lambda x: x[1], reverse=True)[:3]
             ),
-        })
+        }
+        self._events.append(turn_data)
+        self._emotional_trajectory.append(trajectory_entry)
 
         if self.auto_persist:
             self._append_event(turn_data)
-            self._save_trajectory()
+            self._persist_trajectory_entry(trajectory_entry)
 
     def get_recent_events(self, count: int = 10) -> List[Dict]:
         """Get the N most recent events."""
@@ -244,16 +259,36 @@ class MemoryBridge:
         except Exception as e:
             print(f"[MemoryBridge] Write error: {e}")
 
+    def _persist_trajectory_entry(self, entry: Dict):
+        """Journal one trajectory entry, or rewrite the trajectory file."""
+        if self._journal is None:
+            self._save_trajectory()
+            return
+        try:
+            self._journal.append({
+                "op": "turn", "entry": entry, "turn_count": self._turn_count
+            })
+        except Exception as e:
+            print(f"[MemoryBridge] Journal write error: {e}")
+            self._save_trajectory()
+            return
+        if self._journal.needs_checkpoint:
+            self._save_trajectory()
+
     def _save_trajectory(self):
-        """Save the full emotional trajectory."""
+        """Save the full emotional trajectory (atomic replace)."""
         try:
-            with open(self._trajectory_file, "w", encoding="utf-8") as f:
-                json.dump({
-                    "session_id": self.session_id,
-                    "module": self.module_name,
-                    "turn_count": self._turn_count,
-                    "trajectory": self._emotional_trajectory,
-                }, f, indent=2, default=str)
+            data = {
+                "session_id": self.session_id,
+                "module": self.module_name,
+                "turn_count": self._turn_count,
+                "trajectory": self._emotional_trajectory,
+            }
+            if self._journal is not None:
+                data["journal_seq"] = self._journal.seq
+            atomic_write_json(self._trajectory_file, data, indent=2, default=str)
+            if self._journal is not None:
+                self._journal.truncate()
         except Exception as e:
             print(f"[MemoryBridge] Trajectory save error: {e}")
 
@@ -275,6 +310,7 @@ class MemoryBridge:
             except Exception as e:
                 print(f"[MemoryBridge] Session load error: {e}")
 
+        snapshot_seq = 0
         if os.path.exists(self._trajectory_file):
             try:
                 with open(self._trajectory_file, "r", encoding="utf-8") as f:
@@ -284,15 +320,26 @@ class MemoryBridge:
                         self._turn_count,
                         data.get("turn_count", 0)
                     )
+                    snapshot_seq = data.get("journal_seq", 0)
             except Exception as e:
                 print(f"[MemoryBridge] Trajectory load error: {e}")
 
+        # Turns journaled after the last trajectory snapshot
+        if self._journal is not None:
+            for record in self._journal.replay(snapshot_seq):
+                if record.get("op") == "turn":
+                    self._emotional_trajectory.append(record["entry"])
+                    self._turn_count = max(self._turn_count, record.get("turn_count", 0))
+            if self._journal.replayed:
+                print(f"[MemoryBridge] Replayed {self._journal.replayed} journaled turns "
+                      f"in {self._journal.replay_ms:.1f} ms")
+
     def flush(self):
         """Force-write all pending data to disk."""
         self._save_trajectory()
         # Re-write full session
         try:
-            with open(self._session_file, "w", encoding="utf-8") as f:
+            with atomic_open(self._session_file, "w") as f:
                 for event in self._events:
                     f.write(json.dumps(event, default=str) + "\n")
         except Exception as e: